@@ -0,0 +1,32 @@
+"""add_trigram_index_on_contact_fields
+
+Revision ID: 3f9c2b7d1e84
+Revises: 5a67556fbbf1
+
+"""
+
+# alembic exposes op as a runtime proxy that mypy cannot see statically
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2b7d1e84'
+down_revision = '5a67556fbbf1'
+
+INDEX_NAME = 'dird_contact_fields__idx__name_value_trgm'
+
+
+def upgrade() -> None:
+    # Both extensions are trusted, the database owner can create them
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+    op.create_index(
+        INDEX_NAME,
+        'dird_contact_fields',
+        ['name', 'value'],
+        postgresql_using='gin',
+        postgresql_ops={'value': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name='dird_contact_fields')
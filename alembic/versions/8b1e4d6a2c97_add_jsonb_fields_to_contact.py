@@ -0,0 +1,66 @@
+"""add_jsonb_fields_to_contact
+
+Revision ID: 8b1e4d6a2c97
+Revises: 3f9c2b7d1e84
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# alembic exposes op as a runtime proxy that mypy cannot see statically
+from alembic import op  # type: ignore[attr-defined]
+
+# revision identifiers, used by Alembic.
+revision = '8b1e4d6a2c97'
+down_revision = '3f9c2b7d1e84'
+
+INDEX_NAME = 'dird_contact__idx__fields'
+
+
+def upgrade() -> None:
+    op.add_column(
+        'dird_contact',
+        sa.Column(
+            'fields',
+            postgresql.JSONB,
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+    )
+    op.execute(
+        '''
+        UPDATE dird_contact
+        SET fields = contact_fields.fields
+        FROM (
+            SELECT contact_uuid, jsonb_object_agg(name, value) AS fields
+            FROM dird_contact_fields
+            WHERE name != 'id'
+            GROUP BY contact_uuid
+        ) AS contact_fields
+        WHERE dird_contact.uuid = contact_fields.contact_uuid
+        '''
+    )
+    # phonebook contacts had one id row per field, a single one is enough
+    op.execute(
+        '''
+        DELETE FROM dird_contact_fields AS duplicate
+        USING dird_contact_fields AS kept
+        WHERE duplicate.contact_uuid = kept.contact_uuid
+        AND duplicate.name = 'id'
+        AND kept.name = 'id'
+        AND duplicate.id > kept.id
+        '''
+    )
+    op.create_index(
+        INDEX_NAME,
+        'dird_contact',
+        ['fields'],
+        postgresql_using='gin',
+        postgresql_ops={'fields': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name='dird_contact')
+    op.drop_column('dird_contact', 'fields')
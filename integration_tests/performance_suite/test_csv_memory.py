@@ -0,0 +1,89 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import csv
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+from wazo_dird.plugins.csv_backend.plugin import CSVPlugin
+
+_ROW_COUNT = 200_000
+_HEADER = ['id', 'firstname', 'lastname', 'number', 'mobile', 'email', 'company']
+_COMPANIES = [f'Company {i}' for i in range(50)]
+
+
+def _write_csv(filename: str) -> None:
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(_HEADER)
+        for i in range(_ROW_COUNT):
+            writer.writerow(
+                [
+                    str(i),
+                    f'First{i}',
+                    f'Last{i % 5000}',
+                    str(1_000_000_000 + i),
+                    str(33_600_000_000 + i),
+                    f'user{i}@example.com',
+                    _COMPANIES[i % len(_COMPANIES)],
+                ]
+            )
+
+
+class TestCSVStorageMemory(unittest.TestCase):
+    """Memory used by a loaded CSV source with and without `compact_storage`.
+
+    Measures the memory allocated by the source content and its indexes for a
+    200k rows file.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        fd, cls.filename = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        _write_csv(cls.filename)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        os.remove(cls.filename)
+
+    def _load(self, compact_storage: bool) -> tuple[CSVPlugin, int, float]:
+        config = {
+            'name': 'memory',
+            'file': self.filename,
+            'unique_column': 'id',
+            'searched_columns': ['firstname', 'lastname'],
+            'first_matched_columns': ['number', 'mobile'],
+            'compact_storage': compact_storage,
+            'reload_interval': 3600,
+        }
+        gc.collect()
+        tracemalloc.start()
+        t0 = time.monotonic()
+        source = CSVPlugin()
+        source.load({'config': config})  # type: ignore[typeddict-item]
+        elapsed = time.monotonic() - t0
+        gc.collect()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return source, size, elapsed
+
+    def test_compact_storage_uses_less_memory(self) -> None:
+        sizes = {}
+        for compact_storage in (False, True):
+            source, size, elapsed = self._load(compact_storage)
+            sizes[compact_storage] = size
+            print(
+                f'csv[compact_storage={compact_storage}]: {_ROW_COUNT} rows → '
+                f'{size / 2**20:.1f} MiB, loaded in {elapsed:.2f}s'
+            )
+            assert len(source.search('first1999')) == 111
+            assert source.first_match('33600000042') is not None
+            source.unload()
+            del source
+
+        assert sizes[True] < sizes[False], sizes
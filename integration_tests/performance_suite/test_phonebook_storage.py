@@ -0,0 +1,122 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from wazo_dird.database.queries.phonebook import (
+    PhonebookContactCRUD,
+    PhonebookContactSearchEngine,
+    PhonebookCRUD,
+    PhonebookKey,
+)
+
+from .helpers.base import DBRunningTestCase
+from .helpers.constants import MAIN_TENANT
+
+_CONTACT_COUNT = 100_000
+_NUMBER_BASE = 1_000_000_000
+_MOBILE_BASE = 33_600_000_000
+
+T = TypeVar('T')
+
+
+def _timed(label: str, f: Callable[..., T], *args: Any) -> T:
+    t0 = time.monotonic()
+    result = f(*args)
+    print(f'phonebook[{_CONTACT_COUNT} contacts] {label}: {time.monotonic() - t0:.3f}s')
+    return result
+
+
+class TestPhonebookStorage(DBRunningTestCase):
+    """Timings of the phonebook contact queries on a 100k contacts phonebook.
+
+    Contacts are read from the `fields` column of `dird_contact` and searched
+    with the trigram index of `dird_contact_fields`.
+    """
+
+    asset = 'database'
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.phonebook_crud = PhonebookCRUD(cls.Session)
+        cls.contact_crud = PhonebookContactCRUD(cls.Session)
+        phonebook = cls.phonebook_crud.create(MAIN_TENANT, {'name': 'storage'})
+        cls.phonebook_key = PhonebookKey(uuid=phonebook['uuid'])
+        contacts = [
+            {
+                'firstname': f'Contact{i:06d}',
+                'lastname': f'McContact{i % 5000:04d}',
+                'number': str(_NUMBER_BASE + i),
+                'mobile': str(_MOBILE_BASE + i),
+                'email': f'contact{i:06d}@example.com',
+            }
+            for i in range(_CONTACT_COUNT)
+        ]
+        created, errors = _timed(
+            'import',
+            cls.contact_crud.create_many,
+            [MAIN_TENANT],
+            cls.phonebook_key,
+            contacts,
+        )
+        assert not errors, errors
+        assert len(created) == _CONTACT_COUNT
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.phonebook_crud.delete([MAIN_TENANT], cls.phonebook_key)
+        super().tearDownClass()
+
+    def test_search(self) -> None:
+        engine = PhonebookContactSearchEngine(
+            self.Session,
+            [MAIN_TENANT],
+            self.phonebook_key,
+            searched_columns=['firstname', 'lastname'],
+            first_match_columns=['number', 'mobile'],
+        )
+
+        contacts = _timed('search', engine.find_contacts, 'mccontact0042')
+        assert len(contacts) == _CONTACT_COUNT // 5000
+
+        contact = _timed('first match', engine.find_first_contact, '1000000042')
+        assert contact is not None
+
+        extens = [str(_MOBILE_BASE + i) for i in range(0, _CONTACT_COUNT, 2000)]
+        matches = _timed('match 50 extens', engine.find_contacts_for_extens, extens)
+        assert len(matches) == len(extens)
+
+    def test_list(self) -> None:
+        contacts = _timed(
+            'list', self.contact_crud.list, [MAIN_TENANT], self.phonebook_key
+        )
+        assert len(contacts) == _CONTACT_COUNT
+
+        contact = contacts[0]
+        assert (
+            _timed(
+                'get',
+                self.contact_crud.get,
+                [MAIN_TENANT],
+                self.phonebook_key,
+                contact['id'],
+            )
+            == contact
+        )
+
+        page = _timed(
+            'list last page ordered by lastname',
+            lambda: self.contact_crud.list(
+                [MAIN_TENANT],
+                self.phonebook_key,
+                order='lastname',
+                direction='desc',
+                limit=100,
+                offset=_CONTACT_COUNT - 100,
+                order_insensitive=True,
+            ),
+        )
+        assert len(page) == 100
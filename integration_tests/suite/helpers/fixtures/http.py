@@ -171,25 +171,19 @@ def office365_result(contact_list):
             mock_server = UnVerifiedMockServerClient(
                 f'http://127.0.0.1:{office365_port}'
             )
-            expected_count = len(contact_list['value'])
-            count_expectation = mock_server.create_expectation(
-                '/v1.0/me/contacts', {'@odata.count': expected_count}, 200
-            )
-            count_expectation['httpRequest']['queryStringParameters'] = {
-                '$count': ['true']
-            }
-            count_expectation['times']['unlimited'] = True
-            mock_server.mock_any_response(count_expectation)
-
             expectation = mock_server.create_expectation(
                 '/v1.0/me/contacts', contact_list, 200
             )
             expectation['times']['unlimited'] = True
-            expectation['httpRequest']['queryStringParameters'] = {
-                '$top': [str(expected_count)]
-            }
+            expectation['httpRequest']['queryStringParameters'] = {'$top': ['1000']}
             mock_server.mock_any_response(expectation)
 
+            delta_expectation = mock_server.create_expectation(
+                '/v1.0/me/contacts/delta', contact_list, 200
+            )
+            delta_expectation['times']['unlimited'] = True
+            mock_server.mock_any_response(delta_expectation)
+
             try:
                 result = decorated(self, mock_server, *args, **kwargs)
             finally:
@@ -209,34 +203,20 @@ def office365_paginated_result(pages):
             mock_server = UnVerifiedMockServerClient(
                 f'http://127.0.0.1:{office365_port}'
             )
-            expected_count = 0
-            for current_page in pages:
-                expected_count += len(current_page['value'])
-
-            count_expectation = mock_server.create_expectation(
-                '/v1.0/me/contacts',
-                {
-                    '@odata.count': expected_count,
-                    '@odata.nextLink': pages[0].get('@odata.nextLink'),
-                },
-                200,
-            )
-            count_expectation['httpRequest']['queryStringParameters'] = {
-                '$count': ['true'],
-            }
-
-            count_expectation['times']['unlimited'] = True
-            mock_server.mock_any_response(count_expectation)
             for current_page in pages:
                 current_page_path = current_page.pop('endpoint')
-
-                expectation = mock_server.create_expectation(
-                    current_page_path, current_page, 200
-                )
-                expectation['times']['unlimited'] = True
-                expectation['httpRequest']['method'] = 'GET'
-                expectation['httpRequest']['path'] = current_page_path
-                mock_server.mock_any_response(expectation)
+                paths = [current_page_path]
+                if current_page_path == '/v1.0/me/contacts':
+                    paths.append('/v1.0/me/contacts/delta')
+
+                for path in paths:
+                    expectation = mock_server.create_expectation(
+                        path, current_page, 200
+                    )
+                    expectation['times']['unlimited'] = True
+                    expectation['httpRequest']['method'] = 'GET'
+                    expectation['httpRequest']['path'] = path
+                    mock_server.mock_any_response(expectation)
 
             try:
                 result = decorated(self, mock_server, *args, **kwargs)
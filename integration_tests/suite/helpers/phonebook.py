@@ -70,6 +70,21 @@ class BasePhonebookTestCase(BaseDirdIntegrationTest):
         headers = {'X-Auth-Token': token, 'Context-Type': 'text/csv; charset=utf-8'}
         return cls.post(url, data=body, headers=headers, tenant=tenant)
 
+    @classmethod
+    def start_phonebook_import(
+        cls, phonebook_uuid, body, token=VALID_TOKEN_MAIN_TENANT, tenant=None
+    ):
+        url = cls.url('phonebooks', phonebook_uuid, 'contacts', 'imports')
+        headers = {'X-Auth-Token': token, 'Context-Type': 'text/csv; charset=utf-8'}
+        return cls.post(url, data=body, headers=headers, tenant=tenant)
+
+    @classmethod
+    def get_phonebook_import(
+        cls, phonebook_uuid, job_uuid, token=VALID_TOKEN_MAIN_TENANT, tenant=None
+    ):
+        url = cls.url('phonebooks', phonebook_uuid, 'contacts', 'imports', job_uuid)
+        return cls.get(url, token=token, tenant=tenant)
+
     @classmethod
     def put_phonebook_contact(
         cls,
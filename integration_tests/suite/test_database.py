@@ -20,6 +20,7 @@ from hamcrest import (
     has_item,
     has_items,
     has_key,
+    has_properties,
     not_,
     raises,
 )
@@ -135,7 +136,11 @@ class _BaseTest(unittest.TestCase):
         with closing(Session()) as session:
             for contact in contacts:
                 hash_ = base.compute_contact_hash(contact)
-                dird_contact = database.Contact(user_uuid=user_uuid, hash=hash_)
+                dird_contact = database.Contact(
+                    user_uuid=user_uuid,
+                    hash=hash_,
+                    fields=base.contact_fields(contact),
+                )
                 session.add(dird_contact)
                 session.flush()
                 ids.append(dird_contact.uuid)
@@ -761,13 +766,75 @@ class TestPhonebookContactImport(_BasePhonebookContactCRUDTest):
         )
         assert_that(errors, empty())
 
-        created, errors = self._crud.create_many(
+        created, duplicates = self._crud.create_many(
             [self._tenant_uuid], database.PhonebookKey(id=self._phonebook_id), body
         )
-        # duplicates are ignored and do not generate errors
-        assert_that(errors, empty())
+        # contacts already in the phonebook are reported as duplicates
+        assert_that(
+            duplicates,
+            contains(
+                has_entries(contact=contact_1, message='Duplicate contact', index=0),
+                has_entries(contact=contact_2, message='Duplicate contact', index=1),
+                has_entries(contact=contact_3, message='Duplicate contact', index=2),
+            ),
+        )
         assert_that(created, empty())
 
+    def test_that_duplicates_in_the_body_are_created_once(self):
+        contact_1 = self._new_contact('Foo', 'Bar', '5555551111')
+        contact_2 = self._new_contact('Alice', 'AAA', '5555552222')
+
+        created, duplicates = self._crud.create_many(
+            [self._tenant_uuid],
+            database.PhonebookKey(uuid=self._phonebook_uuid),
+            [contact_1, contact_2, dict(contact_1)],
+        )
+
+        assert_that(
+            duplicates,
+            contains(
+                has_entries(contact=contact_1, message='Duplicate contact', index=2)
+            ),
+        )
+        assert_that(
+            created,
+            contains_inanyorder(has_entries(**contact_1), has_entries(**contact_2)),
+        )
+        for contact in created:
+            assert_that(
+                self._crud.get(
+                    [self._tenant_uuid],
+                    database.PhonebookKey(uuid=self._phonebook_uuid),
+                    contact['id'],
+                ),
+                equal_to(contact),
+            )
+
+    def test_that_invalid_contacts_are_reported_by_index(self):
+        contact_1 = self._new_contact('Foo', 'Bar', '5555551111')
+        contact_2 = self._new_contact('Alice\x00', 'AAA', '5555552222')
+
+        assert_that(
+            calling(self._crud.create_many).with_args(
+                [self._tenant_uuid],
+                database.PhonebookKey(uuid=self._phonebook_uuid),
+                [contact_1, contact_2],
+            ),
+            raises(exception.ContactCreationError).matching(
+                has_properties(
+                    details=has_entries(
+                        errors=contains(has_entries(contact=contact_2, index=1))
+                    )
+                )
+            ),
+        )
+        assert_that(
+            self._crud.list(
+                [self._tenant_uuid], database.PhonebookKey(uuid=self._phonebook_uuid)
+            ),
+            empty(),
+        )
+
     @staticmethod
     def _new_contact(firstname, lastname, number):
         return {'firstname': firstname, 'lastname': lastname, 'number': number}
@@ -1037,6 +1104,44 @@ class TestPhonebookContactCRUDList(_BasePhonebookContactCRUDTest):
 
         assert_that(result, contains_inanyorder(self._contact_1, self._contact_2))
 
+    def test_that_the_list_can_be_ordered_and_paginated(self):
+        result = self._crud.list(
+            [self._tenant_uuid],
+            database.PhonebookKey(uuid=self._phonebook_uuid),
+            order='name',
+            direction='desc',
+            limit=2,
+            offset=1,
+        )
+
+        assert_that(result, contains(self._contact_3, self._contact_1))
+
+    def test_that_contacts_without_the_order_field_are_last(self):
+        contact_4 = self._crud.create(
+            [self._tenant_uuid],
+            database.PhonebookKey(uuid=self._phonebook_uuid),
+            {'foo': 'bar'},
+        )
+        contact_5 = self._crud.create(
+            [self._tenant_uuid],
+            database.PhonebookKey(uuid=self._phonebook_uuid),
+            {'name': 'Ännabelle', 'foo': 'bar'},
+        )
+
+        result = self._crud.list(
+            [self._tenant_uuid],
+            database.PhonebookKey(uuid=self._phonebook_uuid),
+            order='name',
+            order_insensitive=True,
+        )
+
+        assert_that(
+            result,
+            contains(
+                contact_5, self._contact_1, self._contact_3, self._contact_2, contact_4
+            ),
+        )
+
 
 class TestPhonebookContactCRUDCount(_BasePhonebookContactCRUDTest):
     def setUp(self):
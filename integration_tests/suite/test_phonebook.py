@@ -14,6 +14,7 @@ from hamcrest import (
     has_entries,
     instance_of,
 )
+from wazo_test_helpers import until
 
 from .helpers.phonebook import BasePhonebookTestCase
 
@@ -824,7 +825,14 @@ Bob,
                 created=contains_inanyorder(
                     has_entries(firstname='Alice', lastname='A'),
                     has_entries(firstname='Bob', lastname='B'),
-                )
+                ),
+                duplicates=contains(
+                    has_entries(
+                        contact=has_entries(firstname='Alice', lastname='A'),
+                        message='Duplicate contact',
+                        index=1,
+                    )
+                ),
             ),
         )
 
@@ -859,6 +867,7 @@ Bob,
                     has_entries(firstname='Charlie', lastname='C'),
                 ),
                 failed=empty(),
+                duplicates=contains(has_entries(index=1)),
             ),
         )
 
@@ -883,12 +892,18 @@ Bob,
             data,
         )
         assert_that(result.status_code, equal_to(201))
-        # no errors, no new contacts
+        # no errors, no new contacts, every line is a duplicate
         assert_that(
             result.json(),
             has_entries(
                 created=empty(),
                 failed=empty(),
+                duplicates=contains(
+                    has_entries(index=0),
+                    has_entries(index=1),
+                    has_entries(index=2),
+                    has_entries(index=3),
+                ),
             ),
         )
 
@@ -907,3 +922,61 @@ Bob,
                 total=3,
             ),
         )
+
+
+class TestContactImportJob(_BasePhonebookContactTestCase):
+    def test_unknown_tenant_or_phonebook(self):
+        self.set_tenants(self.tenant_2.name)
+        result = self.start_phonebook_import(
+            self.phonebook_1['uuid'], 'firstname\nAlice\n', tenant=self.tenant_2.uuid
+        )
+        assert_that(result.status_code, equal_to(404))
+
+        result = self.get_phonebook_import(
+            self.phonebook_1['uuid'], str(uuid.uuid4()), tenant=self.tenant_1.uuid
+        )
+        assert_that(result.status_code, equal_to(404))
+
+    def test_import(self):
+        self.set_tenants(self.tenant_1.name)
+        body = '\n'.join(['firstname,lastname', 'Alice,A', 'Alice,A', ',B', 'Bob,B'])
+
+        result = self.start_phonebook_import(
+            self.phonebook_1['uuid'], body, tenant=self.tenant_1.uuid
+        )
+        assert_that(result.status_code, equal_to(202))
+        job_uuid = result.json()['uuid']
+
+        def import_completed():
+            result = self.get_phonebook_import(
+                self.phonebook_1['uuid'], job_uuid, tenant=self.tenant_1.uuid
+            )
+            assert_that(
+                result.json(),
+                has_entries(
+                    uuid=job_uuid,
+                    status='completed',
+                    total=4,
+                    processed=4,
+                    created=3,
+                    failed=0,
+                    skipped=1,
+                    errors=empty(),
+                    duplicates=contains(
+                        has_entries(
+                            contact=has_entries(firstname='Alice', lastname='A'),
+                            message='Duplicate contact',
+                            index=1,
+                        )
+                    ),
+                ),
+            )
+
+        until.assert_(import_completed, timeout=10)
+
+        assert_that(
+            self.list_phonebook_contacts(
+                self.phonebook_1['uuid'], tenant=self.tenant_1.uuid
+            ).json(),
+            has_entries(total=3),
+        )
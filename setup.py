@@ -62,6 +62,7 @@ setup(
             'phonebook_deprecated_view = wazo_dird.plugins.phonebook_deprecated.plugin:DeprecatedPhonebookViewPlugin',
             'phonebook_backend = wazo_dird.plugins.phonebook_backend.plugin:PhonebookView',
             'status_view = wazo_dird.plugins.status.plugin:StatusViewPlugin',
+            'metrics_view = wazo_dird.plugins.metrics.plugin:MetricsViewPlugin',
             'personal_backend = wazo_dird.plugins.personal_backend.plugin:PersonalView',
             'profiles_view = wazo_dird.plugins.profiles.plugin:ProfilesViewPlugin',
             'sources_view = wazo_dird.plugins.sources.plugin:SourcesViewPlugin',
@@ -0,0 +1,51 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+
+from .config import SourceConcurrencyConfig
+
+
+class Bulkheads:
+    """Limit the number of pending requests of each source in a shared executor
+
+    A request is pending from its submission until it completes or is cancelled.
+    The limit of a source is the one of its backend or the default limit, `None`
+    meaning no limit.
+    """
+
+    def __init__(self, config: SourceConcurrencyConfig | None) -> None:
+        config = config or {}
+        self._default = config.get('default')
+        self._backends = config.get('backends') or {}
+        self._pending: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def limit(self, backend: str) -> int | None:
+        return self._backends.get(backend, self._default)
+
+    def pending(self, source_uuid: str) -> int:
+        return self._pending.get(source_uuid, 0)
+
+    def acquire(self, source_uuid: str, backend: str) -> bool:
+        limit = self.limit(backend)
+        with self._lock:
+            pending = self._pending.get(source_uuid, 0)
+            if limit is not None and pending >= limit:
+                return False
+            self._pending[source_uuid] = pending + 1
+            return True
+
+    def release_when_done(self, source_uuid: str, future: Future) -> None:
+        future.add_done_callback(lambda _: self.release(source_uuid))
+
+    def release(self, source_uuid: str) -> None:
+        with self._lock:
+            pending = self._pending.get(source_uuid, 0) - 1
+            if pending > 0:
+                self._pending[source_uuid] = pending
+            else:
+                self._pending.pop(source_uuid, None)
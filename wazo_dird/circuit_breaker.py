@@ -0,0 +1,206 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Literal, Protocol, TypedDict
+
+from .config import CircuitBreakerConfig
+
+if TYPE_CHECKING:
+    from .plugins.base_plugins import BaseSourcePlugin
+
+logger = logging.getLogger(__name__)
+
+State = Literal['closed', 'open', 'half_open']
+
+
+class BreakerStatus(TypedDict):
+    name: str
+    backend: str
+    state: State
+    consecutive_failures: int
+
+
+class Outcome(Protocol):
+    raised: bool
+
+
+class CircuitBreaker:
+    """Stop calling a source after `failure_threshold` consecutive failures
+
+    Once open, a single probe call is let through after `reset_timeout` seconds,
+    closing the breaker if it succeeds and opening it again otherwise.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.backend = backend
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._state: State = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> State:
+        return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == 'closed':
+                return True
+            if self._probing:
+                return False
+            if self._clock() - self._opened_at < self._reset_timeout:
+                return False
+            self._state = 'half_open'
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != 'closed':
+                logger.info('Source %s answered, closing its circuit', self.name)
+            self._state = 'closed'
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == 'half_open' or (
+                self._state == 'closed' and self._failures >= self._failure_threshold
+            ):
+                logger.warning(
+                    'Source %s failed %d times in a row, skipping it for %s seconds',
+                    self.name,
+                    self._failures,
+                    self._reset_timeout,
+                )
+                self._state = 'open'
+                self._opened_at = self._clock()
+
+    def record_abandon(self) -> None:
+        """The call was cancelled for another reason than a failure of the source"""
+        with self._lock:
+            if self._state == 'half_open':
+                # let the next call probe the source
+                self._state = 'open'
+            self._probing = False
+
+    def status(self) -> BreakerStatus:
+        return {
+            'name': self.name,
+            'backend': self.backend,
+            'state': self._state,
+            'consecutive_failures': self._failures,
+        }
+
+
+class _Call:
+    def __init__(self, breaker: CircuitBreaker, outcome: Outcome) -> None:
+        self._breaker = breaker
+        self._outcome = outcome
+        self._settled = False
+        self._lock = threading.Lock()
+
+    def _settle(self) -> bool:
+        with self._lock:
+            settled, self._settled = self._settled, True
+        return not settled
+
+    def timed_out(self) -> None:
+        if self._settle():
+            self._breaker.record_failure()
+
+    def done(self, future: Future) -> None:
+        if not self._settle():
+            return
+        if future.cancelled():
+            self._breaker.record_abandon()
+        elif self._outcome.raised:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+
+
+class CircuitBreakers:
+    """The circuit breakers of the sources used by a service, by source uuid"""
+
+    def __init__(
+        self,
+        config: CircuitBreakerConfig | None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        config = config or {}
+        self.enabled = bool(config.get('enabled'))
+        self._failure_threshold = config.get('failure_threshold', 5)
+        self._reset_timeout = config.get('reset_timeout', 30)
+        self._clock = clock
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, source_uuid: str, source: BaseSourcePlugin) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(source_uuid)
+            if breaker is None:
+                breaker = self._breakers[source_uuid] = CircuitBreaker(
+                    source.name,
+                    source.backend,
+                    self._failure_threshold,
+                    self._reset_timeout,
+                    self._clock,
+                )
+            return breaker
+
+    def allow(self, source_uuid: str, source: BaseSourcePlugin) -> bool:
+        if not self.enabled:
+            return True
+        return self.get(source_uuid, source).allow()
+
+    def track(
+        self,
+        source_uuid: str,
+        source: BaseSourcePlugin,
+        future: Future,
+        outcome: Outcome,
+    ) -> None:
+        """Record the outcome of a call once its future is done
+
+        `outcome.raised` tells whether the source raised, e.g. a `RaiseStopper`.
+        """
+        if not self.enabled:
+            return
+        call = _Call(self.get(source_uuid, source), outcome)
+        setattr(future, 'breaker_call', call)
+        future.add_done_callback(call.done)
+
+    @staticmethod
+    def timed_out(futures: Iterable[Future]) -> None:
+        """Record a failure for the calls still pending when the timeout expired"""
+        for future in futures:
+            call: _Call | None = getattr(future, 'breaker_call', None)
+            if call and not future.done():
+                call.timed_out()
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {source_uuid: breaker.status() for source_uuid, breaker in breakers}
@@ -80,18 +80,54 @@ class ConsulConfig(TypedDict):
     port: int
 
 
+class SourceConcurrencyConfig(TypedDict, total=False):
+    default: int | None
+    backends: dict[str, int]
+
+
+class CircuitBreakerConfig(TypedDict, total=False):
+    enabled: bool
+    failure_threshold: int
+    reset_timeout: float
+
+
+class ReverseCacheConfig(TypedDict, total=False):
+    enabled: bool
+    hit_ttl: float
+    miss_ttl: float
+    max_size: int
+
+
 class ReverseServiceConfig(TypedDict, total=False):
     executor_workers: int | None
+    cache: ReverseCacheConfig
+    source_concurrency: SourceConcurrencyConfig
+    circuit_breaker: CircuitBreakerConfig
+
+
+class CacheConfig(TypedDict, total=False):
+    enabled: bool
+    ttl: float
+    max_size: int
 
 
 class LookupServiceConfig(TypedDict, total=False):
     executor_workers: int | None
+    cache: CacheConfig
+    source_concurrency: SourceConcurrencyConfig
+    circuit_breaker: CircuitBreakerConfig
 
 
 class FavoritesServiceConfig(TypedDict, total=False):
     executor_workers: int | None
 
 
+class ImportJobsConfig(TypedDict):
+    workers: int
+    batch_size: int
+    ttl: float
+
+
 class Config(TypedDict, total=False):
     uuid: str
     auth: AuthConfig
@@ -108,6 +144,7 @@ class Config(TypedDict, total=False):
     reverse_service: ReverseServiceConfig
     lookup_service: LookupServiceConfig
     favorites_service: FavoritesServiceConfig
+    import_jobs: ImportJobsConfig
     user: str
     bus: BusConfig
     consul: ConsulConfig
@@ -170,6 +207,7 @@ _DEFAULT_CONFIG: Config = {
             'graphql_view': True,
             'headers_view': True,
             'ldap_backend': True,
+            'metrics_view': True,
             'office365_backend': True,
             'personal_backend': True,
             'personal_view': True,
@@ -199,13 +237,47 @@ _DEFAULT_CONFIG: Config = {
     },
     'reverse_service': {
         'executor_workers': None,  # None: inherit rest_api.max_threads
+        'cache': {
+            'enabled': False,
+            'hit_ttl': 60,
+            'miss_ttl': 10,
+            'max_size': 10000,
+        },
+        'source_concurrency': {
+            'default': None,
+            'backends': {},
+        },
+        'circuit_breaker': {
+            'enabled': False,
+            'failure_threshold': 5,
+            'reset_timeout': 30,
+        },
     },
     'lookup_service': {
         'executor_workers': None,  # None: inherit rest_api.max_threads
+        'cache': {
+            'enabled': False,
+            'ttl': 30,
+            'max_size': 10000,
+        },
+        'source_concurrency': {
+            'default': None,
+            'backends': {},
+        },
+        'circuit_breaker': {
+            'enabled': False,
+            'failure_threshold': 5,
+            'reset_timeout': 30,
+        },
     },
     'favorites_service': {
         'executor_workers': None,  # None: inherit rest_api.max_threads
     },
+    'import_jobs': {
+        'workers': 1,
+        'batch_size': 1000,
+        'ttl': 3600,
+    },
     'services': {
         'service_discovery': {
             'template_path': '/etc/wazo-dird/templates.d/',
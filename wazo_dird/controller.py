@@ -75,6 +75,7 @@ class Controller:
             self.config,
             self.auth_client,
             self.token_renewer,
+            self.bus,
         )
 
     def run(self) -> None:
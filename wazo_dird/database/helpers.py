@@ -1,13 +1,34 @@
 # Copyright 2019-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+from time import perf_counter
+from typing import Any
+
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from wazo_dird import metrics
 
 Session = scoped_session(sessionmaker())
 
 
+class InstrumentedQueuePool(QueuePool):
+    """Connection pool reporting the time spent waiting for a connection"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        metrics.track_pool(self)
+
+    def _do_get(self) -> Any:
+        started_at = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.DB_POOL_CHECKOUT_SECONDS.observe(perf_counter() - started_at)
+
+
 def init_db(
     db_uri: str, echo: bool = False, pool_size: int = 16, max_overflow: int = 10
 ) -> Engine:
@@ -17,6 +38,7 @@ def init_db(
         pool_size=pool_size,
         max_overflow=max_overflow,
         pool_pre_ping=True,
+        poolclass=InstrumentedQueuePool,
     )
     Session.configure(bind=engine)
     return engine
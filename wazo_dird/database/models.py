@@ -1,4 +1,4 @@
-# Copyright 2016-2025 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import logging
@@ -15,7 +15,7 @@ from sqlalchemy import (
     sql,
     text,
 )
-from sqlalchemy.dialects.postgresql import ARRAY, HSTORE, JSON, UUID
+from sqlalchemy.dialects.postgresql import ARRAY, HSTORE, JSON, JSONB, UUID
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import declarative_base, relationship
@@ -37,6 +37,12 @@ class Contact(Base):
         ),
         schema.Index('dird_contact__idx__user_uuid', 'user_uuid'),
         schema.Index('dird_contact__idx__phonebook_uuid', 'phonebook_uuid'),
+        schema.Index(
+            'dird_contact__idx__fields',
+            'fields',
+            postgresql_using='gin',
+            postgresql_ops={'fields': 'jsonb_path_ops'},
+        ),
     )
 
     uuid = Column(
@@ -50,25 +56,34 @@ class Contact(Base):
         UUID(as_uuid=False), ForeignKey('dird_phonebook.uuid', ondelete='CASCADE')
     )
     hash = Column(String(40), nullable=False)
+    # The fields of the contact, without its id. Contacts are read from this
+    # column, dird_contact_fields rows are kept in sync for searches.
+    fields = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
 
     phonebook = relationship(lambda: Phonebook, foreign_keys=[phonebook_uuid])
 
-    fields = relationship(
+    field_rows = relationship(
         lambda: ContactFields,
-        lazy='subquery',
         passive_deletes=True,
         cascade='all, delete-orphan',
     )
 
     @property
     def fields_dict(self) -> dict[str, Any]:
-        return {field.name: field.value for field in self.fields}
+        return {'id': self.uuid, **self.fields}
 
 
 class ContactFields(Base):
     __tablename__ = 'dird_contact_fields'
     __table_args__ = (
         schema.Index('dird_contact_fields__idx__contact_uuid', 'contact_uuid'),
+        schema.Index(
+            'dird_contact_fields__idx__name_value_trgm',
+            'name',
+            'value',
+            postgresql_using='gin',
+            postgresql_ops={'value': 'gin_trgm_ops'},
+        ),
     )
 
     id = Column(Integer(), primary_key=True)
@@ -5,18 +5,23 @@ from __future__ import annotations
 
 import hashlib
 import json
-from collections.abc import Callable, Iterator, Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from contextlib import contextmanager
 from typing import Any, Literal, TypedDict, cast
 
 from sqlalchemy import exc
 from sqlalchemy.orm import Session as BaseSession
 from sqlalchemy.orm import scoped_session
+from sqlalchemy.sql.functions import ReturnTypeFromArgs
 
 from wazo_dird.database import Tenant, User
 from wazo_dird.exception import DatabaseServiceUnavailable
 
-from .. import ContactFields
+from .. import Contact
+
+
+class unaccent(ReturnTypeFromArgs):
+    inherit_cache = True
 
 
 def delete_user(session: BaseSession, user_uuid: str) -> None:
@@ -38,16 +43,35 @@ def list_contacts_by_uuid(session: BaseSession, uuids: list[str]) -> list[Contac
     if not uuids:
         return []
 
-    contact_fields = session.query(ContactFields).filter(
-        ContactFields.contact_uuid.in_(uuids)
-    )
-    result = {}
-    for contact_field in contact_fields.all():
-        uuid = contact_field.contact_uuid
-        if uuid not in result:
-            result[uuid] = {'id': uuid}
-        result[uuid][contact_field.name] = contact_field.value
-    return cast(list[ContactInfo], list(result.values()))
+    rows = session.query(Contact.uuid, Contact.fields).filter(Contact.uuid.in_(uuids))
+    return [contact_info(uuid, fields) for uuid, fields in rows]
+
+
+def contact_info(contact_uuid: str, fields: Mapping[str, Any]) -> ContactInfo:
+    return cast(ContactInfo, {'id': contact_uuid, **fields})
+
+
+def contact_fields(contact_body: Mapping[str, Any]) -> dict[str, str | None]:
+    """The fields of a contact as stored in dird_contact.fields
+
+    Values are stored as text, like in dird_contact_fields, and the id is the
+    uuid of the contact.
+    """
+    return {
+        name: None if value is None else str(value)
+        for name, value in contact_body.items()
+        if name != 'id'
+    }
+
+
+def contact_field_rows(
+    rows: Iterable[tuple[str, Mapping[str, Any]]],
+) -> list[tuple[str, str, str]]:
+    return [
+        (contact_uuid, name, value)
+        for contact_uuid, fields in rows
+        for name, value in fields.items()
+    ]
 
 
 def compute_contact_hash(contact_info: Mapping[str, Any]) -> str:
@@ -9,7 +9,6 @@ from sqlalchemy import and_, distinct, select, text
 from sqlalchemy.orm import Session as BaseSession
 from sqlalchemy.orm import scoped_session
 from sqlalchemy.sql.expression import ColumnElement
-from sqlalchemy.sql.functions import ReturnTypeFromArgs
 from unidecode import unidecode
 
 from wazo_dird.exception import DuplicatedContactException, NoSuchContact
@@ -21,14 +20,12 @@ from .base import (
     ContactInfo,
     build_exten_contact_map,
     compute_contact_hash,
+    contact_fields,
     list_contacts_by_uuid,
+    unaccent,
 )
 
 
-class unaccent(ReturnTypeFromArgs):
-    inherit_cache = True
-
-
 class PersonalContactSearchEngine(BaseDAO):
     def __init__(
         self,
@@ -216,7 +213,11 @@ class PersonalContactCRUD(BaseDAO):
 
         for hash_ in to_add:
             contact_info = hash_and_contact[hash_]
-            contact_args = {'user_uuid': user.user_uuid, 'hash': hash_}
+            contact_args = {
+                'user_uuid': user.user_uuid,
+                'hash': hash_,
+                'fields': contact_fields(contact_info),
+            }
             contact_uuid = contact_info.get('id')
             if contact_uuid:
                 contact_args['uuid'] = contact_uuid
@@ -5,11 +5,12 @@ from __future__ import annotations
 
 import builtins
 import logging
-from collections import defaultdict
 from typing import Any, TypedDict, cast
+from uuid import uuid4
 
 from psycopg2 import errorcodes
 from sqlalchemy import and_, distinct, exc, func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Query
 from sqlalchemy.orm import Session as BaseSession
 from sqlalchemy.orm import scoped_session
@@ -33,11 +34,19 @@ from .base import (
     ContactInfo,
     build_exten_contact_map,
     compute_contact_hash,
-    list_contacts_by_uuid,
+    contact_field_rows,
+    contact_fields,
+    contact_info,
+    unaccent,
 )
 
 logger = logging.getLogger(__name__)
 
+# Contacts and contact fields inserted per statement by create_many, kept well
+# under the 65535 bind parameters PostgreSQL accepts in a single statement
+CONTACT_BATCH_SIZE = 1000
+FIELD_ROW_BATCH_SIZE = 5000
+
 
 class PhonebookKey(TypedDict, total=False):
     id: int
@@ -105,27 +114,24 @@ class PhonebookContactSearchEngine(BaseDAO):
                 Phonebook.tenant_uuid.in_(self._visible_tenants),
             )
 
-        matched_uuids = (
-            select(ContactFields.contact_uuid)
-            .join(Contact)
-            .join(Phonebook)
-            .where(
-                ContactFields.value.in_(extens),
-                ContactFields.name.in_(self._first_match_columns),
-                tenant_filter,
+        # served by the GIN index on dird_contact.fields
+        match_filter = or_(
+            *(
+                Contact.fields.contains({column: exten})
+                for column in self._first_match_columns
+                for exten in extens
             )
-            .distinct()
-            .scalar_subquery()
         )
         with self.new_session() as s:
             rows = (
-                s.query(
-                    ContactFields.contact_uuid, ContactFields.name, ContactFields.value
-                )
-                .filter(ContactFields.contact_uuid.in_(matched_uuids))
+                s.query(Contact.uuid, Contact.fields)
+                .join(Phonebook)
+                .filter(match_filter, tenant_filter)
                 .all()
             )
-            return build_exten_contact_map(rows, extens, self._first_match_columns)
+            return build_exten_contact_map(
+                contact_field_rows(rows), extens, self._first_match_columns
+            )
 
     def list_contacts(self, contact_uuids: list[str]) -> list[ContactInfo]:
         filter_ = self._new_list_filter(contact_uuids)
@@ -139,26 +145,27 @@ class PhonebookContactSearchEngine(BaseDAO):
         if self._visible_tenants is None:
             _filter = and_(filter_, phonebook_filter)
         elif not self._visible_tenants:
-            _filter = text('false')
+            return []
         else:
             _filter = and_(
                 filter_,
                 phonebook_filter,
                 Phonebook.tenant_uuid.in_(self._visible_tenants),
             )
-        query = (
-            s.query(distinct(ContactFields.contact_uuid))
+        matched_uuids = (
+            select(ContactFields.contact_uuid)
             .join(Contact)
             .join(Phonebook)
-            .filter(_filter)
+            .where(_filter)
+            .distinct()
         )
-
         if limit:
-            query = query.limit(limit)
-
-        uuids = [uuid for (uuid,) in query.all()]
+            matched_uuids = matched_uuids.limit(limit)
 
-        return list_contacts_by_uuid(s, uuids)
+        rows = s.query(Contact.uuid, Contact.fields).filter(
+            Contact.uuid.in_(matched_uuids.scalar_subquery())
+        )
+        return [contact_info(uuid, fields) for uuid, fields in rows]
 
     def _new_list_filter(self, contact_uuids: list[str]) -> bool | ColumnElement:
         if not contact_uuids:
@@ -188,12 +195,35 @@ def contact_search_filter(search: str | None) -> bool | ColumnElement:
     return search_filter
 
 
+def contact_order_by(
+    order: str | None, direction: Direction | None, order_insensitive: bool
+) -> builtins.list[ColumnElement]:
+    # Same ordering as plugin_helpers.sorting.sort_contacts: accents are
+    # ignored and contacts without a value come last in ascending order
+    if not order:
+        return [Contact.uuid]
+
+    value = Contact.fields[order].astext
+    sort_key = unaccent(value)
+    if order_insensitive:
+        sort_key = func.lower(sort_key)
+    missing = func.coalesce(value, '') == ''
+    columns = [missing, sort_key.collate('C')]
+    if direction == 'desc':
+        columns = [column.desc() for column in columns]
+    return columns + [Contact.uuid]
+
+
 class ContactEntryError(TypedDict):
     contact: dict[str, Any] | None
     message: str
     index: int
 
 
+def _duplicate_entry(contact: dict[str, Any], index: int) -> ContactEntryError:
+    return ContactEntryError(contact=contact, message='Duplicate contact', index=index)
+
+
 class PhonebookContactCRUD(BaseDAO):
     def count(
         self,
@@ -243,44 +273,36 @@ class PhonebookContactCRUD(BaseDAO):
         phonebook_key: PhonebookKey,
         body: list[dict[str, Any]],
     ) -> tuple[list[ContactInfo], list[ContactEntryError]]:
+        """Create the contacts of `body`, returning the created contacts and the
+        duplicates that were skipped, either in `body` or in the phonebook
+
+        Nothing is created if a contact can not be stored.
+        """
         errors: list[ContactEntryError] = []
-        good: list[ContactInfo] = []
+        duplicates: list[ContactEntryError] = []
+        created: list[ContactInfo] = []
         with self.new_session() as s:
             phonebook = self._get_phonebook(s, visible_tenants, phonebook_key)
-            tenant_uuid = phonebook.tenant_uuid
+            contacts: dict[str, tuple[int, dict[str, str | None]]] = {}
             for i, contact_body in enumerate(body):
-                try:
-                    with s.begin_nested():
-                        contact = self._create_one(
-                            s,
-                            tenant_uuid,
-                            PhonebookKey(uuid=phonebook.uuid),
-                            contact_body,
-                        )
-                    good.append(contact)
-                except DuplicatedContactException:
-                    logger.debug(
-                        'Ignoring duplicate contact entry (index=%d) in phonebook %s: %s',
-                        i,
-                        phonebook_key,
-                        contact_body,
-                    )
+                hash_ = compute_contact_hash(contact_body)
+                if hash_ in contacts:
+                    duplicates.append(_duplicate_entry(contact_body, i))
                     continue
-                except ContactCreationError as ex:
-                    logger.debug(
-                        'Failed to create contact %s in phonebook %s: %s <: %s',
-                        contact_body,
-                        phonebook_key,
-                        str(ex),
-                        stack_info=True,
-                    )
+                fields = contact_fields(contact_body)
+                if any(
+                    '\x00' in name or (value and '\x00' in value)
+                    for name, value in fields.items()
+                ):
                     errors.append(
                         ContactEntryError(
                             contact=contact_body,
-                            message=str(ex),
+                            message='Contact fields cannot contain NUL characters',
                             index=i,
                         )
                     )
+                    continue
+                contacts[hash_] = (i, fields)
             if errors:
                 raise ContactCreationError(
                     msg='Failed to create contacts',
@@ -288,8 +310,67 @@ class PhonebookContactCRUD(BaseDAO):
                         'errors': errors,
                     },
                 )
-            created = good
-        return created, errors
+
+            items = [(hash_, fields) for hash_, (_, fields) in contacts.items()]
+            for start in range(0, len(items), CONTACT_BATCH_SIZE):
+                batch = items[start : start + CONTACT_BATCH_SIZE]
+                inserted = self._insert_contacts(s, phonebook.uuid, batch)
+                created.extend(inserted.values())
+                for hash_, _ in batch:
+                    if hash_ not in inserted:
+                        i, _ = contacts[hash_]
+                        duplicates.append(_duplicate_entry(body[i], i))
+
+        if duplicates:
+            logger.debug(
+                'Skipped %d duplicate contacts in phonebook %s',
+                len(duplicates),
+                phonebook_key,
+            )
+        duplicates.sort(key=lambda duplicate: duplicate['index'])
+        return created, duplicates
+
+    def _insert_contacts(
+        self,
+        s: BaseSession,
+        phonebook_uuid: str,
+        contacts: builtins.list[tuple[str, dict[str, str | None]]],
+    ) -> dict[str, ContactInfo]:
+        """Insert `contacts`, returning the created contacts by hash
+
+        Contacts already in the phonebook are not inserted nor returned.
+        """
+        contact_table = Contact.__table__
+        rows = [
+            {
+                'uuid': str(uuid4()),
+                'phonebook_uuid': phonebook_uuid,
+                'hash': hash_,
+                'fields': fields,
+            }
+            for hash_, fields in contacts
+        ]
+        query = (
+            insert(contact_table)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=['phonebook_uuid', 'hash'])
+            .returning(contact_table.c.uuid)
+        )
+        inserted = {uuid for uuid, in s.execute(query)}
+        new_rows = [row for row in rows if row['uuid'] in inserted]
+
+        field_rows = [
+            {'contact_uuid': row['uuid'], 'name': name, 'value': value}
+            for row in new_rows
+            for name, value in [*row['fields'].items(), ('id', row['uuid'])]
+        ]
+        for start in range(0, len(field_rows), FIELD_ROW_BATCH_SIZE):
+            batch = field_rows[start : start + FIELD_ROW_BATCH_SIZE]
+            s.execute(insert(ContactFields.__table__).values(batch))
+
+        return {
+            row['hash']: contact_info(row['uuid'], row['fields']) for row in new_rows
+        }
 
     def _create_one(
         self,
@@ -389,50 +470,54 @@ class PhonebookContactCRUD(BaseDAO):
             filter_ = self._new_contact_filter(
                 phonebook.tenant_uuid, PhonebookKey(uuid=phonebook.uuid), contact_uuid
             )
-            fields = (
-                s.query(ContactFields)
-                .join(Contact)
+            row = (
+                s.query(Contact.uuid, Contact.fields)
                 .join(Phonebook, Contact.phonebook_uuid == Phonebook.uuid)
                 .filter(filter_)
-                .all()
+                .first()
             )
-            if not fields:
+            if not row:
                 raise NoSuchContact(contact_uuid)
-            contact_info = {field.name: field.value for field in fields}
-            assert 'id' in contact_info
-            return cast(ContactInfo, contact_info)
+            return contact_info(row.uuid, row.fields)
 
     def list(
         self,
         visible_tenants: list[str] | None,
         phonebook_key: PhonebookKey,
         search: str | None = None,
+        order: str | None = None,
+        direction: Direction | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        order_insensitive: bool = False,
     ) -> list[ContactInfo]:
         with self.new_session() as s:
             phonebook = self._get_phonebook(s, visible_tenants, phonebook_key)
-            fields = self._list_contact_fields(
-                s,
-                phonebook_key=PhonebookKey(uuid=phonebook.uuid),
-                search=search,
+            rows = (
+                self._query_contacts(
+                    s,
+                    phonebook_key=PhonebookKey(uuid=phonebook.uuid),
+                    search=search,
+                )
+                .with_entities(Contact.uuid, Contact.fields)
+                .order_by(*contact_order_by(order, direction, order_insensitive))
+                .limit(limit)
+                .offset(offset)
             )
-
-            result: dict[str, dict[str, Any]] = defaultdict(dict)
-            for field in fields:
-                result[field.contact_uuid][field.name] = field.value
-
-        return cast(list[ContactInfo], list(result.values()))
+            logger.debug("listing contacts with query %s", str(rows.statement))
+            return [contact_info(uuid, fields) for uuid, fields in rows]
 
     def _set_contact_fields(
         self, s: BaseSession, contact: Contact, contact_body: dict[str, Any]
     ) -> None:
         assert contact.uuid
-        contact.fields = [
+        fields = contact_fields(contact_body)
+        contact.fields = fields
+        # the id row lets searches match the uuid of the contact
+        contact.field_rows = [
             ContactFields(name=name, value=value, contact_uuid=contact.uuid)
-            for name, value in contact_body.items()
-        ] + [
-            ContactFields(name='id', value=contact.uuid, contact_uuid=contact.uuid)
-            for name, value in contact_body.items()
-        ]
+            for name, value in fields.items()
+        ] + [ContactFields(name='id', value=contact.uuid, contact_uuid=contact.uuid)]
 
     def _get_contact(
         self,
@@ -487,33 +572,6 @@ class PhonebookContactCRUD(BaseDAO):
         query = s.query(Contact).join(Phonebook).filter(filter_)
         return query
 
-    def _query_contact_fields(
-        self,
-        s: BaseSession,
-        phonebook_key: PhonebookKey,
-        search: str | None,
-    ) -> Query:
-        phonebook_filter = self._build_phonebook_filter(phonebook_key)
-        search_filter = contact_search_filter(search)
-        filter_ = and_(
-            phonebook_filter,
-            search_filter,
-        )
-        query = s.query(ContactFields).join(Contact).join(Phonebook).filter(filter_)
-        return query
-
-    def _list_contact_fields(
-        self,
-        s: BaseSession,
-        phonebook_key: PhonebookKey,
-        search: str | None = None,
-    ) -> builtins.list[ContactFields]:
-        query = self._query_contact_fields(
-            s, phonebook_key=phonebook_key, search=search
-        )
-        logger.debug("listing contact fields with query %s", str(query.statement))
-        return cast(builtins.list[ContactFields], query.all())
-
     def _new_contact_filter(
         self, tenant_uuid: str, phonebook_key: PhonebookKey, contact_uuid: str
     ) -> ColumnElement:
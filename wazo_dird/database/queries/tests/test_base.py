@@ -3,7 +3,12 @@
 
 import unittest
 
-from wazo_dird.database.queries.base import build_exten_contact_map
+from wazo_dird.database.queries.base import (
+    build_exten_contact_map,
+    contact_field_rows,
+    contact_fields,
+    contact_info,
+)
 
 
 class TestBuildExtenContactMap(unittest.TestCase):
@@ -84,3 +89,33 @@ class TestBuildExtenContactMap(unittest.TestCase):
         assert '1111' in result
         assert '9999' in result
         assert result['1111'] == result['9999']
+
+
+class TestContactFields(unittest.TestCase):
+    def test_id_is_not_stored(self):
+        result = contact_fields({'id': 'uuid-1', 'firstname': 'Alice'})
+        assert result == {'firstname': 'Alice'}
+
+    def test_values_are_stored_as_text(self):
+        result = contact_fields({'number': 1234, 'note': None})
+        assert result == {'number': '1234', 'note': None}
+
+    def test_contact_info_adds_the_id(self):
+        result = contact_info('uuid-1', {'firstname': 'Alice'})
+        assert result == {'id': 'uuid-1', 'firstname': 'Alice'}
+
+
+class TestContactFieldRows(unittest.TestCase):
+    def test_empty_rows_returns_empty(self):
+        assert contact_field_rows([]) == []
+
+    def test_one_row_per_field(self):
+        rows = [
+            ('uuid-1', {'firstname': 'Alice', 'number': '1111'}),
+            ('uuid-2', {'firstname': 'Bob'}),
+        ]
+        assert contact_field_rows(rows) == [
+            ('uuid-1', 'firstname', 'Alice'),
+            ('uuid-1', 'number', '1111'),
+            ('uuid-2', 'firstname', 'Bob'),
+        ]
@@ -1,4 +1,4 @@
-# Copyright 2015-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
@@ -47,6 +47,11 @@ class NoSuchPhonebook(ValueError):
         super().__init__(message)
 
 
+class NoSuchImportJob(ValueError):
+    def __init__(self, job_uuid: str) -> None:
+        super().__init__(f'No such import job: {job_uuid}')
+
+
 class NoSuchPhonebookAPIException(APIException):
     def __init__(
         self, resource: str, visible_tenants: list[str], phonebook_key: dict[str, Any]
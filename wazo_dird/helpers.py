@@ -54,11 +54,13 @@ class DisplayAwareResource:
 class RaiseStopper(Generic[T]):
     def __init__(self, return_on_raise: T):
         self.return_on_raise = return_on_raise
+        self.raised = False
 
     def execute(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
         try:
             return function(*args, **kwargs)
         except Exception:
+            self.raised = True
             logger.exception('An error occured in %s', function.__name__)
         return self.return_on_raise
 
@@ -73,6 +75,7 @@ class ServiceConfig(TypedDict, total=False):
 
 
 class ProfileConfig(TypedDict, total=False):
+    uuid: str
     name: str
     services: dict[str, ServiceConfig]
 
@@ -95,6 +98,11 @@ class BaseService:
     def source_from_profile(
         self, profile_config: ProfileConfig
     ) -> list[BaseSourcePlugin]:
+        return [source for _, source in self.source_items_from_profile(profile_config)]
+
+    def source_items_from_profile(
+        self, profile_config: ProfileConfig
+    ) -> list[tuple[str, BaseSourcePlugin]]:
         service_config = profile_config.get('services', {}).get(self._service_name, {})
         source_configs = service_config.get('sources', [])
 
@@ -104,7 +112,7 @@ class BaseService:
             if not source:
                 continue
 
-            result.append(source)
+            result.append((source_config['uuid'], source))
 
         if not result:
             logger.warning(
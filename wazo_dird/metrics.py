@@ -0,0 +1,311 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import abc
+import bisect
+import threading
+import weakref
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from wazo_dird.helpers import RaiseStopper
+    from wazo_dird.plugins.base_plugins import BaseSourcePlugin
+
+T = TypeVar('T')
+
+Labels = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"'),
+        )
+        for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(metaclass=abc.ABCMeta):
+    type_: str
+
+    def __init__(self, name: str, help_: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.type_}']
+        lines.extend(self._samples())
+        return lines
+
+    @abc.abstractmethod
+    def _samples(self) -> list[str]:
+        """The sample lines of the metric in the Prometheus text format"""
+
+
+class Counter(_Metric):
+    type_ = 'counter'
+
+    def __init__(self, name: str, help_: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [
+            f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+            for labels, value in values
+        ]
+
+
+class Histogram(_Metric):
+    type_ = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        help_: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_, labelnames)
+        self._buckets = tuple(sorted(buckets))
+        # per labels: (count per bucket, +Inf included, sum)
+        self._values: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(
+                labels, ([0] * (len(self._buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, *labels: str) -> int:
+        counts, _ = self._values.get(labels, ([0], [0.0]))
+        return sum(counts)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = [
+                (labels, list(counts), total[0])
+                for labels, (counts, total) in self._values.items()
+            ]
+        lines = []
+        names = self.labelnames + ('le',)
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self._buckets + (float('inf'),), counts):
+                cumulative += count
+                bucket_labels = _format_labels(names, labels + (_format_value(bound),))
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            formatted = _format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{formatted} {_format_value(total)}')
+            lines.append(f'{self.name}_count{formatted} {cumulative}')
+        return lines
+
+
+class Gauge(_Metric):
+    """Gauge whose values are read when the metrics are rendered"""
+
+    type_ = 'gauge'
+
+    def __init__(
+        self,
+        name: str,
+        help_: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[tuple[Labels, float]]],
+    ) -> None:
+        super().__init__(name, help_, labelnames)
+        self._collect = collect
+
+    def _samples(self) -> list[str]:
+        return [
+            f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+            for labels, value in self._collect()
+        ]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """Thread pool reporting its queue depth and number of busy workers"""
+
+    def __init__(self, service: str, max_workers: int) -> None:
+        super().__init__(max_workers=max_workers)
+        self.service = service
+        self.active_workers = 0
+        self._active_lock = threading.Lock()
+        _executors.add(self)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._work_queue.qsize()
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        return super().submit(self._run, fn, *args, **kwargs)
+
+    def _run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._active_lock:
+            self.active_workers += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._active_lock:
+                self.active_workers -= 1
+
+
+_executors: weakref.WeakSet[InstrumentedThreadPoolExecutor] = weakref.WeakSet()
+_pools: weakref.WeakSet[Any] = weakref.WeakSet()
+
+registry = Registry()
+
+SOURCE_QUEUE_SECONDS = Histogram(
+    'wazo_dird_source_queue_seconds',
+    'Time spent by source requests waiting for an executor worker',
+    ['service', 'source', 'backend'],
+)
+SOURCE_EXEC_SECONDS = Histogram(
+    'wazo_dird_source_exec_seconds',
+    'Time spent executing source requests',
+    ['service', 'source', 'backend'],
+)
+SOURCE_ERRORS = Counter(
+    'wazo_dird_source_errors_total',
+    'Source requests that raised an exception',
+    ['service', 'source', 'backend'],
+)
+SOURCE_TIMEOUTS = Counter(
+    'wazo_dird_source_timeouts_total',
+    'Source requests abandoned when the timeout expired',
+    ['service', 'source'],
+)
+SOURCE_REJECTIONS = Counter(
+    'wazo_dird_source_rejections_total',
+    'Source requests skipped because the source had too many pending requests',
+    ['service', 'source'],
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    'wazo_dird_db_pool_checkout_seconds',
+    'Time spent waiting for a database connection from the pool',
+)
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    'wazo_dird_executor_queue_depth',
+    'Source requests waiting for an executor worker',
+    ['service'],
+    lambda: [((executor.service,), executor.queue_depth) for executor in _executors],
+)
+EXECUTOR_ACTIVE_WORKERS = Gauge(
+    'wazo_dird_executor_active_workers',
+    'Executor workers busy with a source request',
+    ['service'],
+    lambda: [((executor.service,), executor.active_workers) for executor in _executors],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    'wazo_dird_db_pool_checked_out_connections',
+    'Database connections currently in use',
+    [],
+    lambda: [((), pool.checkedout()) for pool in _pools],
+)
+
+for _metric in (
+    SOURCE_QUEUE_SECONDS,
+    SOURCE_EXEC_SECONDS,
+    SOURCE_ERRORS,
+    SOURCE_TIMEOUTS,
+    SOURCE_REJECTIONS,
+    EXECUTOR_QUEUE_DEPTH,
+    EXECUTOR_ACTIVE_WORKERS,
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_POOL_CHECKED_OUT,
+):
+    registry.register(_metric)
+
+
+def track_pool(pool: Any) -> None:
+    _pools.add(pool)
+
+
+def observe_source_call(
+    service: str,
+    source: BaseSourcePlugin,
+    queue_seconds: float,
+    exec_seconds: float,
+    raised: bool,
+) -> None:
+    labels = (service, source.name, source.backend)
+    SOURCE_QUEUE_SECONDS.observe(queue_seconds, *labels)
+    SOURCE_EXEC_SECONDS.observe(exec_seconds, *labels)
+    if raised:
+        SOURCE_ERRORS.inc(*labels)
+
+
+def count_timeouts(service: str, futures: Iterable[Future]) -> None:
+    for future in futures:
+        SOURCE_TIMEOUTS.inc(service, getattr(future, 'name', 'unknown'))
+
+
+def instrument(
+    service: str, source: BaseSourcePlugin, raise_stopper: RaiseStopper[T]
+) -> Callable[..., T]:
+    """Wrap `raise_stopper.execute` to record the timings and errors of a call
+
+    Must be called when the call is submitted to the executor.
+    """
+    submitted_at = perf_counter()
+
+    def execute(function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        started_at = perf_counter()
+        try:
+            return raise_stopper.execute(function, *args, **kwargs)
+        finally:
+            observe_source_call(
+                service,
+                source,
+                started_at - submitted_at,
+                perf_counter() - started_at,
+                raise_stopper.raised,
+            )
+
+    return execute
@@ -0,0 +1,175 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Mapping
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from wazo_dird.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Access tokens are kept at most this long, even if they expire later, so that
+# unlinking an external account is noticed quickly
+TOKEN_MAX_TTL = 300
+# Access tokens are dropped this long before they expire
+TOKEN_EXPIRATION_MARGIN = 60
+
+DEFAULT_CONTACTS_TTL = 60
+DEFAULT_MAX_USERS = 1000
+# The local contacts of a user that did not do any lookup during this delay
+# are dropped, the next lookup downloads the whole address book again
+STORE_TTL = 24 * 3600
+
+Contacts = list[dict[str, Any]]
+
+
+class ContactsChanges(NamedTuple):
+    """The result of a synchronization of the contacts of a user
+
+    `changed` maps the id of each contact in the address book to the contact,
+    `removed` lists the ids of the deleted contacts. When `full` is true,
+    `changed` contains every contact of the user.
+    `sync_state` is passed to the next synchronization to only get the
+    contacts changed since this one.
+    """
+
+    changed: dict[str, dict[str, Any]]
+    removed: list[str]
+    sync_state: str | None
+    full: bool
+
+
+class ContactsStore:
+    """The contacts of a user, updated with the changes of each sync"""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.sync_state: str | None = None
+        self._contacts: dict[str, dict[str, Any]] = {}
+
+    def apply(self, changes: ContactsChanges) -> Contacts:
+        if changes.full:
+            self._contacts = {}
+        for contact_id in changes.removed:
+            self._contacts.pop(contact_id, None)
+        self._contacts.update(changes.changed)
+        self.sync_state = changes.sync_state
+        return list(self._contacts.values())
+
+
+class ExternalContactsCache:
+    """Access tokens and contacts of the users of an external address book
+
+    The contacts of a user are kept `ttl` seconds, at most `max_users` users
+    are kept. A `ttl` of 0 disables the cache.
+
+    Once expired, the contacts of a user are refreshed with the changes since
+    the previous synchronization when the address book supports it.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_CONTACTS_TTL,
+        max_users: int = DEFAULT_MAX_USERS,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.enabled = ttl > 0
+        self._wall_clock = wall_clock
+        self._tokens: TTLCache[str, str] = TTLCache(TOKEN_MAX_TTL, max_users, clock)
+        self._contacts: TTLCache[str, Contacts] = TTLCache(ttl, max_users, clock)
+        self._stores: TTLCache[str, ContactsStore] = TTLCache(
+            STORE_TTL, max_users, clock
+        )
+
+    def access_token(
+        self, user_uuid: str, fetch: Callable[[], Mapping[str, Any] | None]
+    ) -> str | None:
+        """The access token of the user, `fetch` returns the external auth data
+        from wazo-auth when it is not known yet
+        """
+        access_token: str | None = self._tokens.get(user_uuid)
+        if access_token:
+            return access_token
+
+        external_auth = fetch()
+        if not external_auth:
+            return None
+
+        access_token = external_auth.get('access_token')
+        if access_token and self.enabled:
+            ttl = self._token_ttl(external_auth.get('token_expiration'))
+            if ttl > 0:
+                self._tokens.set(user_uuid, access_token, ttl)
+        return access_token
+
+    def contacts(
+        self, user_uuid: str, sync: Callable[[str | None], ContactsChanges | None]
+    ) -> Contacts | None:
+        """The contacts of the user, kept up to date with `sync`
+
+        The returned list is shared by the following calls and must not be
+        modified. `sync` is called with the state returned by the previous
+        synchronization of the user, or None to get every contact. It returns
+        None on failure. A failed incremental synchronization is retried as a
+        full one, since the remote state may have expired.
+        """
+        contacts: Contacts | None = self._contacts.get(user_uuid)
+        if contacts is not None:
+            return contacts
+
+        store: ContactsStore | None = self._stores.get(user_uuid)
+        if store is None:
+            store = ContactsStore()
+            if self.enabled:
+                self._stores.set(user_uuid, store)
+
+        with store.lock:
+            # Another request of the same user may have synced while waiting
+            contacts = self._contacts.get(user_uuid)
+            if contacts is not None:
+                return contacts
+
+            changes = sync(store.sync_state)
+            if changes is None and store.sync_state is not None:
+                logger.info(
+                    'incremental sync of user %s contacts failed, fetching all',
+                    user_uuid,
+                )
+                changes = sync(None)
+            if changes is None:
+                return None
+
+            contacts = store.apply(changes)
+            logger.debug(
+                'synced contacts of user %s: %d changed, %d removed, %d total',
+                user_uuid,
+                len(changes.changed),
+                len(changes.removed),
+                len(contacts),
+            )
+            if self.enabled:
+                self._contacts.set(user_uuid, contacts)
+        return contacts
+
+    def _token_ttl(self, expiration: Any) -> float:
+        if expiration is None:
+            return TOKEN_MAX_TTL
+
+        try:
+            if isinstance(expiration, str):
+                expires_at = datetime.fromisoformat(expiration).timestamp()
+            else:
+                expires_at = float(expiration)
+        except (TypeError, ValueError):
+            logger.debug('Unexpected token expiration %r', expiration)
+            return TOKEN_MAX_TTL
+
+        expires_in = expires_at - self._wall_clock() - TOKEN_EXPIRATION_MARGIN
+        return min(TOKEN_MAX_TTL, expires_in)
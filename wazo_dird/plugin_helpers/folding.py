@@ -0,0 +1,45 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from typing import Any
+
+from unidecode import unidecode
+
+# Values of directory entries seldom change between two searches, keeping the
+# transliteration of the most recent ones avoids calling unidecode again
+TRANSLITERATION_CACHE_SIZE = 65536
+
+# Separates the values of the columns of a search key, a term never contains it
+# so it cannot match across two columns
+KEY_SEPARATOR = '\x00'
+
+
+@lru_cache(maxsize=TRANSLITERATION_CACHE_SIZE)
+def transliterate(value: str) -> str:
+    decoded: str = unidecode(value)
+    return decoded
+
+
+def fold(value: Any) -> str:
+    """Lower case and accent free version of `value`, used to compare terms"""
+    return transliterate(str(value).lower())
+
+
+def search_key(entry: Mapping[str, Any], columns: Iterable[str]) -> str:
+    """The folded values of the `columns` of `entry` joined in a single string
+
+    `fold(term) in search_key(entry, columns)` tells whether the term is found
+    in one of the columns. List values contribute each of their items.
+    """
+    folded: list[str] = []
+    for column in columns:
+        value = entry.get(column) or ''
+        if isinstance(value, list):
+            folded.extend(fold(item) for item in value)
+        else:
+            folded.append(fold(value))
+    return KEY_SEPARATOR.join(folded)
@@ -0,0 +1,209 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import Any, Generic, Literal, TypeVar
+from uuid import uuid4
+
+from wazo_bus.resources.common.event import TenantEvent, UserEvent
+
+from wazo_dird import metrics
+from wazo_dird.exception import NoSuchImportJob
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+DEFAULT_WORKERS = 1
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_TTL = 3600
+
+JobStatus = Literal['pending', 'processing', 'completed', 'failed']
+
+# Imports a batch of contacts, given the index of its first contact in the
+# imported file, and returns the number of created contacts, the errors and the
+# duplicates that were skipped
+ImportBatch = Callable[
+    [list[T], int], tuple[int, list[dict[str, Any]], list[dict[str, Any]]]
+]
+
+
+class ImportJob:
+    """The progress of a contact import
+
+    `owner` identifies what the contacts are imported into, e.g. the uuid of
+    a phonebook, and is checked when the job is read.
+    """
+
+    def __init__(self, tenant_uuid: str, owner: Mapping[str, str], total: int):
+        self.uuid = str(uuid4())
+        self.tenant_uuid = tenant_uuid
+        self.owner = dict(owner)
+        self.total = total
+        self.status: JobStatus = 'pending'
+        self.processed = 0
+        self.created = 0
+        self.errors: list[dict[str, Any]] = []
+        self.duplicates: list[dict[str, Any]] = []
+        self.finished_at: float | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            self.status = 'processing'
+
+    def add_batch(
+        self,
+        size: int,
+        created: int,
+        errors: list[dict[str, Any]],
+        duplicates: list[dict[str, Any]],
+    ) -> None:
+        with self._lock:
+            self.processed += size
+            self.created += created
+            self.errors.extend(errors)
+            self.duplicates.extend(duplicates)
+
+    def finish(self, status: JobStatus, now: float) -> None:
+        with self._lock:
+            self.status = status
+            self.finished_at = now
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'uuid': self.uuid,
+                'status': self.status,
+                'total': self.total,
+                'processed': self.processed,
+                'created': self.created,
+                'failed': len(self.errors),
+                'skipped': len(self.duplicates),
+            }
+
+    def to_dict(self) -> dict[str, Any]:
+        result = self.summary()
+        with self._lock:
+            result['errors'] = list(self.errors)
+            result['duplicates'] = list(self.duplicates)
+        return result
+
+
+class ImportJobs(Generic[T]):
+    """Contact imports processed by `workers` background threads
+
+    The contacts of a job are imported `batch_size` at a time, each batch in
+    its own transaction. Finished jobs can be read during `ttl` seconds.
+    Jobs are kept in memory and are lost when the service restarts.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        workers: int = DEFAULT_WORKERS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._executor = metrics.InstrumentedThreadPoolExecutor(
+            service, max_workers=workers
+        )
+        self._batch_size = batch_size
+        self._ttl = ttl
+        self._clock = clock
+        self._jobs: dict[str, ImportJob] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, service: str, config: Mapping[str, Any]) -> ImportJobs[T]:
+        import_jobs_config = config.get('import_jobs', {})
+        return cls(
+            service,
+            workers=import_jobs_config.get('workers', DEFAULT_WORKERS),
+            batch_size=import_jobs_config.get('batch_size', DEFAULT_BATCH_SIZE),
+            ttl=import_jobs_config.get('ttl', DEFAULT_TTL),
+        )
+
+    def submit(
+        self,
+        tenant_uuid: str,
+        owner: Mapping[str, str],
+        contacts: list[T],
+        import_batch: ImportBatch[T],
+        on_finished: Callable[[ImportJob], None],
+    ) -> ImportJob:
+        job = ImportJob(tenant_uuid, owner, len(contacts))
+        with self._lock:
+            self._purge()
+            self._jobs[job.uuid] = job
+        self._executor.submit(self._run, job, contacts, import_batch, on_finished)
+        return job
+
+    def get(self, job_uuid: str, owner: Mapping[str, str]) -> ImportJob:
+        with self._lock:
+            self._purge()
+            job = self._jobs.get(job_uuid)
+        if not job or job.owner != owner:
+            raise NoSuchImportJob(job_uuid)
+        return job
+
+    def stop(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _purge(self) -> None:
+        expired_before = self._clock() - self._ttl
+        for job_uuid, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at < expired_before:
+                del self._jobs[job_uuid]
+
+    def _run(
+        self,
+        job: ImportJob,
+        contacts: list[T],
+        import_batch: ImportBatch[T],
+        on_finished: Callable[[ImportJob], None],
+    ) -> None:
+        job.start()
+        status: JobStatus = 'completed'
+        try:
+            for start in range(0, len(contacts), self._batch_size):
+                batch = contacts[start : start + self._batch_size]
+                created, errors, duplicates = import_batch(batch, start)
+                job.add_batch(len(batch), created, errors, duplicates)
+        except Exception:
+            logger.exception('import job %s failed', job.uuid)
+            status = 'failed'
+        job.finish(status, self._clock())
+        logger.info('import job %s %s: %s', job.uuid, status, job.summary())
+
+        try:
+            on_finished(job)
+        except Exception:
+            logger.exception('failed to notify the end of import job %s', job.uuid)
+
+
+class PhonebookImportCompletedEvent(TenantEvent):
+    service = 'dird'
+    name = 'phonebook_import_completed'
+    routing_key_fmt = 'directory.phonebooks.{phonebook_uuid}.imports.completed'
+
+    def __init__(self, job: ImportJob) -> None:
+        content = dict(job.summary(), phonebook_uuid=job.owner['phonebook_uuid'])
+        super().__init__(content, job.tenant_uuid)
+
+
+class PersonalImportCompletedEvent(UserEvent):
+    service = 'dird'
+    name = 'personal_import_completed'
+    routing_key_fmt = 'directory.{user_uuid}.personal.imports.completed'
+
+    def __init__(self, job: ImportJob) -> None:
+        user_uuid = job.owner['user_uuid']
+        content = dict(job.summary(), user_uuid=user_uuid)
+        super().__init__(content, job.tenant_uuid, user_uuid)
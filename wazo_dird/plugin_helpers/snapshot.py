@@ -0,0 +1,222 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import weakref
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from wazo_dird.plugin_helpers.folding import fold, search_key
+from wazo_dird.plugins.source_result import _SourceResult as SourceResult
+
+logger = logging.getLogger(__name__)
+
+
+class _Content:
+    def __init__(
+        self,
+        entries: Sequence[SourceResult],
+        searched_columns: list[str],
+        indexed_columns: list[str],
+        index_key: Callable[[str], str],
+    ) -> None:
+        self.entries = entries
+        self.search_keys = [
+            search_key(entry.fields, searched_columns) for entry in entries
+        ]
+        # column -> value -> position of the first entry having this value
+        self.indexes: dict[str, dict[str, int]] = {}
+        for column in indexed_columns:
+            index = self.indexes[column] = {}
+            for position, entry in enumerate(entries):
+                value = entry.fields.get(column)
+                for item in value if isinstance(value, list) else [value]:
+                    if item:
+                        index.setdefault(index_key(str(item)), position)
+
+
+def _same(value: str) -> str:
+    return value
+
+
+def _lower(value: str) -> str:
+    return value.lower()
+
+
+class SourceSnapshot:
+    """All the entries of a source, with their search keys and an index by
+    value of the first matched columns
+
+    The snapshot is fetched on first use, then refreshed in the background when
+    `invalidate` is called or when it is older than `max_age` seconds. Lookups
+    keep using the previous content until the new one is ready.
+    """
+
+    RETRY_DELAY = 10
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Sequence[SourceResult] | None],
+        searched_columns: list[str],
+        first_matched_columns: list[str],
+        max_age: float,
+        case_sensitive: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._fetch = fetch
+        self._searched_columns = searched_columns
+        self._first_matched_columns = first_matched_columns
+        self._max_age = max_age
+        self._index_key = _same if case_sensitive else _lower
+        self._clock = clock
+        self._content: _Content | None = None
+        self._fetched_at = 0.0
+        self._dirty = False
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def search(self, term: str) -> list[SourceResult]:
+        content = self._get()
+        if content is None:
+            return []
+        clean_term = fold(term)
+        return [
+            entry
+            for entry, key in zip(content.entries, content.search_keys)
+            if clean_term in key
+        ]
+
+    def first_match(self, term: str) -> SourceResult | None:
+        content = self._get()
+        if content is None:
+            return None
+        key = self._index_key(term)
+        positions = [
+            position
+            for column in self._first_matched_columns
+            if (position := content.indexes[column].get(key)) is not None
+        ]
+        if not positions:
+            return None
+        return content.entries[min(positions)]
+
+    def match_all(self, terms: list[str]) -> dict[str, SourceResult]:
+        content = self._get()
+        if content is None:
+            return {}
+        results: dict[str, SourceResult] = {}
+        for column in self._first_matched_columns:
+            index = content.indexes[column]
+            for term in terms:
+                position = index.get(self._index_key(term))
+                if position is not None and term not in results:
+                    results[term] = content.entries[position]
+        return results
+
+    def list(self, unique_ids: list[str]) -> list[SourceResult]:
+        content = self._get()
+        if content is None:
+            return []
+        wanted = set(unique_ids)
+        return [entry for entry in content.entries if entry.get_unique() in wanted]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._dirty = True
+            if self._refreshing or self._content is None:
+                # the next lookup fetches the users anyway
+                return
+            self._refreshing = True
+        thread = threading.Thread(
+            target=_refresh,
+            args=(weakref.ref(self),),
+            name=f'snapshot-{self.name}',
+        )
+        thread.daemon = True
+        thread.start()
+
+    def _get(self) -> _Content | None:
+        content = self._content
+        if content is None:
+            return self._load_first()
+        if self._clock() - self._fetched_at >= self._max_age:
+            self.invalidate()
+        return content
+
+    def _load_first(self) -> _Content | None:
+        # concurrent lookups on a cold source fetch the entries only once
+        with self._load_lock:
+            if self._content is None:
+                with self._lock:
+                    self._dirty = False
+                self._load()
+                if self._dirty:
+                    # entries changed while they were fetched
+                    self.invalidate()
+            return self._content
+
+    def _refresh_once(self) -> bool:
+        with self._lock:
+            if not self._dirty:
+                self._refreshing = False
+                return False
+            self._dirty = False
+        self._load()
+        return True
+
+    def _load(self) -> None:
+        fetched_at = self._clock()
+        entries = self._fetch()
+        if entries is None:
+            # keep the previous content, considered too old in RETRY_DELAY seconds
+            retry_delay = min(self.RETRY_DELAY, self._max_age)
+            self._fetched_at = fetched_at - self._max_age + retry_delay
+            return
+        self._content = _Content(
+            entries,
+            self._searched_columns,
+            self._first_matched_columns,
+            self._index_key,
+        )
+        self._fetched_at = fetched_at
+        logger.debug('Source "%s": %d entries in snapshot', self.name, len(entries))
+
+
+def _refresh(snapshot_ref: weakref.ref[SourceSnapshot]) -> None:
+    # Events arriving during a refresh trigger a single extra refresh
+    while True:
+        snapshot = snapshot_ref()
+        if snapshot is None:
+            return
+        try:
+            if not snapshot._refresh_once():
+                return
+        except Exception:
+            logger.exception('Source "%s": snapshot refresh failed', snapshot.name)
+            with snapshot._lock:
+                snapshot._refreshing = False
+            return
+        del snapshot
+
+
+def invalidate_on_event(snapshot: SourceSnapshot) -> Callable[[dict[str, Any]], None]:
+    """A bus event handler invalidating `snapshot`
+
+    Only a weak reference is kept, sources invalidated without being unloaded
+    are garbage collected even though they stay subscribed.
+    """
+    snapshot_ref = weakref.ref(snapshot)
+
+    def on_event(event: dict[str, Any]) -> None:
+        snapshot = snapshot_ref()
+        if snapshot is not None:
+            snapshot.invalidate()
+
+    return on_event
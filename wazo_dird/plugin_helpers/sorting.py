@@ -6,7 +6,7 @@ from __future__ import annotations
 from sys import maxunicode
 from typing import Any
 
-from unidecode import unidecode
+from .folding import transliterate
 
 MAX_CHAR: str = chr(maxunicode)
 ALMOST_LAST_STRING: str = MAX_CHAR * 16
@@ -32,8 +32,7 @@ def sort_contacts(
         if isinstance(value, str):
             if order_insensitive:
                 value = value.casefold()
-            decoded: str = unidecode(value)
-            return decoded
+            return transliterate(value)
 
         return str(value)
 
@@ -0,0 +1,149 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_inanyorder, equal_to, none
+
+from ..external_contacts import TOKEN_MAX_TTL, ContactsChanges, ExternalContactsCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def full(*contacts, sync_state=None):
+    return ContactsChanges({c['id']: c for c in contacts}, [], sync_state, True)
+
+
+class TestExternalContactsCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = Clock()
+        self.cache = ExternalContactsCache(
+            ttl=60, max_users=2, clock=self.clock, wall_clock=self.clock
+        )
+
+    def test_access_token_is_fetched_once(self) -> None:
+        fetch = Mock(return_value={'access_token': 'abc'})
+
+        assert_that(self.cache.access_token('alice', fetch), equal_to('abc'))
+        assert_that(self.cache.access_token('alice', fetch), equal_to('abc'))
+
+        fetch.assert_called_once_with()
+
+    def test_access_token_is_not_kept_until_it_expires(self) -> None:
+        fetch = Mock(
+            return_value={'access_token': 'abc', 'token_expiration': 1000 + 90}
+        )
+
+        self.cache.access_token('alice', fetch)
+        self.clock.now += 31
+        self.cache.access_token('alice', fetch)
+
+        assert_that(fetch.call_count, equal_to(2))
+
+    def test_access_token_is_kept_at_most_max_ttl(self) -> None:
+        fetch = Mock(
+            return_value={
+                'access_token': 'abc',
+                'token_expiration': '2999-01-01T00:00:00+00:00',
+            }
+        )
+
+        self.cache.access_token('alice', fetch)
+        self.clock.now += TOKEN_MAX_TTL
+        self.cache.access_token('alice', fetch)
+
+        assert_that(fetch.call_count, equal_to(2))
+
+    def test_access_token_without_external_auth(self) -> None:
+        fetch = Mock(return_value=None)
+
+        assert_that(self.cache.access_token('alice', fetch), none())
+        assert_that(self.cache.access_token('alice', fetch), none())
+
+        assert_that(fetch.call_count, equal_to(2))
+
+    def test_contacts_are_kept_ttl_seconds(self) -> None:
+        contact = {'id': '1'}
+        sync = Mock(return_value=full(contact))
+
+        assert_that(self.cache.contacts('alice', sync), equal_to([contact]))
+        self.clock.now += 59
+        self.cache.contacts('alice', sync)
+        assert_that(sync.call_count, equal_to(1))
+
+        self.clock.now += 1
+        self.cache.contacts('alice', sync)
+        assert_that(sync.call_count, equal_to(2))
+
+    def test_contacts_are_kept_per_user(self) -> None:
+        self.cache.contacts('alice', lambda _: full({'id': 'a'}))
+
+        result = self.cache.contacts('bob', lambda _: full({'id': 'b'}))
+
+        assert_that(result, equal_to([{'id': 'b'}]))
+
+    def test_expired_contacts_are_updated_with_the_changes(self) -> None:
+        alice, bob, charlie = {'id': 'a'}, {'id': 'b'}, {'id': 'c'}
+        new_bob = {'id': 'b', 'name': 'Bob'}
+        sync = Mock(
+            side_effect=[
+                full(alice, bob, sync_state='state-1'),
+                ContactsChanges({'b': new_bob, 'c': charlie}, ['a'], 'state-2', False),
+            ]
+        )
+
+        self.cache.contacts('alice', sync)
+        self.clock.now += 60
+        result = self.cache.contacts('alice', sync)
+
+        assert_that(result, contains_inanyorder(new_bob, charlie))
+        sync.assert_called_with('state-1')
+
+    def test_failed_incremental_sync_fetches_all_contacts(self) -> None:
+        contact = {'id': '1'}
+        sync = Mock(side_effect=[full(sync_state='expired'), None, full(contact)])
+
+        self.cache.contacts('alice', sync)
+        self.clock.now += 60
+        result = self.cache.contacts('alice', sync)
+
+        assert_that(result, equal_to([contact]))
+        sync.assert_called_with(None)
+
+    def test_failures_are_not_kept(self) -> None:
+        sync = Mock(side_effect=[None, full()])
+
+        assert_that(self.cache.contacts('alice', sync), none())
+        assert_that(self.cache.contacts('alice', sync), equal_to([]))
+
+    def test_least_recently_used_user_is_evicted(self) -> None:
+        sync = Mock(return_value=full(sync_state='state'))
+
+        self.cache.contacts('alice', sync)
+        self.cache.contacts('bob', sync)
+        self.cache.contacts('charlie', sync)
+        self.cache.contacts('alice', sync)
+
+        assert_that(sync.call_count, equal_to(4))
+        sync.assert_called_with(None)
+
+    def test_disabled(self) -> None:
+        cache = ExternalContactsCache(ttl=0, clock=self.clock)
+        fetch_token = Mock(return_value={'access_token': 'abc'})
+        sync = Mock(return_value=full(sync_state='state'))
+
+        cache.access_token('alice', fetch_token)
+        cache.access_token('alice', fetch_token)
+        cache.contacts('alice', sync)
+        cache.contacts('alice', sync)
+
+        assert_that(fetch_token.call_count, equal_to(2))
+        sync.assert_called_with(None)
+        assert_that(sync.call_count, equal_to(2))
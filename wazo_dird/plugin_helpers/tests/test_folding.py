@@ -0,0 +1,38 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, equal_to, is_in, is_not
+
+from ..folding import fold, search_key, transliterate
+
+
+class TestFolding(unittest.TestCase):
+    def test_fold(self) -> None:
+        assert_that(fold('Àccent Québec'), equal_to('accent quebec'))
+        assert_that(fold(1234), equal_to('1234'))
+
+    def test_transliterate_is_computed_once_per_value(self) -> None:
+        transliterate.cache_clear()
+
+        fold('Éloïse')
+        fold('éloïse')
+        fold('Éloïse')
+
+        assert_that(transliterate.cache_info().misses, equal_to(1))
+
+    def test_search_key(self) -> None:
+        entry = {
+            'firstname': 'Paul',
+            'lastname': 'Àccent',
+            'extensions': ['1234', '5678'],
+            'email': None,
+        }
+
+        key = search_key(entry, ['firstname', 'lastname', 'extensions', 'email'])
+
+        assert_that(fold('accént'), is_in(key))
+        assert_that('5678', is_in(key))
+        assert_that('paulaccent', is_not(is_in(key)))
+        assert_that('12345678', is_not(is_in(key)))
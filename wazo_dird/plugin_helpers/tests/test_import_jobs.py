@@ -0,0 +1,138 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import unittest
+from unittest.mock import Mock, call
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    has_entries,
+    raises,
+    same_instance,
+)
+
+from wazo_dird.exception import NoSuchImportJob
+
+from ..import_jobs import ImportJob, ImportJobs
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestImportJobs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = Clock()
+        self.jobs = ImportJobs('test', batch_size=2, ttl=60, clock=self.clock)
+        self.finished = threading.Event()
+        self.on_finished = Mock(side_effect=lambda job: self.finished.set())
+
+    def tearDown(self) -> None:
+        self.jobs.stop()
+
+    def _run(self, contacts, import_batch) -> ImportJob:
+        job = self.jobs.submit(
+            'tenant', {'phonebook_uuid': 'pb'}, contacts, import_batch, self.on_finished
+        )
+        assert self.finished.wait(5)
+        return job
+
+    def test_contacts_are_imported_by_batch(self) -> None:
+        import_batch = Mock(side_effect=lambda batch, start: (len(batch), [], []))
+
+        job = self._run(['a', 'b', 'c', 'd', 'e'], import_batch)
+
+        import_batch.assert_has_calls(
+            [call(['a', 'b'], 0), call(['c', 'd'], 2), call(['e'], 4)]
+        )
+        assert_that(
+            job.to_dict(),
+            has_entries(
+                uuid=job.uuid,
+                status='completed',
+                total=5,
+                processed=5,
+                created=5,
+                failed=0,
+                skipped=0,
+                errors=[],
+                duplicates=[],
+            ),
+        )
+        self.on_finished.assert_called_once_with(job)
+
+    def test_errors_of_each_batch_are_reported(self) -> None:
+        def import_batch(batch, start):
+            return len(batch) - 1, [{'index': start}], []
+
+        job = self._run(['a', 'b', 'c'], import_batch)
+
+        assert_that(
+            job.to_dict(),
+            has_entries(
+                status='completed',
+                created=1,
+                failed=2,
+                errors=contains_exactly({'index': 0}, {'index': 2}),
+            ),
+        )
+
+    def test_duplicates_of_each_batch_are_reported(self) -> None:
+        def import_batch(batch, start):
+            return len(batch) - 1, [], [{'index': start + 1}]
+
+        job = self._run(['a', 'b', 'c', 'd'], import_batch)
+
+        assert_that(
+            job.to_dict(),
+            has_entries(
+                status='completed',
+                created=2,
+                failed=0,
+                skipped=2,
+                errors=[],
+                duplicates=contains_exactly({'index': 1}, {'index': 3}),
+            ),
+        )
+
+    def test_failed_job(self) -> None:
+        import_batch = Mock(side_effect=[(2, [], []), Exception('db error')])
+
+        job = self._run(['a', 'b', 'c'], import_batch)
+
+        assert_that(job.to_dict(), has_entries(status='failed', processed=2, created=2))
+        self.on_finished.assert_called_once_with(job)
+
+    def test_get(self) -> None:
+        job = self._run(['a'], lambda batch, start: (1, [], []))
+
+        result = self.jobs.get(job.uuid, {'phonebook_uuid': 'pb'})
+
+        assert_that(result, same_instance(job))
+        assert_that(
+            calling(self.jobs.get).with_args(job.uuid, {'phonebook_uuid': 'other'}),
+            raises(NoSuchImportJob),
+        )
+        assert_that(
+            calling(self.jobs.get).with_args('unknown', {'phonebook_uuid': 'pb'}),
+            raises(NoSuchImportJob),
+        )
+
+    def test_finished_jobs_are_kept_ttl_seconds(self) -> None:
+        job = self._run(['a'], lambda batch, start: (1, [], []))
+
+        self.clock.now += 60
+        self.jobs.get(job.uuid, {'phonebook_uuid': 'pb'})
+
+        self.clock.now += 1
+        assert_that(
+            calling(self.jobs.get).with_args(job.uuid, {'phonebook_uuid': 'pb'}),
+            raises(NoSuchImportJob),
+        )
@@ -1,4 +1,4 @@
-# Copyright 2014-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2014-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
@@ -9,6 +9,7 @@ from typing import Any, TypedDict
 from wazo_auth_client import Client as AuthClient
 from xivo.token_renewer import TokenRenewer
 
+from wazo_dird.bus import CoreBus
 from wazo_dird.config import Config as MainConfig
 from wazo_dird.plugin_manager import ServiceDependencies, ViewDependencies
 from wazo_dird.plugins.source_result import _SourceResult as SourceResult
@@ -54,6 +55,7 @@ class SourceConfig(TypedDict, total=False):
 
 class SourcePluginDependencies(TypedDict):
     auth_client: AuthClient
+    bus: CoreBus | None
     config: SourceConfig
     main_config: MainConfig
     token_renewer: TokenRenewer
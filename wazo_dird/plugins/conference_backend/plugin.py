@@ -1,20 +1,40 @@
-# Copyright 2019-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2019-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
 
 import builtins
 import logging
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from typing import Any, cast
 
 from requests import HTTPError
-from unidecode import unidecode
+from wazo_bus.resources.conference.event import (
+    ConferenceCreatedEvent,
+    ConferenceDeletedEvent,
+    ConferenceEditedEvent,
+)
+from wazo_bus.resources.conference_extension.event import (
+    ConferenceExtensionAssociatedEvent,
+    ConferenceExtensionDissociatedEvent,
+)
+from wazo_bus.resources.extension.event import ExtensionEditedEvent
+from wazo_bus.resources.incall.event import (
+    IncallCreatedEvent,
+    IncallDeletedEvent,
+    IncallEditedEvent,
+)
+from wazo_bus.resources.incall_extension.event import (
+    IncallExtensionAssociatedEvent,
+    IncallExtensionDissociatedEvent,
+)
 from wazo_confd_client import Client as ConfdClient
 
 from wazo_dird import BaseSourcePlugin, make_result_class
+from wazo_dird.bus import CoreBus
 from wazo_dird.helpers import BackendViewDependencies, BaseBackendView
 from wazo_dird.plugin_helpers.confd_client_registry import registry
+from wazo_dird.plugin_helpers.snapshot import SourceSnapshot, invalidate_on_event
 from wazo_dird.plugins.base_plugins import SourcePluginDependencies
 from wazo_dird.plugins.source_result import _SourceResult as SourceResult
 
@@ -22,6 +42,21 @@ from . import http
 
 logger = logging.getLogger(__name__)
 
+# Events changing the conferences or their extensions
+CONFERENCE_EVENTS = (
+    ConferenceCreatedEvent,
+    ConferenceEditedEvent,
+    ConferenceDeletedEvent,
+    ConferenceExtensionAssociatedEvent,
+    ConferenceExtensionDissociatedEvent,
+    ExtensionEditedEvent,
+    IncallCreatedEvent,
+    IncallEditedEvent,
+    IncallDeletedEvent,
+    IncallExtensionAssociatedEvent,
+    IncallExtensionDissociatedEvent,
+)
+
 
 class ConferenceViewPlugin(BaseBackendView):
     backend = 'conference'
@@ -45,14 +80,21 @@ class ConferenceViewPlugin(BaseBackendView):
 
 
 class ConferencePlugin(BaseSourcePlugin):
+    # Refresh the conferences even if their events are missed, e.g. when the
+    # source is on another stack
+    SNAPSHOT_MAX_AGE = 300
+
     _client: ConfdClient | None
     _searched_columns: builtins.list[str]
     _first_matched_columns: builtins.list[str]
     _SourceResult: type[SourceResult]
+    _snapshot: SourceSnapshot
+    _on_conference_event: Callable[[dict[str, Any]], None]
 
     def __init__(self) -> None:
         self._client = None
         self._uuid: str | None = None
+        self._bus: CoreBus | None = None
 
     def load(self, dependencies: SourcePluginDependencies) -> None:
         config = dependencies['config']
@@ -73,18 +115,32 @@ class ConferencePlugin(BaseSourcePlugin):
                 'dict[str, str] | None', config.get(self.FORMAT_COLUMNS)
             ),
         )
+        self._snapshot = SourceSnapshot(
+            self.name,
+            self._fetch_results,
+            self._searched_columns,
+            self._first_matched_columns,
+            self.SNAPSHOT_MAX_AGE,
+            case_sensitive=False,
+        )
+        self._on_conference_event = invalidate_on_event(self._snapshot)
+        self._bus = dependencies.get('bus')
+        if self._bus:
+            for event in CONFERENCE_EVENTS:
+                self._bus.subscribe(event.name, self._on_conference_event)
         logger.info('Wazo %s successfully loaded', config['name'])
 
     def unload(self) -> None:
+        if self._bus:
+            for event in CONFERENCE_EVENTS:
+                self._bus.unsubscribe(event.name, self._on_conference_event)
         registry.unregister_all()
 
     def list(
         self, unique_ids: builtins.list[str], args: dict[str, Any] | None = None
     ) -> builtins.list[SourceResult]:
         logger.debug('Listing all conferences')
-        contacts = self._fetch_contacts()
-        matching_contacts = (c for c in contacts if str(c['id']) in unique_ids)
-        results = [self._SourceResult(c) for c in matching_contacts]
+        results = self._snapshot.list(unique_ids)
         logger.debug('Found %s conferences', len(results))
         return results
 
@@ -95,10 +151,7 @@ class ConferencePlugin(BaseSourcePlugin):
         args: dict[str, Any] | None = None,
     ) -> builtins.list[SourceResult]:
         logger.debug('Looking for all conferences matching "%s"', term)
-        clean_term = unidecode(term.lower())
-        contacts = self._fetch_contacts()
-        matching_contacts = (c for c in contacts if self._search_filter(clean_term, c))
-        results = [self._SourceResult(c) for c in matching_contacts]
+        results = self._snapshot.search(term)
         logger.debug('Found %s conferences', len(results))
         return results
 
@@ -106,70 +159,31 @@ class ConferencePlugin(BaseSourcePlugin):
         self, term: str, args: dict[str, Any] | None = None
     ) -> SourceResult | None:
         logger.debug('Looking for first conference matching "%s"', term)
-        lowered_term = term.lower()
-        for contact in self._fetch_contacts():
-            if self._first_match_filter(lowered_term, contact):
-                logger.debug('Found one conference')
-                return self._SourceResult(contact)
-        logger.debug('Found no conference')
-        return None
+        return self._snapshot.first_match(term)
 
     def match_all(
         self, terms: builtins.list[str], args: dict[str, Any] | None = None
     ) -> dict[str, SourceResult]:
         logger.debug('Looking for conference matching "%s"', terms)
-        results: dict[str, SourceResult] = {}
-        for contact in self._fetch_contacts():
-            for term in terms:
-                lowered_term = term.lower()
-                if self._first_match_filter(lowered_term, contact):
-                    results[term] = self._SourceResult(contact)
-                    logger.debug('Found one conference match to "%s"', term)
-
-        if not results:
-            logger.debug('Found no conference')
-        return results
+        return self._snapshot.match_all(terms)
 
-    def _first_match_filter(self, lowered_term: str, contact: dict[str, Any]) -> bool:
-        for column in self._first_matched_columns:
-            column_value = contact.get(column) or ''
-            if isinstance(column_value, str):
-                if lowered_term == column_value.lower():
-                    return True
-            elif isinstance(column_value, list):
-                for item in column_value:
-                    if lowered_term == item.lower():
-                        return True
-
-        return False
-
-    def _search_filter(self, clean_term: str, contact: dict[str, Any]) -> bool:
-        for column in self._searched_columns:
-            column_value = contact.get(column) or ''
-            if isinstance(column_value, str):
-                clean_column_value = unidecode(column_value.lower())
-                if clean_term in clean_column_value:
-                    return True
-            elif isinstance(column_value, list):
-                for item in column_value:
-                    clean_item = unidecode(item.lower())
-                    if clean_term in clean_item:
-                        return True
-
-        return False
-
-    def _fetch_contacts(self) -> Iterator[dict[str, Any]]:
+    def _fetch_results(self) -> builtins.list[SourceResult] | None:
         if not self._client:
             logger.info('conference source not initialized properly %s', self.name)
-            return
+            return None
 
         try:
             response = self._client.conferences.list()
         except HTTPError as e:
             logger.info('failed to fetch conferences %s', e)
-            return
+            return None
+
+        return [self._SourceResult(c) for c in self._contacts(response['items'])]
 
-        for conference in response['items']:
+    def _contacts(
+        self, conferences: builtins.list[dict[str, Any]]
+    ) -> Iterator[dict[str, Any]]:
+        for conference in conferences:
             extensions = []
             for extension in conference['extensions']:
                 extensions.append(extension['exten'])
@@ -0,0 +1,136 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from typing import cast
+from unittest.mock import Mock, patch
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    contains_inanyorder,
+    empty,
+    equal_to,
+    has_entries,
+    has_properties,
+    is_,
+    none,
+    raises,
+)
+from requests import HTTPError
+from wazo_bus.resources.conference.event import ConferenceEditedEvent
+
+from wazo_dird.plugins.base_plugins import SourcePluginDependencies
+
+from ..plugin import ConferencePlugin
+
+CONFIG = {
+    'uuid': '1da6cb2f-9c6e-4b34-a4d3-a0d3ec1fe1b6',
+    'name': 'conferences',
+    'tenant_uuid': '02153e33-4b59-4a9f-8cd1-7e917b306e1d',
+    'searched_columns': ['name', 'extensions'],
+    'first_matched_columns': ['extensions', 'incalls'],
+    'auth': {},
+    'confd': {},
+}
+
+CONFERENCE_1 = {
+    'id': 1,
+    'name': 'Réunion',
+    'extensions': [{'exten': '4001'}],
+    'incalls': [{'extensions': [{'exten': '5551234'}]}],
+}
+CONFERENCE_2 = {
+    'id': 2,
+    'name': 'Standup',
+    'extensions': [{'exten': '4002'}],
+    'incalls': [],
+}
+
+
+class TestConferencePlugin(unittest.TestCase):
+    def setUp(self):
+        patcher = patch('wazo_dird.plugins.conference_backend.plugin.registry')
+        registry = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = registry.get.return_value
+        self.client.conferences.list.return_value = {
+            'items': [CONFERENCE_1, CONFERENCE_2]
+        }
+        self.bus = Mock()
+        self.source = ConferencePlugin()
+        dependencies = {'config': CONFIG, 'bus': self.bus}
+        self.source.load(cast(SourcePluginDependencies, dependencies))
+
+    def test_search(self):
+        assert_that(
+            self.source.search('reunion'),
+            contains_exactly(has_properties(fields=has_entries(id=1))),
+        )
+        assert_that(
+            self.source.search('4002'),
+            contains_exactly(has_properties(fields=has_entries(id=2))),
+        )
+        assert_that(self.source.search('4001 reu'), empty())
+
+    def test_first_match(self):
+        result = self.source.first_match('5551234')
+
+        assert_that(result, has_properties(fields=has_entries(name='Réunion')))
+        assert_that(self.source.first_match('Standup'), is_(none()))
+
+    def test_match_all(self):
+        result = self.source.match_all(['4001', '4002', '9999'])
+
+        assert_that(
+            result,
+            has_entries(
+                {
+                    '4001': has_properties(fields=has_entries(id=1)),
+                    '4002': has_properties(fields=has_entries(id=2)),
+                }
+            ),
+        )
+        assert_that(result.keys(), contains_inanyorder('4001', '4002'))
+
+    def test_list(self):
+        result = self.source.list(['2'])
+
+        assert_that(result, contains_exactly(has_properties(fields=has_entries(id=2))))
+
+    def test_conferences_are_fetched_once(self):
+        self.source.search('reunion')
+        self.source.first_match('4001')
+        self.source.match_all(['4001', '4002'])
+        self.source.list(['1'])
+
+        self.client.conferences.list.assert_called_once_with()
+
+    def test_nothing_is_found_when_conferences_cannot_be_fetched(self):
+        self.client.conferences.list.side_effect = HTTPError()
+
+        assert_that(self.source.search('reunion'), empty())
+        assert_that(self.source.match_all(['4001']), equal_to({}))
+
+    def test_conference_event_refreshes_the_conferences(self):
+        self.source.first_match('4001')
+        self.client.conferences.list.return_value = {'items': [CONFERENCE_2]}
+
+        handler = self.bus.subscribe.call_args_list[0][0][1]
+        with patch('threading.Thread') as Thread:
+            handler({'id': 1})
+            kwargs = Thread.call_args[1]
+            kwargs['target'](*kwargs['args'])
+
+        assert_that(self.source.first_match('4001'), is_(none()))
+
+        self.source.unload()
+        self.bus.unsubscribe.assert_any_call(ConferenceEditedEvent.name, handler)
+
+    def test_unexpected_errors_are_raised(self):
+        self.client.conferences.list.side_effect = ValueError()
+
+        assert_that(
+            calling(self.source.search).with_args('reunion'), raises(ValueError)
+        )
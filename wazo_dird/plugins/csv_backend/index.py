@@ -0,0 +1,133 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import logging
+from array import array
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any, TypeVar
+
+from .storage import DictTable, Table
+
+logger = logging.getLogger(__name__)
+
+NGRAM_SIZE = 3
+# Joins the lowered values of a row, a term can not match across two values
+_SEPARATOR = '\x00'
+
+T = TypeVar('T')
+
+
+def _ngrams(value: str) -> set[str]:
+    return {value[i : i + NGRAM_SIZE] for i in range(len(value) - NGRAM_SIZE + 1)}
+
+
+def _dedup(seen: dict[T, T], value: T) -> T:
+    return seen.setdefault(value, value)
+
+
+def _new_posting() -> array[int]:
+    return array('I')
+
+
+class CSVIndex:
+    """In-memory index over the rows of a CSV file
+
+    Searches are answered from a lowercase n-gram index over the searched columns.
+    A candidate row must contain every n-gram of the term, candidates are then
+    checked with the same substring test as a linear scan would do. Terms shorter
+    than an n-gram are matched against the pre-lowered values of each row, kept
+    as a single string per row.
+
+    Exact matches on the first matched columns are answered from a hash index
+    mapping each value to the first row containing it.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        searched_columns: Iterable[str | None],
+        first_matched_columns: Iterable[str | None],
+    ) -> None:
+        self.table = table
+        self._lowered: list[str | None] = []
+        self._ngrams: defaultdict[str, array[int]] = defaultdict(_new_posting)
+        self._exact: dict[Any, int] = {}
+
+        searched = [column for column in searched_columns if column]
+        first_matched = [column for column in first_matched_columns if column]
+        self._warn_missing_columns(searched + first_matched)
+
+        lowered_rows: dict[str, str] = {}
+        for i in range(len(table)):
+            lowered = [str(value).lower() for value in table.values(i, searched)]
+            if lowered:
+                # Rows with the same searched values share the same string
+                self._lowered.append(_dedup(lowered_rows, _SEPARATOR.join(lowered)))
+            else:
+                self._lowered.append(None)
+            for ngram in set().union(*(_ngrams(value) for value in lowered)):
+                self._ngrams[ngram].append(i)
+
+            for value in table.values(i, first_matched):
+                self._exact.setdefault(value, i)
+
+    @classmethod
+    def empty(cls) -> CSVIndex:
+        return cls(DictTable([], []), [], [])
+
+    @property
+    def content(self) -> list[dict[str, Any]]:
+        return self.table.entries
+
+    def _warn_missing_columns(self, columns: list[str]) -> None:
+        for column in columns:
+            if column not in self.table.header:
+                logger.info('plugin misconfigured "%s" is not in the CSV file', column)
+
+    def search(self, term: str) -> list[dict[str, Any]]:
+        term = term.lower()
+        if _SEPARATOR in term:
+            return []
+        if len(term) < NGRAM_SIZE:
+            candidates: Iterable[int] = range(len(self.table))
+        else:
+            postings: list[array[int]] = []
+            for ngram in _ngrams(term):
+                posting = self._ngrams.get(ngram)
+                if not posting:
+                    return []
+                postings.append(posting)
+            rarest = min(postings, key=len)
+            candidates = rarest
+
+        results = []
+        for i in candidates:
+            lowered = self._lowered[i]
+            if lowered is not None and term in lowered:
+                results.append(self.table.entry(i))
+        return results
+
+    def first_match(self, term: str) -> dict[str, Any] | None:
+        i = self._exact.get(term)
+        if i is None:
+            return None
+        return self.table.entry(i)
+
+    def match_all(self, terms: Iterable[str]) -> dict[str, dict[str, Any]]:
+        results = {}
+        for term in terms:
+            i = self._exact.get(term)
+            if i is not None:
+                results[term] = self.table.entry(i)
+        return results
+
+    def find(self, column: str, values: Iterable[Any]) -> list[dict[str, Any]]:
+        wanted = set(values)
+        return [
+            self.table.entry(i)
+            for i in range(len(self.table))
+            if any(value in wanted for value in self.table.values(i, [column]))
+        ]
@@ -6,9 +6,10 @@ from __future__ import annotations
 import csv
 import logging
 import pathlib
+import threading
+import weakref
 from builtins import list as list_t
-from collections.abc import Callable, Iterable
-from functools import partial
+from collections.abc import Iterable
 from typing import Any, cast
 
 from wazo_dird import BaseSourcePlugin, make_result_class
@@ -17,9 +18,13 @@ from wazo_dird.plugins.base_plugins import SourcePluginDependencies
 from wazo_dird.plugins.source_result import _SourceResult as SourceResult
 
 from . import http
+from .index import CSVIndex
+from .storage import CompactTable, DictTable, Table
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_RELOAD_INTERVAL = 1.0
+
 
 class CSVView(BaseBackendView):
     backend = 'csv'
@@ -38,6 +43,14 @@ class CSVPlugin(BaseSourcePlugin):
 
     The `file` is the file that should be read by the plugin
     The `searched_columns` are the columns used to search for a term
+
+    When `compact_storage` is enabled, rows are kept as tuples of interned strings
+    instead of one dict per row, which uses a lot less memory for large files.
+
+    The file is loaded when the source is loaded, then a background thread checks
+    its modification time every `reload_interval` seconds. A modified file is
+    parsed and indexed by that thread and swapped in once complete, lookups always
+    use the last fully loaded content.
     """
 
     def __init__(self) -> None:
@@ -45,9 +58,10 @@ class CSVPlugin(BaseSourcePlugin):
         self._csv_last_modification_time: float | None = None
         self._config: dict[str, Any] = {}
         self._name: str = ''
-        self._content: list_t[dict[str, Any]] = []
+        self._index: CSVIndex = CSVIndex.empty()
         self._has_unique_id: bool = False
         self._SourceResult: type[SourceResult]
+        self._stopped = threading.Event()
 
     def load(self, args: SourcePluginDependencies) -> None:
         if 'config' not in args:
@@ -55,9 +69,10 @@ class CSVPlugin(BaseSourcePlugin):
 
         self._config = cast('dict[str, Any]', args.get('config', {}))
         self._name = self._config.get('name', '')
-        self._content = []
+        self._index = CSVIndex.empty()
         self._has_unique_id = self._config.get(self.UNIQUE_COLUMN, None) is not None
         self._load_file()
+        self._start_watcher()
         backend = self._config.get('backend', '')
         self._SourceResult = make_result_class(
             backend,
@@ -66,48 +81,70 @@ class CSVPlugin(BaseSourcePlugin):
             self._config.get(self.FORMAT_COLUMNS, {}),
         )
 
+    def unload(self) -> None:
+        self._stopped.set()
+
     def name(self) -> str:  # type: ignore[override]
         return self._name
 
+    @property
+    def _content(self) -> list_t[dict[str, Any]]:
+        return self._index.content
+
     def search(
         self, term: str, args: dict[str, Any] | None = None
     ) -> list_t[SourceResult]:
         if self.SEARCHED_COLUMNS not in self._config:
             return []
-        self._load_file()
-        fn = partial(
-            self._low_case_match_entry,
-            term.lower(),
-            self._config[self.SEARCHED_COLUMNS],
-        )
-        return self._list_from_predicate(fn)
+        return [self._SourceResult(entry) for entry in self._index.search(term)]
 
     def first_match(
         self, term: str, args: dict[str, Any] | None = None
     ) -> SourceResult | None:
         logger.debug('Looking for the first CSV entry matching "%s"', term)
-        self._load_file()
         if self.FIRST_MATCHED_COLUMNS not in self._config:
             logger.debug('No column configured for first match. Stopping.')
             return None
 
-        for entry in self._content:
-            if self._exact_match_entry(
-                term, self._config[self.FIRST_MATCHED_COLUMNS], entry
-            ):
-                logger.debug('Found one CSV entry matching "%s"', term)
-                return self._SourceResult(entry)
+        entry = self._index.first_match(term)
+        if entry is not None:
+            logger.debug('Found one CSV entry matching "%s"', term)
+            return self._SourceResult(entry)
         logger.debug('Found no CSV entry matching "%s"', term)
         return None
 
+    def match_all(
+        self, extens: list_t[str], args: dict[str, Any] | None = None
+    ) -> dict[str, SourceResult]:
+        logger.debug('Looking for CSV entries matching %s', extens)
+        if self.FIRST_MATCHED_COLUMNS not in self._config:
+            logger.debug('No column configured for first match. Stopping.')
+            return {}
+
+        matches = self._index.match_all(extens)
+        logger.debug('Found %d CSV entries matching %s', len(matches), extens)
+        return {exten: self._SourceResult(entry) for exten, entry in matches.items()}
+
     def list(
         self, unique_ids: list_t[str], args: dict[str, Any] | None = None
     ) -> list_t[SourceResult]:
         if not self._has_unique_id:
             return []
-        self._load_file()
-        fn = partial(self._is_in_unique_ids, unique_ids)
-        return self._list_from_predicate(fn)
+        entries = self._index.find(self._config[self.UNIQUE_COLUMN], unique_ids)
+        return [self._SourceResult(entry) for entry in entries]
+
+    def _start_watcher(self) -> None:
+        if 'file' not in self._config:
+            return
+
+        interval = self._config.get('reload_interval', DEFAULT_RELOAD_INTERVAL)
+        watcher = threading.Thread(
+            target=_watch_file,
+            args=(weakref.ref(self), self._stopped, interval),
+            name=f'csv-watcher-{self._name}',
+        )
+        watcher.daemon = True
+        watcher.start()
 
     def _load_file(self) -> None:
         if 'file' not in self._config:
@@ -126,61 +163,42 @@ class CSVPlugin(BaseSourcePlugin):
                 with open(filename) as f:
                     csvreader = csv.reader(f, delimiter=delimiter)
                     keys = [key for key in next(csvreader)]
-                    self._content = [self._row_to_dict(keys, row) for row in csvreader]
-                    logger.debug('Loaded with %s', self._content)
+                    table: Table
+                    if self._config.get('compact_storage'):
+                        table = CompactTable(keys, csvreader)
+                    else:
+                        entries = (self._row_to_dict(keys, row) for row in csvreader)
+                        table = DictTable(keys, entries)
+                    logger.debug('Loaded %d entries from %s', len(table), filename)
+                # Replacing the whole index at once, lookups see the old or the new
+                # content but never a partially loaded one
+                self._index = CSVIndex(
+                    table,
+                    self._config.get(self.SEARCHED_COLUMNS, []),
+                    self._config.get(self.FIRST_MATCHED_COLUMNS, []),
+                )
                 self._csv_last_modification_time = tmp_csv_file_last_modification_date
             except OSError:
                 logger.exception('Could not load CSV file content')
         except FileNotFoundError:
             logger.exception('Could not locate CSV file on the system')
 
-    def _list_from_predicate(
-        self, predicate: Callable[[dict[str, Any]], bool]
-    ) -> list_t[SourceResult]:
-        return list(map(self._SourceResult, filter(predicate, self._content)))
-
-    def _is_in_unique_ids(self, unique_ids: list_t[str], entry: dict[str, Any]) -> bool:
-        return self._make_unique(entry) in unique_ids
-
-    def _low_case_match_entry(
-        self, term: str, columns: list_t[str], entry: dict[str, Any]
-    ) -> bool:
-        logger.debug('Looking for %r in %s %s', term, entry, columns)
-        lowered_values = [value.lower() for value in self._entry_values(columns, entry)]
-        for value in lowered_values:
-            if term in value:
-                return True
-        return False
-
-    def _exact_match_entry(
-        self, term: str, columns: list_t[str], entry: dict[str, Any]
-    ) -> bool:
-        for value in self._entry_values(columns, entry):
-            if term == value:
-                return True
-        return False
-
-    @staticmethod
-    def _entry_values(
-        column_names: Iterable[str], entry: dict[str, Any]
-    ) -> list_t[Any]:
-        values = []
-        for column_name in column_names:
-            if not column_name:
-                continue
-            try:
-                values.append(entry[column_name])
-            except KeyError:
-                logger.info(
-                    'plugin misconfigured "%s" is not in the CSV file',
-                    column_name,
-                )
-        return values
-
     @staticmethod
     def _row_to_dict(keys: Iterable[str], values: Iterable[Any]) -> dict[str, Any]:
         return dict(zip(keys, values))
 
-    def _make_unique(self, entry: dict[str, Any]) -> Any:
-        unique_column = self._config[self.UNIQUE_COLUMN]
-        return entry[unique_column]
+
+def _watch_file(
+    plugin_ref: weakref.ref[CSVPlugin], stopped: threading.Event, interval: float
+) -> None:
+    # Only a weak reference is kept, sources invalidated without being unloaded
+    # stop their watcher once garbage collected
+    while not stopped.wait(interval):
+        plugin = plugin_ref()
+        if plugin is None:
+            return
+        try:
+            plugin._load_file()
+        except Exception:
+            logger.exception('Failed to reload CSV file %s', plugin._config['file'])
+        del plugin
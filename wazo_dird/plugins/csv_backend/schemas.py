@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo.mallow import fields
-from xivo.mallow.validate import Length
+from xivo.mallow.validate import Length, Range
 from xivo.mallow_helpers import ListSchema as _ListSchema
 
 from wazo_dird.schemas import BaseSourceSchema
@@ -16,6 +16,8 @@ class SourceSchema(BaseSourceSchema):
     )
     file = fields.String(validate=Length(min=1), required=True)
     separator = fields.String(validate=Length(min=1, max=1), load_default=',')
+    reload_interval = fields.Float(validate=Range(min=0.1), load_default=1.0)
+    compact_storage = fields.Boolean(load_default=False)
 
 
 class ListSchema(_ListSchema):
@@ -0,0 +1,91 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any, Protocol
+
+
+class Table(Protocol):
+    header: tuple[str, ...]
+
+    @property
+    def entries(self) -> list[dict[str, Any]]:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def entry(self, row: int) -> dict[str, Any]:
+        ...
+
+    def values(self, row: int, columns: Sequence[str]) -> list[Any]:
+        ...
+
+
+class DictTable:
+    """Rows of a CSV file stored as one dict per row"""
+
+    def __init__(self, header: Iterable[str], entries: Iterable[dict[str, Any]]):
+        self.header = tuple(header)
+        self.entries = list(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def entry(self, row: int) -> dict[str, Any]:
+        return self.entries[row]
+
+    def values(self, row: int, columns: Sequence[str]) -> list[Any]:
+        entry = self.entries[row]
+        return [entry[column] for column in columns if column in entry]
+
+
+class CompactTable:
+    """Rows of a CSV file stored as one list of values per column
+
+    The header is only kept once and values repeated in a file share the same
+    string. Dicts are only built for the rows returned by a lookup.
+    """
+
+    def __init__(self, header: Iterable[str], rows: Iterable[Sequence[str]]):
+        self.header = tuple(header)
+        self._positions = {column: i for i, column in enumerate(self.header)}
+        self._columns: list[list[str | None]] = [[] for _ in self.header]
+        self._length = 0
+
+        strings: dict[str, str] = {}
+        for row in rows:
+            for i, column in enumerate(self._columns):
+                if i < len(row):
+                    value = row[i]
+                    column.append(strings.setdefault(value, value))
+                else:
+                    column.append(None)
+            self._length += 1
+
+    @property
+    def entries(self) -> list[dict[str, Any]]:
+        return [self.entry(row) for row in range(self._length)]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def entry(self, row: int) -> dict[str, Any]:
+        return {
+            name: column[row]
+            for name, column in zip(self.header, self._columns)
+            if column[row] is not None
+        }
+
+    def values(self, row: int, columns: Sequence[str]) -> list[Any]:
+        values = []
+        for name in columns:
+            position = self._positions.get(name)
+            if position is None:
+                continue
+            value = self._columns[position][row]
+            if value is not None:
+                values.append(value)
+        return values
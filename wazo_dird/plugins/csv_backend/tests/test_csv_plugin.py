@@ -5,6 +5,7 @@ import os
 import random
 import string
 import tempfile
+import time
 import unittest
 from typing import IO, cast
 
@@ -14,6 +15,7 @@ from hamcrest import (
     contains_inanyorder,
     empty,
     equal_to,
+    has_entries,
     has_properties,
     none,
 )
@@ -87,6 +89,81 @@ class TestCSVDirectorySourceSeparator(BaseCSVTestDirectory):
         assert_that(results, contains_exactly(SourceResult(alice)))
 
 
+class TestCSVDirectorySourceCompactStorage(BaseCSVTestDirectory):
+    content = comma_separated_content
+
+    def setUp(self):
+        self.source = CSVPlugin()
+        config = {
+            'file': self.fname,
+            'unique_column': 'clientno',
+            'searched_columns': ['firstname'],
+            'first_matched_columns': ['number'],
+            'name': 'my_directory',
+            'compact_storage': True,
+        }
+        self.source.load(_deps({'config': config}))
+
+    def tearDown(self):
+        self.source.unload()
+
+    def test_search(self):
+        results = self.source.search('ice')
+
+        assert_that(results, contains_exactly(SourceResult(alice)))
+
+    def test_first_match(self):
+        result = self.source.first_match('5555555555')
+
+        assert_that(result, equal_to(SourceResult(alice)))
+
+    def test_list(self):
+        results = self.source.list(['1'])
+
+        assert_that(results, contains_exactly(SourceResult(alice)))
+
+
+class TestCSVDirectorySourceReload(BaseCSVTestDirectory):
+    content = comma_separated_content
+
+    def setUp(self):
+        self.source = CSVPlugin()
+        config = {
+            'file': self.fname,
+            'unique_column': 'clientno',
+            'searched_columns': ['firstname'],
+            'first_matched_columns': ['number'],
+            'name': 'my_directory',
+            'reload_interval': 0.01,
+        }
+        self.source.load(_deps({'config': config}))
+
+    def tearDown(self):
+        self.source.unload()
+        with open(self.fname, 'w') as f:
+            f.write(self.content)
+
+    def test_modified_file_is_reloaded_in_the_background(self):
+        with open(self.fname, 'w') as f:
+            f.write(self.content.replace('Alice', 'Alicia'))
+        mtime = os.stat(self.fname).st_mtime + 10
+        os.utime(self.fname, (mtime, mtime))
+
+        for _ in range(200):
+            if self.source.search('alicia'):
+                break
+            time.sleep(0.01)
+
+        assert_that(
+            self.source.search('alicia'),
+            contains_exactly(SourceResult(dict(alice, firstname='Alicia'))),
+        )
+        assert_that(
+            self.source.first_match('5555555555'),
+            has_properties(fields=has_entries(firstname='Alicia')),
+        )
+
+
 class TestCsvDirectorySource(BaseCSVTestDirectory):
     content = comma_separated_content
 
@@ -257,6 +334,32 @@ class TestCsvDirectorySource(BaseCSVTestDirectory):
 
         assert_that(results, equal_to(None))
 
+    def test_match_all(self):
+        config = {
+            'file': self.fname,
+            'unique_column': 'clientno',
+            'first_matched_columns': ['number', 'clientno'],
+            'name': self.name,
+        }
+
+        self.source.load(_deps({'config': config}))
+
+        results = self.source.match_all(['5555556666', '1', '42'])
+
+        assert_that(
+            results,
+            equal_to({'5555556666': self.charles_result, '1': self.alice_result}),
+        )
+
+    def test_match_all_no_first_matched_columns(self):
+        config = {'file': self.fname, 'unique_column': 'clientno', 'name': self.name}
+
+        self.source.load(_deps({'config': config}))
+
+        results = self.source.match_all(['5555556666'])
+
+        assert_that(results, empty())
+
     def test_list_no_unique(self):
         config = {'file': self.fname, 'name': 'my_dir'}
 
@@ -292,49 +395,6 @@ class TestCsvDirectorySource(BaseCSVTestDirectory):
 
         assert_that(result, equal_to({'one': 1, 'two': 2, 'three': 3}))
 
-    def test_is_in_unique_ids(self):
-        config = {'file': self.fname, 'unique_column': 'clientno', 'name': 'my_dir'}
-
-        self.source.load(_deps({'config': config}))
-
-        result = self.source._is_in_unique_ids(
-            ['12'], {'firstname': 'Alice', 'lastname': 'AAA', 'clientno': '12'}
-        )
-
-        assert_that(result, equal_to(True))
-
-        result = self.source._is_in_unique_ids(
-            ['12'], {'firstname': 'Bob', 'lastname': 'BBB', 'clientno': '55'}
-        )
-
-        assert_that(result, equal_to(False))
-
-    def test_low_case_match_entry(self):
-        config = {'file': self.fname, 'unique_column': 'clientno', 'name': 'my_dir'}
-
-        term = 'ice'
-        columns = ['firstname', 'lastname']
-
-        self.source.load(_deps({'config': config}))
-
-        result = self.source._low_case_match_entry(term, columns, alice)
-
-        assert_that(result, equal_to(True))
-
-    def test_low_case_match_entry_broken_config(self):
-        config = {'file': self.fname, 'unique_column': 'clientno', 'name': 'my_dir'}
-
-        term = 'ice'
-        columns = [None, 'firstname', 'lastname']
-
-        self.source.load(_deps({'config': config}))
-
-        result = self.source._low_case_match_entry(
-            term, cast('list[str]', columns), alice
-        )
-
-        assert_that(result, equal_to(True))
-
     def _generate_random_non_existent_filename(self):
         while True:
             name = ''.join(random.choice(string.ascii_lowercase) for _ in range(10))
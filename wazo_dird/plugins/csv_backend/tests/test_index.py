@@ -0,0 +1,119 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, contains_exactly, empty, equal_to, none
+
+from ..index import CSVIndex
+from ..storage import CompactTable, DictTable
+
+header = ['id', 'firstname', 'lastname', 'number']
+alice = {'id': '1', 'firstname': 'Alice', 'lastname': 'AAA', 'number': '1234'}
+bob = {'id': '2', 'firstname': 'Bob', 'lastname': 'BBB', 'number': '5678'}
+alicia = {'id': '3', 'firstname': 'Alicia', 'lastname': 'CCC', 'number': '1234'}
+
+
+class BaseTestCSVIndex:
+    class TestCSVIndex(unittest.TestCase):
+        def make_table(self, header, entries):
+            raise NotImplementedError()
+
+        def setUp(self):
+            self.index = CSVIndex(
+                self.make_table(header, [alice, bob, alicia]),
+                ['firstname', 'lastname'],
+                ['number', 'id'],
+            )
+
+        def test_search_is_case_insensitive_and_keeps_file_order(self):
+            results = self.index.search('ALI')
+
+            assert_that(results, contains_exactly(alice, alicia))
+
+        def test_search_substring_in_the_middle_of_a_value(self):
+            results = self.index.search('lic')
+
+            assert_that(results, contains_exactly(alice, alicia))
+
+        def test_search_ngrams_must_be_in_the_same_value(self):
+            table = self.make_table(['a', 'b'], [{'a': 'abc', 'b': 'def'}])
+            index = CSVIndex(table, ['a', 'b'], [])
+
+            results = index.search('bcde')
+
+            assert_that(results, empty())
+
+        def test_search_short_term(self):
+            results = self.index.search('b')
+
+            assert_that(results, contains_exactly(bob))
+
+        def test_search_empty_term(self):
+            results = self.index.search('')
+
+            assert_that(results, contains_exactly(alice, bob, alicia))
+
+        def test_search_empty_term_skips_rows_without_searched_values(self):
+            table = self.make_table(header, [{'id': '4'}, alice])
+            index = CSVIndex(table, ['firstname'], [])
+
+            results = index.search('')
+
+            assert_that(results, contains_exactly(alice))
+
+        def test_search_no_match(self):
+            results = self.index.search('zzz')
+
+            assert_that(results, empty())
+
+        def test_search_ignores_missing_and_empty_columns(self):
+            table = self.make_table(header, [alice])
+            index = CSVIndex(table, [None, '', 'not-a-column', 'firstname'], [])
+
+            results = index.search('ice')
+
+            assert_that(results, contains_exactly(alice))
+
+        def test_first_match_returns_the_first_entry_in_file_order(self):
+            result = self.index.first_match('1234')
+
+            assert_that(result, equal_to(alice))
+
+        def test_first_match_any_column(self):
+            result = self.index.first_match('3')
+
+            assert_that(result, equal_to(alicia))
+
+        def test_first_match_is_exact(self):
+            result = self.index.first_match('123')
+
+            assert_that(result, none())
+
+        def test_match_all(self):
+            results = self.index.match_all(['1234', '2', '0000'])
+
+            assert_that(results, equal_to({'1234': alice, '2': bob}))
+
+        def test_find(self):
+            results = self.index.find('id', ['3', '1', '42'])
+
+            assert_that(results, contains_exactly(alice, alicia))
+
+        def test_find_unknown_column(self):
+            results = self.index.find('not-a-column', ['1'])
+
+            assert_that(results, empty())
+
+        def test_content(self):
+            assert_that(self.index.content, contains_exactly(alice, bob, alicia))
+
+
+class TestCSVIndexDictTable(BaseTestCSVIndex.TestCSVIndex):
+    def make_table(self, header, entries):
+        return DictTable(header, entries)
+
+
+class TestCSVIndexCompactTable(BaseTestCSVIndex.TestCSVIndex):
+    def make_table(self, header, entries):
+        return CompactTable(header, [list(entry.values()) for entry in entries])
@@ -3,12 +3,14 @@
 
 from __future__ import annotations
 
+import json
 import logging
+from collections.abc import Iterable, Iterator
 from time import time
 from typing import TYPE_CHECKING, Any, cast
 
-from flask import request
-from flask_restful import reqparse
+from flask import Response, request
+from flask_restful import inputs, reqparse
 from requests.exceptions import HTTPError
 from xivo.tenant_flask_helpers import Tenant
 
@@ -29,7 +31,7 @@ if TYPE_CHECKING:
 
     from wazo_dird.plugins.display_service.plugin import _DisplayService
     from wazo_dird.plugins.favorites_service.plugin import _FavoritesService
-    from wazo_dird.plugins.lookup_service.plugin import _LookupService
+    from wazo_dird.plugins.lookup_service.plugin import SourceLookup, _LookupService
     from wazo_dird.plugins.personal_service.plugin import _PersonalService
     from wazo_dird.plugins.profile_service.plugin import _ProfileService
     from wazo_dird.plugins.reverse_service.plugin import _ReverseService
@@ -40,16 +42,26 @@ parser = reqparse.RequestParser()
 parser.add_argument(
     'term', type=str, required=True, help='term is missing', location='args'
 )
+parser.add_argument(
+    'sources_status', type=inputs.boolean, default=False, location='args'
+)
 
 parser_reverse = reqparse.RequestParser()
 parser_reverse.add_argument('exten', type=str, required=True, location='args')
 
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
 
 def _error(code: int, msg: str) -> tuple[dict[str, Any], int]:
     logger.error(msg)
     return {'reason': [msg], 'timestamp': [time()], 'status_code': code}, code
 
 
+def _wants_stream() -> bool:
+    mimetypes = ['application/json', NDJSON_MIMETYPE]
+    return request.accept_mimetypes.best_match(mimetypes) == NDJSON_MIMETYPE
+
+
 class DisabledFavoriteService:
     def favorite_ids(self, profile: dict[str, Any], user_uuid: str) -> list[Any]:
         return []
@@ -69,7 +81,9 @@ class Lookup(LegacyAuthResource, DisplayAwareResource):
         self.profile_service = profile_service
 
     @required_acl('dird.directories.lookup.{profile}.read')
-    def get(self, profile: str) -> dict[str, Any] | tuple[dict[str, Any], int]:
+    def get(
+        self, profile: str
+    ) -> dict[str, Any] | tuple[dict[str, Any], int] | Response:
         args = parser.parse_args()
         term = args['term']
 
@@ -86,7 +100,21 @@ class Lookup(LegacyAuthResource, DisplayAwareResource):
         token_infos = auth.client().token.get(token)
         user_uuid = token_infos['metadata']['uuid']
 
-        raw_results = self.lookup_service.lookup(
+        if _wants_stream():
+            lookups = self.lookup_service.lookup_progressively(
+                cast(ProfileConfig, profile_config),
+                tenant.uuid,
+                term,
+                user_uuid,
+                token=token,
+            )
+            favorites = self.favorite_service.favorite_ids(
+                cast(ProfileConfig, profile_config), user_uuid
+            ).by_name
+            lines = _ResultFormatter(display).format_lookups(lookups, favorites, term)
+            return Response(lines, mimetype=NDJSON_MIMETYPE)
+
+        raw_results, sources_status = self.lookup_service.lookup_with_status(
             cast(ProfileConfig, profile_config),
             tenant.uuid,
             term,
@@ -100,6 +128,8 @@ class Lookup(LegacyAuthResource, DisplayAwareResource):
         response = formatter.format_results(raw_results, favorites)
 
         response.update({'term': term})
+        if args['sources_status']:
+            response['sources_status'] = sources_status
 
         return response
 
@@ -120,7 +150,7 @@ class LookupByUUID(AuthResource, DisplayAwareResource):
         self.auth_client = auth_client
 
     @required_acl('dird.directories.lookup.{profile}.{user_uuid}.read')
-    def get(self, profile: str, user_uuid: str) -> dict[str, Any]:
+    def get(self, profile: str, user_uuid: str) -> dict[str, Any] | Response:
         args = parser.parse_args()
         term = args['term']
 
@@ -135,7 +165,21 @@ class LookupByUUID(AuthResource, DisplayAwareResource):
 
         token = request.headers['X-Auth-Token']
 
-        raw_results = self.lookup_service.lookup(
+        if _wants_stream():
+            lookups = self.lookup_service.lookup_progressively(
+                cast(ProfileConfig, profile_config),
+                tenant_uuid,
+                term,
+                user_uuid,
+                token=token,
+            )
+            favorites = self.favorite_service.favorite_ids(
+                cast(ProfileConfig, profile_config), user_uuid
+            ).by_name
+            lines = _ResultFormatter(display).format_lookups(lookups, favorites, term)
+            return Response(lines, mimetype=NDJSON_MIMETYPE)
+
+        raw_results, sources_status = self.lookup_service.lookup_with_status(
             cast(ProfileConfig, profile_config),
             tenant_uuid,
             term,
@@ -149,6 +193,8 @@ class LookupByUUID(AuthResource, DisplayAwareResource):
         response = formatter.format_results(raw_results, favorites)
 
         response.update({'term': term})
+        if args['sources_status']:
+            response['sources_status'] = sources_status
 
         return response
 
@@ -356,19 +402,54 @@ class _ResultFormatter:
             'results': [self._format_result(r) for r in results],
         }
 
+    def format_lookups(
+        self, lookups: Iterable[SourceLookup], favorites: dict[str, Any], term: str
+    ) -> Iterator[str]:
+        self._favorites = favorites
+        yield self._ndjson(
+            {
+                'column_headers': self._headers,
+                'column_types': self._types,
+                'term': term,
+            }
+        )
+        timed_out, rejected, circuit_open = [], [], []
+        for lookup in lookups:
+            if lookup.timed_out:
+                timed_out.append(lookup.source)
+                continue
+            if lookup.rejected:
+                rejected.append(lookup.source)
+                continue
+            if lookup.circuit_open:
+                circuit_open.append(lookup.source)
+                continue
+            yield self._ndjson(
+                {
+                    'source': lookup.source,
+                    'results': [self._format_result(r) for r in lookup.results],
+                }
+            )
+        yield self._ndjson(
+            {'timed_out': timed_out, 'rejected': rejected, 'circuit_open': circuit_open}
+        )
+
+    @staticmethod
+    def _ndjson(line: dict[str, Any]) -> str:
+        return json.dumps(line) + '\n'
+
     def _format_result(self, result: SourceResult) -> dict[str, Any]:
+        # results may be shared with other requests by the lookup cache
+        fields = dict(result.fields)
         if self._has_favorites:
-            is_favorite = self._is_favorite(result)
-            result.fields[self._favorite_field] = is_favorite
+            fields[self._favorite_field] = self._is_favorite(result)
 
-        result.fields.update(
+        fields.update(
             dict.fromkeys(self._personal_fields, getattr(result, 'is_personal', False))
         )
 
         return {
-            'column_values': [
-                result.fields.get(d.field, d.default) for d in self._display
-            ],
+            'column_values': [fields.get(d.field, d.default) for d in self._display],
             'relations': result.relations,
             'source': result.source,
             'backend': result.backend,
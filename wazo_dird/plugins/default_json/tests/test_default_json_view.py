@@ -1,6 +1,7 @@
 # Copyright 2015-2025 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import json
 import unittest
 from typing import cast
 from unittest.mock import ANY, Mock, call
@@ -20,6 +21,7 @@ from hamcrest import (
 from wazo_dird import make_result_class
 from wazo_dird.helpers import DisplayColumn
 from wazo_dird.plugin_manager import ViewDependencies
+from wazo_dird.plugins.lookup_service.plugin import SourceLookup
 from wazo_dird.plugins.tests.base_http_view_test_case import BaseHTTPViewTestCase
 
 from ..http import (
@@ -449,3 +451,37 @@ class TestFormatResult(unittest.TestCase):
                 ),
             ),
         )
+
+    def test_that_format_lookups_streams_one_line_per_source(self):
+        result = self.SourceResult(
+            {'id': 1, 'firstname': 'Alice'}, self.xivo_id, None, None, None, None
+        )
+        display = [DisplayColumn('Firstname', None, 'Unknown', 'firstname')]
+        formatter = _ResultFormatter(display)
+        lookups = [
+            SourceLookup('my_source', [result]),
+            SourceLookup('slow_source', [], timed_out=True),
+            SourceLookup('busy_source', [], rejected=True),
+            SourceLookup('broken_source', [], circuit_open=True),
+        ]
+
+        lines = list(formatter.format_lookups(lookups, {}, 'ali'))
+
+        assert_that(
+            [json.loads(line) for line in lines],
+            contains_exactly(
+                has_entries(column_headers=['Firstname'], term='ali'),
+                has_entries(
+                    source='my_source',
+                    results=contains_exactly(
+                        has_entries(column_values=['Alice'], source='my_source')
+                    ),
+                ),
+                has_entries(
+                    timed_out=['slow_source'],
+                    rejected=['busy_source'],
+                    circuit_open=['broken_source'],
+                ),
+            ),
+        )
+        assert all(line.endswith('\n') for line in lines)
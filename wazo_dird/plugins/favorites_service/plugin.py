@@ -5,12 +5,19 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict, namedtuple
-from concurrent.futures import ALL_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import ALL_COMPLETED, Future, wait
 from typing import TYPE_CHECKING, Any, cast
 
 from wazo_bus.resources.directory.event import FavoriteAddedEvent, FavoriteDeletedEvent
 
-from wazo_dird import BaseServicePlugin, BaseSourcePlugin, database, exception, helpers
+from wazo_dird import (
+    BaseServicePlugin,
+    BaseSourcePlugin,
+    database,
+    exception,
+    helpers,
+    metrics,
+)
 from wazo_dird.database.helpers import Session
 from wazo_dird.helpers import ProfileConfig
 from wazo_dird.plugins.base_plugins import SourceConfig
@@ -92,7 +99,9 @@ class _FavoritesService(helpers.BaseService):
         logger.info(
             'Creating favorites service threadpool [max_workers=%d]', max_workers
         )
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._executor = metrics.InstrumentedThreadPoolExecutor(
+            self._service_name, max_workers=max_workers
+        )
         self._crud = crud
         self._bus = bus
         self._xivo_uuid = config.get('uuid')
@@ -117,7 +126,10 @@ class _FavoritesService(helpers.BaseService):
             return_on_raise=[]
         )
         future = self._executor.submit(
-            raise_stopper.execute, source.list, contact_ids, args
+            metrics.instrument(self._service_name, source, raise_stopper),
+            source.list,
+            contact_ids,
+            args,
         )
         setattr(future, 'name', source.name)
         return future
@@ -152,7 +164,8 @@ class _FavoritesService(helpers.BaseService):
         if 'lookup_timeout' in self._config:
             params['timeout'] = self._config['lookup_timeout']
 
-        done, _ = wait(futures, **params)
+        done, not_done = wait(futures, **params)
+        metrics.count_timeouts(self._service_name, not_done)
         results: list[_SourceResult] = []
         for future in done:
             for result in future.result():
@@ -1,4 +1,4 @@
-# Copyright 2019-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2019-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
@@ -9,6 +9,11 @@ from typing import Any, cast
 
 from wazo_dird import BaseSourcePlugin, make_result_class
 from wazo_dird.helpers import AuthConfig, BackendViewDependencies, BaseBackendView
+from wazo_dird.plugin_helpers.external_contacts import (
+    DEFAULT_CONTACTS_TTL,
+    DEFAULT_MAX_USERS,
+    ExternalContactsCache,
+)
 from wazo_dird.plugins.base_plugins import SourcePluginDependencies
 from wazo_dird.plugins.source_result import _SourceResult as SourceResult
 
@@ -43,6 +48,7 @@ class GoogleViewPlugin(BaseBackendView):
 class GooglePlugin(BaseSourcePlugin):
     auth: AuthConfig
     google: services.GoogleService
+    _contacts_cache: ExternalContactsCache
     unique_column: str
     _searched_columns: list[str]
     _first_matched_columns: list[str]
@@ -53,6 +59,10 @@ class GooglePlugin(BaseSourcePlugin):
         self.auth = cast('AuthConfig', dict(config)['auth'])
         self.name = config['name']
         self.google = services.GoogleService()
+        self._contacts_cache = ExternalContactsCache(
+            ttl=config.get('contacts_cache_ttl', DEFAULT_CONTACTS_TTL),
+            max_users=config.get('contacts_cache_max_users', DEFAULT_MAX_USERS),
+        )
         self.unique_column = 'id'
 
         format_columns: dict[str, str] = dict(config.get('format_columns', {}))
@@ -101,12 +111,10 @@ class GooglePlugin(BaseSourcePlugin):
     def list(
         self, unique_ids: list[str], args: dict[str, Any] | None = None
     ) -> list[SourceResult]:
-        try:
-            google_token = self._get_google_token(**(args or {}))
-        except GoogleTokenNotFoundException:
+        contacts = self._fetch_contacts(args)
+        if not contacts:
             return []
 
-        contacts, _ = self.google.get_contacts(google_token)
         filtered_contacts = [c for c in contacts if c[self.unique_column] in unique_ids]
 
         return [self._SourceResult(contact) for contact in filtered_contacts]
@@ -121,13 +129,10 @@ class GooglePlugin(BaseSourcePlugin):
             )
             return None
 
-        try:
-            google_token = self._get_google_token(**(args or {}))
-        except GoogleTokenNotFoundException:
-            logger.debug('could not find a matching google token, aborting first_match')
+        contacts = self._fetch_contacts(args)
+        if not contacts:
             return None
 
-        contacts, _ = self.google.get_contacts(google_token)
         lowered_term = term.lower()
 
         for contact in contacts:
@@ -144,13 +149,10 @@ class GooglePlugin(BaseSourcePlugin):
             )
             return {}
 
-        try:
-            google_token = self._get_google_token(**(args or {}))
-        except GoogleTokenNotFoundException:
-            logger.debug('could not find a matching google token, aborting match_all')
+        contacts = self._fetch_contacts(args)
+        if not contacts:
             return {}
 
-        contacts, _ = self.google.get_contacts(google_token)
         results: dict[str, SourceResult] = {}
         for term in terms:
             lowered_term = term.lower()
@@ -159,6 +161,21 @@ class GooglePlugin(BaseSourcePlugin):
                     results[term] = self._SourceResult(contact)
         return results
 
+    def _fetch_contacts(
+        self, args: dict[str, Any] | None = None
+    ) -> builtins.list[dict[str, Any]] | None:
+        args = args or {}
+        try:
+            google_token = self._get_google_token(**args)
+        except GoogleTokenNotFoundException:
+            logger.debug('could not find a matching google token')
+            return None
+
+        return self._contacts_cache.contacts(
+            args['user_uuid'],
+            lambda sync_state: self.google.sync_contacts(google_token, sync_state),
+        )
+
     def _first_match_predicate(self, term: str, contact: dict[str, Any]) -> bool:
         for column in self._first_matched_columns:
             column_value = contact.get(column) or ''
@@ -184,7 +201,10 @@ class GooglePlugin(BaseSourcePlugin):
             logger.debug('Unable to search through Google without a token.')
             raise GoogleTokenNotFoundException(user_uuid)
 
-        access_token = services.get_google_access_token(user_uuid, token, **self.auth)
+        access_token = self._contacts_cache.access_token(
+            user_uuid,
+            lambda: services.get_google_external_auth(user_uuid, token, **self.auth),
+        )
         if access_token is None:
             raise GoogleTokenNotFoundException(user_uuid)
         return access_token
@@ -10,12 +10,18 @@ from typing import Any
 import requests
 from wazo_auth_client import Client as Auth
 
+from wazo_dird.cache import TTLCache
+from wazo_dird.plugin_helpers.external_contacts import ContactsChanges
 from wazo_dird.plugin_helpers.sorting import sort_contacts
 
 from .exceptions import GoogleTokenNotFoundException
 
 logger = logging.getLogger(__name__)
 
+# Searches with the same access token skip the warm-up request during this delay
+WARM_UP_TTL = 300
+WARM_UP_MAX_TOKENS = 1000
+
 
 class GoogleService:
     USER_AGENT = 'wazo_ua/1.0'
@@ -30,6 +36,7 @@ class GoogleService:
 
     def __init__(self) -> None:
         self.formatter = ContactFormatter()
+        self._warmed_up: TTLCache[str, bool] = TTLCache(WARM_UP_TTL, WARM_UP_MAX_TOKENS)
 
     def get_contacts_with_term(
         self, google_token: str, term: str
@@ -45,39 +52,79 @@ class GoogleService:
         paginated_contacts = self._paginate(sorted_contacts, **list_params)
         return paginated_contacts, total
 
-    def _fetch(
-        self, google_token: str, term: str | None = None
-    ) -> Iterator[dict[str, Any]]:
+    def sync_contacts(
+        self, google_token: str, sync_state: str | None = None
+    ) -> ContactsChanges | None:
+        """The contacts changed since `sync_state`, or all contacts when None
+
+        `sync_state` is the `nextSyncToken` returned by the previous
+        synchronization. Returns None when the contacts could not be fetched,
+        including when the sync token expired.
+        """
         headers = self.headers(google_token)
-        url = self.people_url
         params: dict[str, Any] = {
             'personFields': self.person_fields,
             'pageSize': 1000,
+            'requestSyncToken': 'true',
         }
+        if sync_state:
+            params['syncToken'] = sync_state
+
+        changed: dict[str, dict[str, Any]] = {}
+        removed: list[str] = []
+        while True:
+            response = self._get_request(
+                self.people_url, headers, params, 'Fetched contacts from Google'
+            )
+            if not response:
+                return None
+
+            data = response.json()
+            for person in data.get('connections', []):
+                resource_name = person.get('resourceName')
+                if person.get('metadata', {}).get('deleted'):
+                    removed.append(resource_name)
+                else:
+                    changed[resource_name] = self.formatter.format(person)
+
+            page_token = data.get('nextPageToken')
+            if not page_token:
+                break
+            params['pageToken'] = page_token
+
+        return ContactsChanges(
+            changed, removed, data.get('nextSyncToken'), full=not sync_state
+        )
+
+    def _fetch(
+        self, google_token: str, term: str | None = None
+    ) -> Iterator[dict[str, Any]]:
+        if not term:
+            changes = self.sync_contacts(google_token)
+            if changes:
+                yield from changes.changed.values()
+            return
 
-        if term:
-            url = self.search_url
-            params = {
-                'readMask': self.person_fields,
-                'pageSize': 30,
-            }
+        headers = self.headers(google_token)
+        params: dict[str, Any] = {
+            'readMask': self.person_fields,
+            'pageSize': 30,
+        }
 
-            # empty request to 'warm' cache, recommended by Google
-            self._get_request(url, headers, params)
-            params['query'] = term
+        # empty request to 'warm' cache, recommended by Google
+        if not self._warmed_up.get(google_token):
+            self._get_request(self.search_url, headers, params)
+            self._warmed_up.set(google_token, True)
+        params['query'] = term
 
         response = self._get_request(
-            url, headers, params, 'Fetched contacts from Google'
+            self.search_url, headers, params, 'Fetched contacts from Google'
         )
         if not response:
             return
 
-        if term:
-            for contact in response.json().get('results', []):
-                yield self.formatter.format(contact.get('person', {}))
-        else:
-            for contact in response.json().get('connections', []):
-                yield self.formatter.format(contact)
+        for contact in response.json().get('results', []):
+            yield self.formatter.format(contact.get('person', {}))
 
     def _get_batch_of_contacts(
         self, headers: dict[str, str], contact_ids: list[str]
@@ -144,12 +191,20 @@ class GoogleService:
 def get_google_access_token(
     user_uuid: str, wazo_token: str, **auth_config: Any
 ) -> str | None:
+    external_auth = get_google_external_auth(user_uuid, wazo_token, **auth_config)
+    if not external_auth:
+        return None
+    access_token: str | None = external_auth.get('access_token')
+    return access_token
+
+
+def get_google_external_auth(
+    user_uuid: str, wazo_token: str, **auth_config: Any
+) -> dict[str, Any] | None:
     try:
         auth = Auth(token=wazo_token, **auth_config)
-        access_token: str | None = auth.external.get('google', user_uuid).get(
-            'access_token'
-        )
-        return access_token
+        external_auth: dict[str, Any] = auth.external.get('google', user_uuid)
+        return external_auth
     except requests.HTTPError as e:
         if e.response.status_code == 404:
             if 'unknown-external-auth-type' in e.response.text:
@@ -172,6 +227,7 @@ def get_google_access_token(
         raise GoogleTokenNotFoundException(user_uuid)
     except requests.RequestException as e:
         logger.error('Error occurred while connecting to wazo-auth, error: %s', e)
+        return None
 
 
 class ContactFormatter:
@@ -1,4 +1,4 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
@@ -7,19 +7,24 @@ import itertools
 import logging
 import re
 import threading
+import time
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Any, cast
 
 import ldap
+from ldap.controls import SimplePagedResultsControl
 from ldap.filter import escape_filter_chars
 
 from wazo_dird import BaseSourcePlugin, make_result_class
-from wazo_dird.helpers import BaseBackendView
+from wazo_dird.helpers import BackendViewDependencies, BaseBackendView
+from wazo_dird.plugin_manager import ViewDependencies
 from wazo_dird.plugins.base_plugins import SourceConfig, SourcePluginDependencies
 from wazo_dird.plugins.source_result import _SourceResult
 
-from . import http
+from . import http, replica
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,10 @@ class LDAPSourceConfig(SourceConfig, total=False):
     ldap_custom_filter: str | None
     ldap_network_timeout: float
     ldap_timeout: float
+    ldap_pool_size: int
+    max_results: int | None
+    ldap_replica: bool
+    ldap_replica_interval: float
     unique_column: str | None
     unique_column_format: str
 
@@ -41,12 +50,21 @@ class LDAPView(BaseBackendView):
     list_resource = http.LDAPList
     item_resource = http.LDAPItem
 
+    def load(self, dependencies: BackendViewDependencies) -> None:  # type: ignore[override]
+        super().load(dependencies)
+        view_dependencies = cast(ViewDependencies, dependencies)
+        view_dependencies['status_aggregator'].add_provider(replica.provide_status)
+
 
 class LDAPPlugin(BaseSourcePlugin):
+    # Maximum number of extens in the filter of a single match_all search
+    MATCH_ALL_CHUNK_SIZE = 50
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.ldap_factory = _LDAPFactory()
-        self._lock = threading.Lock()
+        self._replica: replica.LDAPReplica | None = None
+        self._stopped = threading.Event()
 
     def load(self, args: SourcePluginDependencies) -> None:
         config = cast(LDAPSourceConfig, args['config'])
@@ -54,22 +72,58 @@ class LDAPPlugin(BaseSourcePlugin):
         self._ldap_result_formatter = self.ldap_factory.new_ldap_result_formatter(
             self._ldap_config
         )
-        self._ldap_client = self.ldap_factory.new_ldap_client(self._ldap_config)
-        self._ldap_client.set_up()
+        self._ldap_pool = _LDAPClientPool(
+            self._ldap_config,
+            lambda: self.ldap_factory.new_ldap_client(self._ldap_config),
+        )
+        self._ldap_pool.set_up()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._ldap_config.ldap_pool_size(),
+            thread_name_prefix='ldap-match-all',
+        )
+        if self._ldap_config.ldap_replica():
+            self._start_replica()
+
+    def _start_replica(self) -> None:
+        columns = self._ldap_config.first_matched_columns()
+        if not columns:
+            logger.warning(
+                'LDAP "%s": no first_matched_columns, not replicating',
+                self._ldap_config.name(),
+            )
+            return
+        self._replica = replica.LDAPReplica(
+            self._ldap_config.uuid(),
+            self._ldap_config.name(),
+            columns,
+            self._ldap_config.build_replica_filter(),
+            self._ldap_pool,
+        )
+        replica.start_sync(
+            self._replica, self._stopped, self._ldap_config.ldap_replica_interval()
+        )
 
     def unload(self) -> None:
-        self._ldap_client.close()
+        self._stopped.set()
+        self._executor.shutdown()
+        self._ldap_pool.close()
 
     def search(
         self, term: str, args: dict[str, Any] | None = None
     ) -> list[_SourceResult]:
         filter_str = self._ldap_config.build_search_filter(term)
 
-        return self._search_and_format(filter_str)
+        return self._search_and_format(filter_str, self._ldap_config.max_results())
 
     def first_match(
         self, term: str, args: dict[str, Any] | None = None
     ) -> _SourceResult | None:
+        if self._replica and self._replica.ready:
+            attrs = self._replica.first_match(term)
+            if attrs is None:
+                return None
+            return self._ldap_result_formatter.format_one_result(attrs)
+
         filter_str = self._ldap_config.build_first_match_filter(term)
 
         return self._first_match_and_format(filter_str)
@@ -80,27 +134,53 @@ class LDAPPlugin(BaseSourcePlugin):
         results: dict[str, _SourceResult] = {}
         columns = self._ldap_config.first_matched_columns()
         logger.debug('Looking for columns (%s) with (%s)', columns, extens)
-        filter_str = self._ldap_config.build_match_all_filter(extens)
-        entries = self._match_all_and_format(filter_str)
+        if self._replica and self._replica.ready:
+            return {
+                exten: self._ldap_result_formatter.format_one_result(attrs)
+                for exten, attrs in self._replica.match_all(extens).items()
+            }
+
+        extens = list(dict.fromkeys(extens))
+        size = self.MATCH_ALL_CHUNK_SIZE
+        chunks = [extens[i : i + size] for i in range(0, len(extens), size)]
+        if len(chunks) > 1:
+            # each chunk is searched on its own pooled connection
+            entries = list(
+                itertools.chain.from_iterable(
+                    self._executor.map(self._match_all_chunk, chunks)
+                )
+            )
+        else:
+            entries = self._match_all_chunk(extens)
+
+        wanted = set(extens)
         for column in columns:
             for entry in entries:
                 term = entry.fields.get(column)
-                if term in extens:
+                if term in wanted:
                     results[term] = entry
                     logger.debug('Found a match: %s', entry)
         if not results:
             logger.debug('Found no match')
         return results
 
-    def _search_and_format(self, filter_str: str | None) -> list[_SourceResult]:
-        with self._lock:
-            raw_results = self._ldap_client.search(filter_str)
+    def _match_all_chunk(self, extens: list[str]) -> list[_SourceResult]:
+        filter_str = self._ldap_config.build_match_all_filter(extens)
+        return self._match_all_and_format(filter_str)
 
-        return self._ldap_result_formatter.format(raw_results)
+    def _search_and_format(
+        self, filter_str: str | None, max_results: int | None = None
+    ) -> list[_SourceResult]:
+        results = []
+        with self._ldap_pool.client() as client:
+            for page in client.search_pages(filter_str, max_results or -1):
+                results.extend(self._ldap_result_formatter.format(page))
+
+        return results
 
     def _first_match_and_format(self, filter_str: str | None) -> _SourceResult | None:
-        with self._lock:
-            raw_results = self._ldap_client.search(filter_str, 1)
+        with self._ldap_pool.client() as client:
+            raw_results = client.search(filter_str, 1)
 
         if not raw_results:
             return None
@@ -111,8 +191,8 @@ class LDAPPlugin(BaseSourcePlugin):
         return self._ldap_result_formatter.format_one_result(attrs)
 
     def _match_all_and_format(self, filter_str: str | None) -> list[_SourceResult]:
-        with self._lock:
-            raw_results = self._ldap_client.search(filter_str)
+        with self._ldap_pool.client() as client:
+            raw_results = client.search(filter_str)
 
         results = []
         for dn, attrs in raw_results:
@@ -154,6 +234,8 @@ class _LDAPConfig:
     DEFAULT_LDAP_PASSWORD = ''
     DEFAULT_LDAP_NETWORK_TIMEOUT = 0.3
     DEFAULT_LDAP_TIMEOUT = 1.0
+    DEFAULT_LDAP_POOL_SIZE = 4
+    DEFAULT_LDAP_REPLICA_INTERVAL = 300.0
 
     def __init__(self, config: LDAPSourceConfig):
         if not config.get('ldap_custom_filter') and not config.get('searched_columns'):
@@ -167,6 +249,9 @@ class _LDAPConfig:
     def has_binary_uuid(self) -> bool:
         return self._config.get('unique_column_format', 'string') == 'binary_uuid'
 
+    def uuid(self) -> str:
+        return self._config['uuid']
+
     def name(self) -> str:
         return self._config['name']
 
@@ -202,6 +287,20 @@ class _LDAPConfig:
     def ldap_timeout(self) -> float:
         return self._config.get('ldap_timeout', self.DEFAULT_LDAP_TIMEOUT)
 
+    def ldap_pool_size(self) -> int:
+        return self._config.get('ldap_pool_size', self.DEFAULT_LDAP_POOL_SIZE)
+
+    def max_results(self) -> int | None:
+        return self._config.get('max_results')
+
+    def ldap_replica(self) -> bool:
+        return self._config.get('ldap_replica', False)
+
+    def ldap_replica_interval(self) -> float:
+        return self._config.get(
+            'ldap_replica_interval', self.DEFAULT_LDAP_REPLICA_INTERVAL
+        )
+
     def attributes(self) -> list[str] | None:
         format_columns = self._config.get('format_columns')
         if not format_columns:
@@ -265,6 +364,19 @@ class _LDAPConfig:
                 filters.append(filter_)
         return self._build_filter_from_list(filters)
 
+    def build_replica_filter(self) -> str:
+        # Every entry having one of the first matched columns, the term of the
+        # custom filter matching any value
+        generated_filter = self._build_filter_from_list(
+            [f'({attr}=*)' for attr in self.first_matched_columns()]
+        )
+        custom_filter = self._config.get('ldap_custom_filter')
+        if not custom_filter:
+            return generated_filter
+        return self._build_filter_from_custom_and_generated_filter(
+            re.sub(r'\*?%Q\*?', '*', custom_filter), generated_filter
+        )
+
     def _build_filter_from_custom_and_generated_filter(
         self, custom_filter: str, generated_filter: str
     ) -> str:
@@ -321,6 +433,8 @@ class _LDAPConfig:
 
 
 class _LDAPClient:
+    PAGE_SIZE = 500
+
     def __init__(
         self,
         ldap_config: _LDAPConfig,
@@ -332,6 +446,7 @@ class _LDAPClient:
         self._name = self._ldap_config.name()
         self._base_dn = self._ldap_config.ldap_base_dn()
         self._attributes = self._ldap_config.attributes()
+        self.last_search_failed = False
 
     def close(self) -> None:
         if self._is_set_up():
@@ -373,52 +488,202 @@ class _LDAPClient:
         self._ldap_obj.unbind_s()
         self._ldap_obj = None
 
+    def check(self) -> None:
+        # Drop a connection closed by the server, the next search will rebind
+        if not self._is_set_up():
+            return
+        try:
+            self._ldap_obj.whoami_s()
+        except ldap.LDAPError as e:
+            logger.info('LDAP "%s": connection lost: %r', self._name, e)
+            self._tear_down()
+
     def search(self, filter_str: str | None, limit: int = -1) -> Any:
+        results = []
+        for page in self.search_pages(filter_str, limit):
+            results.extend(page)
+        return results
+
+    def search_pages(
+        self,
+        filter_str: str | None,
+        limit: int = -1,
+        extra_attributes: list[str] | None = None,
+    ) -> Iterator[Any]:
+        # Reads at most `limit` entries, -1 meaning all of them
+        self.last_search_failed = False
         if self._is_set_up():
             retry = True
         else:
             self._set_up()
             if not self._is_set_up():
-                return []
+                self.last_search_failed = True
+                return
             retry = False
 
-        results = self._search(filter_str, limit)
-        if not self._is_set_up() and retry:
+        attributes = self._attributes
+        if extra_attributes:
+            attributes = (attributes or ['*']) + extra_attributes
+
+        found = False
+        for page in self._search(filter_str, limit, attributes):
+            found = True
+            yield page
+        if not self._is_set_up() and retry and not found:
             self._set_up()
             if not self._is_set_up():
-                return []
-            results = self._search(filter_str, limit)
-
-        return results
-
-    def _search(self, filter_str: str | None, limit: int) -> Any:
-        results = []
+                self.last_search_failed = True
+                return
+            yield from self._search(filter_str, limit, attributes)
+
+    def _search(
+        self, filter_str: str | None, limit: int, attributes: list[str] | None
+    ) -> Iterator[Any]:
+        # Not critical: servers without paging support return everything at once
+        control = SimplePagedResultsControl(False, size=self.PAGE_SIZE, cookie='')
+        remaining = limit
+        msgid = None
+        self.last_search_failed = False
 
         try:
-            results = self._ldap_obj.search_ext_s(
-                self._base_dn,
-                ldap.SCOPE_SUBTREE,
-                filter_str,
-                self._attributes,
-                sizelimit=limit,
-            )
+            while True:
+                if limit > 0:
+                    control.size = min(self.PAGE_SIZE, remaining)
+                msgid = self._search_page(filter_str, attributes, control)
+                _, page, _, response_controls = self._ldap_obj.result3(
+                    msgid, timeout=self._ldap_config.ldap_timeout()
+                )
+                msgid = None
+                control.cookie = self._next_cookie(response_controls)
+                if limit > 0:
+                    page = page[:remaining]
+                    remaining -= len(page)
+                yield page
+
+                if not control.cookie:
+                    return
+                if limit > 0 and remaining <= 0:
+                    self._end_paged_search(filter_str, attributes, control)
+                    return
         except ldap.FILTER_ERROR:
+            self.last_search_failed = True
             logger.warning(
                 'LDAP "%s": search error: invalid filter "%s"', self._name, filter_str
             )
         except ldap.NO_SUCH_OBJECT:
+            self.last_search_failed = True
             logger.warning(
                 'LDAP "%s": search error: no such object "%s"',
                 self._name,
                 self._ldap_config.ldap_base_dn(),
             )
+        except ldap.SIZELIMIT_EXCEEDED:
+            self.last_search_failed = True
+            logger.warning('LDAP "%s": search error: size limit exceeded', self._name)
         except ldap.TIMEOUT:
+            self.last_search_failed = True
             logger.warning('LDAP "%s": search error: timed out', self._name)
+            if msgid is not None:
+                self._abandon(msgid)
         except ldap.LDAPError as e:
+            self.last_search_failed = True
             logger.error('LDAP "%s": search error: %r', self._name, e)
             self._tear_down()
 
-        return results
+    def _search_page(
+        self,
+        filter_str: str | None,
+        attributes: list[str] | None,
+        control: SimplePagedResultsControl,
+    ) -> int:
+        return self._ldap_obj.search_ext(
+            self._base_dn,
+            ldap.SCOPE_SUBTREE,
+            filter_str,
+            attributes,
+            serverctrls=[control],
+        )
+
+    @staticmethod
+    def _next_cookie(response_controls: list[Any] | None) -> bytes | str:
+        for control in response_controls or []:
+            if control.controlType == SimplePagedResultsControl.controlType:
+                return control.cookie
+        return ''
+
+    def _end_paged_search(
+        self,
+        filter_str: str | None,
+        attributes: list[str] | None,
+        control: SimplePagedResultsControl,
+    ) -> None:
+        # A page size of 0 lets the server release the state of the search
+        control.size = 0
+        try:
+            msgid = self._search_page(filter_str, attributes, control)
+            self._ldap_obj.result3(msgid, timeout=self._ldap_config.ldap_timeout())
+        except ldap.LDAPError as e:
+            logger.debug('LDAP "%s": failed to end paged search: %r', self._name, e)
+
+    def _abandon(self, msgid: int) -> None:
+        try:
+            self._ldap_obj.abandon(msgid)
+        except ldap.LDAPError as e:
+            logger.debug('LDAP "%s": failed to abandon search: %r', self._name, e)
+
+
+class _LDAPClientPool:
+    # Idle connections are checked before being reused after this many seconds
+    HEALTH_CHECK_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        ldap_config: _LDAPConfig,
+        client_factory: Callable[[], _LDAPClient],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._client_factory = client_factory
+        self._clock = clock
+        self._available = threading.BoundedSemaphore(ldap_config.ldap_pool_size())
+        self._lock = threading.Lock()
+        self._clients: list[_LDAPClient] = []
+        # most recently used last, with the time they were released
+        self._idle: list[tuple[_LDAPClient, float]] = []
+
+    def set_up(self) -> None:
+        client = self._new_client()
+        client.set_up()
+        self._idle.append((client, self._clock()))
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self._clients, self._idle = self._clients, [], []
+        for client in clients:
+            client.close()
+
+    @contextmanager
+    def client(self) -> Iterator[_LDAPClient]:
+        with self._available:
+            client = self._checkout()
+            try:
+                yield client
+            finally:
+                with self._lock:
+                    self._idle.append((client, self._clock()))
+
+    def _checkout(self) -> _LDAPClient:
+        with self._lock:
+            if not self._idle:
+                return self._new_client()
+            client, released_at = self._idle.pop()
+        if self._clock() - released_at >= self.HEALTH_CHECK_INTERVAL:
+            client.check()
+        return client
+
+    def _new_client(self) -> _LDAPClient:
+        client = self._client_factory()
+        self._clients.append(client)
+        return client
 
 
 class _LDAPResultFormatter:
@@ -0,0 +1,197 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from xivo.status import Status, StatusDict
+
+if TYPE_CHECKING:
+    from .plugin import _LDAPClientPool
+
+logger = logging.getLogger(__name__)
+
+MODIFY_TIMESTAMP = 'modifyTimestamp'
+
+# dn -> attributes as returned by python-ldap
+Entries = dict[str, dict[str, list[bytes]]]
+# column -> value -> attributes
+Index = dict[str, dict[str, dict[str, list[bytes]]]]
+
+_replicas: weakref.WeakSet[LDAPReplica] = weakref.WeakSet()
+
+# Spaces and hyphens are ignored by telephoneNumberMatch
+_IGNORED_CHARACTERS = str.maketrans('', '', ' -')
+
+
+def _normalize(value: str) -> str:
+    """Approximate the equality matching rules of the replicated attributes
+
+    Separators are ignored like telephoneNumberMatch does and the case is
+    folded like caseIgnoreMatch does, so that the replica matches the same
+    entries as an equality filter.
+    """
+    return value.translate(_IGNORED_CHARACTERS).casefold()
+
+
+class LDAPReplica:
+    """Local copy of the entries of an LDAP source, indexed by the normalized
+    values of the first matched columns
+
+    The first sync copies every entry matching `filter_str`, later syncs only
+    fetch the entries whose modifyTimestamp changed since the most recent one
+    seen. Deleted entries are only noticed by a full sync, done every
+    `FULL_SYNC_EVERY` syncs. The index is replaced at once after each sync,
+    lookups see the previous or the new content but never a partial one.
+    """
+
+    FULL_SYNC_EVERY = 12
+
+    def __init__(
+        self,
+        source_uuid: str,
+        name: str,
+        columns: list[str],
+        filter_str: str,
+        pool: _LDAPClientPool,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.source_uuid = source_uuid
+        self.name = name
+        self._columns = columns
+        self._filter = filter_str
+        self._pool = pool
+        self._clock = clock
+        self._entries: Entries = {}
+        self._index: Index = {}
+        self._last_modified: str | None = None
+        self._syncs = 0
+        self.synced_at: float | None = None
+        self.last_sync_failed = False
+        _replicas.add(self)
+
+    @property
+    def ready(self) -> bool:
+        return self.synced_at is not None
+
+    def first_match(self, term: str) -> dict[str, list[bytes]] | None:
+        index = self._index
+        key = _normalize(term)
+        for column in self._columns:
+            attrs = index.get(column, {}).get(key)
+            if attrs is not None:
+                return attrs
+        return None
+
+    def match_all(self, extens: list[str]) -> dict[str, dict[str, list[bytes]]]:
+        index = self._index
+        keys = [(exten, _normalize(exten)) for exten in extens]
+        results = {}
+        for column in self._columns:
+            values = index.get(column, {})
+            for exten, key in keys:
+                attrs = values.get(key)
+                if attrs is not None:
+                    results[exten] = attrs
+        return results
+
+    def sync(self) -> None:
+        full = self._last_modified is None or self._syncs % self.FULL_SYNC_EVERY == 0
+        if full:
+            filter_str = self._filter
+        else:
+            filter_str = f'(&{self._filter}({MODIFY_TIMESTAMP}>={self._last_modified}))'
+
+        with self._pool.client() as client:
+            pages = list(client.search_pages(filter_str, -1, [MODIFY_TIMESTAMP]))
+            self.last_sync_failed = client.last_search_failed
+        if self.last_sync_failed:
+            logger.warning('LDAP "%s": replica sync failed', self.name)
+            return
+
+        entries: Entries = {} if full else dict(self._entries)
+        last_modified = None if full else self._last_modified
+        for page in pages:
+            for dn, attrs in page:
+                if not dn:
+                    continue
+                modified = attrs.pop(MODIFY_TIMESTAMP, [b''])[0].decode()
+                if modified and (last_modified is None or modified > last_modified):
+                    last_modified = modified
+                entries[dn] = attrs
+
+        self._entries = entries
+        self._index = self._build_index(entries)
+        self._last_modified = last_modified
+        self._syncs += 1
+        self.synced_at = self._clock()
+        logger.debug(
+            'LDAP "%s": %s replica sync, %d entries',
+            self.name,
+            'full' if full else 'incremental',
+            len(entries),
+        )
+
+    def _build_index(self, entries: Entries) -> Index:
+        index: Index = {column: {} for column in self._columns}
+        for attrs in entries.values():
+            for column in self._columns:
+                for value in attrs.get(column, []):
+                    key = _normalize(value.decode('utf-8', 'replace'))
+                    index[column].setdefault(key, attrs)
+        return index
+
+    def status(self) -> dict[str, Any]:
+        synced_at = self.synced_at
+        return {
+            'name': self.name,
+            'entries': len(self._entries),
+            'synced': synced_at is not None,
+            'lag': None if synced_at is None else round(self._clock() - synced_at, 1),
+            'last_sync_failed': self.last_sync_failed,
+        }
+
+
+def start_sync(replica: LDAPReplica, stopped: threading.Event, interval: float) -> None:
+    thread = threading.Thread(
+        target=_sync_replica,
+        args=(weakref.ref(replica), stopped, interval),
+        name=f'ldap-replica-{replica.name}',
+    )
+    thread.daemon = True
+    thread.start()
+
+
+def _sync_replica(
+    replica_ref: weakref.ref[LDAPReplica], stopped: threading.Event, interval: float
+) -> None:
+    # Only a weak reference is kept, sources invalidated without being unloaded
+    # stop their replica once garbage collected
+    while True:
+        replica = replica_ref()
+        if replica is None:
+            return
+        try:
+            replica.sync()
+        except Exception:
+            logger.exception('LDAP "%s": replica sync failed', replica.name)
+        del replica
+        if stopped.wait(interval):
+            return
+
+
+def provide_status(status: StatusDict) -> None:
+    replicas = list(_replicas)
+    if not replicas:
+        return
+    failed = any(replica.last_sync_failed for replica in replicas)
+    status['ldap_replicas'] = {
+        'status': Status.fail if failed else Status.ok,
+        'sources': {replica.source_uuid: replica.status() for replica in replicas},
+    }
@@ -1,4 +1,4 @@
-# Copyright 2019-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2019-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo.mallow import fields
@@ -18,6 +18,12 @@ class SourceSchema(BaseSourceSchema):
     )
     ldap_network_timeout = fields.Float(validate=Range(min=0), dump_default=0.3)
     ldap_timeout = fields.Float(validate=Range(min=0), dump_default=1.0)
+    ldap_pool_size = fields.Integer(validate=Range(min=1, max=64), dump_default=4)
+    max_results = fields.Integer(
+        validate=Range(min=1), allow_none=True, load_default=None
+    )
+    ldap_replica = fields.Boolean(dump_default=False)
+    ldap_replica_interval = fields.Float(validate=Range(min=10), dump_default=300.0)
     unique_column = fields.String(
         validate=Length(min=1, max=128), allow_none=True, load_default=None
     )
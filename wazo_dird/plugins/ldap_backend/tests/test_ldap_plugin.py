@@ -1,14 +1,16 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import os
+import threading
 import unittest
 import uuid
 from typing import cast
-from unittest.mock import ANY, Mock, call, sentinel
+from unittest.mock import ANY, Mock, call, patch, sentinel
 
 import ldap
 from hamcrest import assert_that, contains_inanyorder
+from ldap.controls import SimplePagedResultsControl
 from ldap.ldapobject import LDAPObject
 
 from wazo_dird.plugins.base_plugins import BaseSourcePlugin, SourcePluginDependencies
@@ -18,6 +20,7 @@ from ..plugin import (
     LDAPPlugin,
     LDAPSourceConfig,
     _LDAPClient,
+    _LDAPClientPool,
     _LDAPConfig,
     _LDAPFactory,
     _LDAPResultFormatter,
@@ -28,6 +31,8 @@ class TestLDAPPlugin(unittest.TestCase):
     def setUp(self):
         self.config = cast(SourcePluginDependencies, {'config': sentinel})
         self.ldap_config = Mock(_LDAPConfig)
+        self.ldap_config.ldap_pool_size.return_value = 1
+        self.ldap_config.ldap_replica.return_value = False
         self.ldap_result_formatter = Mock(_LDAPResultFormatter)
         self.ldap_client = Mock(_LDAPClient)
         self.ldap_factory = Mock(_LDAPFactory)
@@ -58,18 +63,32 @@ class TestLDAPPlugin(unittest.TestCase):
     def test_search(self):
         term = 'foobar'
         self.ldap_config.build_search_filter.return_value = sentinel.filter
-        self.ldap_client.search.return_value = sentinel.search_result
-        self.ldap_result_formatter.format.return_value = sentinel.format_result
+        self.ldap_config.max_results.return_value = None
+        self.ldap_client.search_pages.return_value = [sentinel.page_1, sentinel.page_2]
+        self.ldap_result_formatter.format.side_effect = [
+            [sentinel.result_1],
+            [sentinel.result_2],
+        ]
 
         self.ldap_plugin.load(self.config)
         result = self.ldap_plugin.search(term)
 
         self.ldap_config.build_search_filter.assert_called_once_with(term)
-        self.ldap_client.search.assert_called_once_with(sentinel.filter)
-        self.ldap_result_formatter.format.assert_called_once_with(
-            sentinel.search_result
+        self.ldap_client.search_pages.assert_called_once_with(sentinel.filter, -1)
+        self.ldap_result_formatter.format.assert_has_calls(
+            [call(sentinel.page_1), call(sentinel.page_2)]
         )
-        self.assertIs(result, sentinel.format_result)
+        self.assertEqual(result, [sentinel.result_1, sentinel.result_2])
+
+    def test_search_max_results(self):
+        self.ldap_config.build_search_filter.return_value = sentinel.filter
+        self.ldap_config.max_results.return_value = 10
+        self.ldap_client.search_pages.return_value = []
+
+        self.ldap_plugin.load(self.config)
+        self.ldap_plugin.search('foobar')
+
+        self.ldap_client.search_pages.assert_called_once_with(sentinel.filter, 10)
 
     def test_first_match(self):
         exten = '123456'
@@ -125,6 +144,54 @@ class TestLDAPPlugin(unittest.TestCase):
         self.ldap_result_formatter.format_one_result.assert_has_calls(calls)
         self.assertEqual(result, {'123': format_result, '456': format_result})
 
+    def test_match_all_in_chunks(self):
+        self.ldap_plugin.MATCH_ALL_CHUNK_SIZE = 2
+        extens = ['1', '2', '3', '1']
+        self.ldap_config.first_matched_columns.return_value = ['number']
+        self.ldap_config.build_match_all_filter.side_effect = lambda extens: ','.join(
+            extens
+        )
+        self.ldap_client.search.side_effect = lambda filter_str: [
+            (exten, exten) for exten in filter_str.split(',')
+        ]
+        self.ldap_result_formatter.format_one_result.side_effect = lambda exten: Mock(
+            fields={'number': exten}
+        )
+
+        self.ldap_plugin.load(self.config)
+        result = self.ldap_plugin.match_all(extens)
+        self.ldap_plugin.unload()
+
+        self.ldap_config.build_match_all_filter.assert_has_calls(
+            [call(['1', '2']), call(['3'])], any_order=True
+        )
+        self.assertEqual(sorted(result), ['1', '2', '3'])
+        self.assertEqual(result['3'].fields, {'number': '3'})
+
+    def test_reverse_lookups_use_the_synced_replica(self):
+        self.ldap_config.ldap_replica.return_value = True
+        self.ldap_config.first_matched_columns.return_value = ['telephoneNumber']
+        self.ldap_config.ldap_replica_interval.return_value = 300
+        self.ldap_client.search_pages.return_value = [
+            [('cn=alice', {'telephoneNumber': [b'1001']})]
+        ]
+        self.ldap_client.last_search_failed = False
+        self.ldap_result_formatter.format_one_result.side_effect = lambda attrs: attrs
+
+        with patch('wazo_dird.plugins.ldap_backend.replica.start_sync') as start_sync:
+            self.ldap_plugin.load(self.config)
+        replica = start_sync.call_args[0][0]
+        replica.sync()
+        self.ldap_client.search.reset_mock()
+
+        result = self.ldap_plugin.first_match('1001')
+        results = self.ldap_plugin.match_all(['1001', '1002'])
+        self.ldap_plugin.unload()
+
+        self.assertEqual(result, {'telephoneNumber': [b'1001']})
+        self.assertEqual(results, {'1001': {'telephoneNumber': [b'1001']}})
+        self.ldap_client.search.assert_not_called()
+
     def test_list_empty(self):
         uids: list[str] = []
         self.ldap_config.build_list_filter.return_value = None
@@ -139,18 +206,18 @@ class TestLDAPPlugin(unittest.TestCase):
     def test_list_with_uids(self):
         uids = ['123', '456']
         self.ldap_config.build_list_filter.return_value = sentinel.filter
-        self.ldap_client.search.return_value = sentinel.search_result
-        self.ldap_result_formatter.format.return_value = sentinel.format_result
+        self.ldap_client.search_pages.return_value = [sentinel.search_result]
+        self.ldap_result_formatter.format.return_value = [sentinel.format_result]
 
         self.ldap_plugin.load(self.config)
         result = self.ldap_plugin.list(uids)
 
         self.ldap_config.build_list_filter.assert_called_once_with(uids)
-        self.ldap_client.search.assert_called_once_with(sentinel.filter)
+        self.ldap_client.search_pages.assert_called_once_with(sentinel.filter, -1)
         self.ldap_result_formatter.format.assert_called_once_with(
             sentinel.search_result
         )
-        self.assertIs(result, sentinel.format_result)
+        self.assertEqual(result, [sentinel.format_result])
 
     def test_list_no_unique_column(self):
         uids = ['123', '456']
@@ -314,6 +381,31 @@ class TestLDAPConfig(unittest.TestCase):
 
         self.assertEqual(_LDAPConfig.DEFAULT_LDAP_TIMEOUT, ldap_config.ldap_timeout())
 
+    def test_ldap_pool_size(self):
+        ldap_config = self.new_ldap_config({'ldap_pool_size': 8})
+
+        self.assertEqual(8, ldap_config.ldap_pool_size())
+
+    def test_ldap_pool_size_when_absent(self):
+        ldap_config = self.new_ldap_config({})
+
+        self.assertEqual(
+            _LDAPConfig.DEFAULT_LDAP_POOL_SIZE, ldap_config.ldap_pool_size()
+        )
+
+    def test_build_replica_filter(self):
+        ldap_config = self.new_ldap_config(
+            {
+                'first_matched_columns': ['telephoneNumber', 'mobile'],
+                'ldap_custom_filter': '(&(objectClass=person)(cn=*%Q*))',
+            }
+        )
+
+        self.assertEqual(
+            '(&(&(objectClass=person)(cn=*))(|(telephoneNumber=*)(mobile=*)))',
+            ldap_config.build_replica_filter(),
+        )
+
     def test_attributes_with_nothing(self):
         ldap_config = self.new_ldap_config({})
 
@@ -540,43 +632,170 @@ class TestLDAPClient(unittest.TestCase):
         self.ldap_obj.unbind_s.assert_called_once_with()
 
     def test_search(self):
-        self.ldap_obj.search_ext_s.return_value = sentinel
+        self.ldap_obj.result3.return_value = (ANY, [sentinel.entry], ANY, [])
 
         result = self.ldap_client.search('foo')
 
-        self.ldap_obj.search_ext_s.assert_called_once_with(
-            self.base_dn, ANY, 'foo', self.attributes, sizelimit=-1
+        self.ldap_obj.search_ext.assert_called_once_with(
+            self.base_dn, ANY, 'foo', self.attributes, serverctrls=[ANY]
         )
         self.assertEqual(1, self.ldap_obj_factory.call_count)
-        self.assertIs(result, sentinel)
+        self.assertEqual(result, [sentinel.entry])
+
+    def test_search_pages(self):
+        requests = self._record_page_requests()
+        self.ldap_obj.result3.side_effect = [
+            (ANY, [sentinel.entry_1], ANY, [self._paged_control(b'next')]),
+            (ANY, [sentinel.entry_2], ANY, [self._paged_control(b'')]),
+        ]
+
+        pages = list(self.ldap_client.search_pages('foo'))
+
+        self.assertEqual(pages, [[sentinel.entry_1], [sentinel.entry_2]])
+        self.assertEqual(requests, [(500, ''), (500, b'next')])
+
+    def test_search_pages_stops_at_the_limit(self):
+        requests = self._record_page_requests()
+        self.ldap_obj.result3.side_effect = [
+            (
+                ANY,
+                [sentinel.entry_1, sentinel.entry_2],
+                ANY,
+                [self._paged_control(b'next')],
+            ),
+            (ANY, [], ANY, []),
+        ]
+
+        pages = list(self.ldap_client.search_pages('foo', 2))
+
+        self.assertEqual(pages, [[sentinel.entry_1, sentinel.entry_2]])
+        # the last request lets the server release the search
+        self.assertEqual(requests, [(2, ''), (0, b'next')])
+
+    def _paged_control(self, cookie):
+        return SimplePagedResultsControl(False, size=0, cookie=cookie)
+
+    def _record_page_requests(self):
+        requests = []
+
+        def search_ext(*args, serverctrls):
+            control = serverctrls[0]
+            requests.append((control.size, control.cookie))
+            return len(requests)
+
+        self.ldap_obj.search_ext.side_effect = search_ext
+        return requests
 
     def test_search_on_filter_error(self):
-        self.ldap_obj.search_ext_s.side_effect = ldap.FILTER_ERROR('moo')
+        self.ldap_obj.search_ext.side_effect = ldap.FILTER_ERROR('moo')
 
         self.ldap_client.set_up()
         result = self.ldap_client.search('foo')
 
         self.assertEqual(result, [])
         self.assertEqual(1, self.ldap_obj_factory.call_count)
-        self.assertEqual(1, self.ldap_obj.search_ext_s.call_count)
+        self.assertEqual(1, self.ldap_obj.search_ext.call_count)
 
     def test_search_on_server_down_error(self):
-        self.ldap_obj.search_ext_s.side_effect = ldap.SERVER_DOWN('moo')
+        self.ldap_obj.result3.side_effect = ldap.SERVER_DOWN('moo')
 
         self.ldap_client.set_up()
         result = self.ldap_client.search('foo')
 
         self.assertEqual(result, [])
         self.assertEqual(2, self.ldap_obj_factory.call_count)
-        self.assertEqual(2, self.ldap_obj.search_ext_s.call_count)
+        self.assertEqual(2, self.ldap_obj.search_ext.call_count)
 
     def test_multiple_search(self):
+        self.ldap_obj.result3.return_value = (ANY, [], ANY, [])
         self.ldap_client.search('foo')
         self.ldap_client.search('bar')
         self.ldap_client.search('foobar')
 
         self.assertEqual(1, self.ldap_obj.simple_bind_s.call_count)
-        self.assertEqual(3, self.ldap_obj.search_ext_s.call_count)
+        self.assertEqual(3, self.ldap_obj.search_ext.call_count)
+
+    def test_check_drops_a_lost_connection(self):
+        self.ldap_obj.whoami_s.side_effect = ldap.SERVER_DOWN('moo')
+        self.ldap_client.set_up()
+
+        self.ldap_client.check()
+        self.ldap_client.search('foo')
+
+        self.ldap_obj.unbind_s.assert_called_once_with()
+        self.assertEqual(2, self.ldap_obj.simple_bind_s.call_count)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLDAPClientPool(unittest.TestCase):
+    def setUp(self):
+        self.ldap_config = Mock(_LDAPConfig)
+        self.ldap_config.ldap_pool_size.return_value = 2
+        self.clock = FakeClock()
+        self.client_factory = Mock(side_effect=lambda: Mock(_LDAPClient))
+        self.pool = _LDAPClientPool(self.ldap_config, self.client_factory, self.clock)
+
+    def test_concurrent_searches_use_distinct_clients(self):
+        with self.pool.client() as client_1, self.pool.client() as client_2:
+            self.assertIsNot(client_1, client_2)
+
+        self.assertEqual(2, self.client_factory.call_count)
+
+    def test_clients_are_reused(self):
+        with self.pool.client() as client_1:
+            pass
+        with self.pool.client() as client_2:
+            pass
+
+        self.assertIs(client_1, client_2)
+        client_2.check.assert_not_called()
+
+    def test_idle_clients_are_checked_before_reuse(self):
+        with self.pool.client() as client:
+            pass
+        self.clock.now = _LDAPClientPool.HEALTH_CHECK_INTERVAL
+
+        with self.pool.client():
+            pass
+
+        client.check.assert_called_once_with()
+
+    def test_size_is_bounded(self):
+        waiting = threading.Event()
+        got_client = threading.Event()
+
+        def search():
+            waiting.set()
+            with self.pool.client():
+                got_client.set()
+
+        with self.pool.client(), self.pool.client():
+            thread = threading.Thread(target=search)
+            thread.start()
+            waiting.wait()
+            self.assertFalse(got_client.wait(0.05))
+        thread.join()
+
+        self.assertTrue(got_client.is_set())
+        self.assertEqual(2, self.client_factory.call_count)
+
+    def test_close(self):
+        self.pool.set_up()
+        with self.pool.client() as client_1, self.pool.client() as client_2:
+            pass
+
+        self.pool.close()
+
+        client_1.set_up.assert_called_once_with()
+        client_1.close.assert_called_once_with()
+        client_2.close.assert_called_once_with()
 
 
 class TestLDAPResultFormatter(unittest.TestCase):
@@ -0,0 +1,141 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from contextlib import contextmanager
+from unittest.mock import Mock
+
+from hamcrest import assert_that, equal_to, has_entries, has_entry, none
+from xivo.status import Status
+
+from ..replica import MODIFY_TIMESTAMP, LDAPReplica, provide_status
+
+SOURCE_UUID = '9a6c4bb0-3e53-4ba6-ae17-9e3ae5a84e1a'
+
+
+class FakePool:
+    def __init__(self):
+        self.client_ = Mock(last_search_failed=False)
+
+    @contextmanager
+    def client(self):
+        yield self.client_
+
+
+def _entry(dn, number, modified):
+    return (dn, {'telephoneNumber': [number], MODIFY_TIMESTAMP: [modified]})
+
+
+class TestLDAPReplica(unittest.TestCase):
+    def setUp(self):
+        self.pool = FakePool()
+        self.search_pages = self.pool.client_.search_pages
+        self.now = 100.0
+        self.replica = LDAPReplica(
+            SOURCE_UUID,
+            'my-ldap',
+            ['telephoneNumber', 'mobile'],
+            '(telephoneNumber=*)',
+            self.pool,
+            clock=lambda: self.now,
+        )
+
+    def test_not_ready_before_the_first_sync(self):
+        assert not self.replica.ready
+        assert_that(self.replica.status(), has_entries(synced=False, lag=none()))
+
+    def test_full_sync(self):
+        self.search_pages.return_value = [
+            [_entry('cn=alice', b'1001', b'20260101000000Z'), (None, ['referral'])],
+            [_entry('cn=bob', b'1002', b'20260102000000Z')],
+        ]
+
+        self.replica.sync()
+
+        self.search_pages.assert_called_once_with(
+            '(telephoneNumber=*)', -1, [MODIFY_TIMESTAMP]
+        )
+        assert self.replica.ready
+        assert_that(
+            self.replica.first_match('1001'), equal_to({'telephoneNumber': [b'1001']})
+        )
+        assert_that(self.replica.first_match('1003'), none())
+        assert_that(
+            self.replica.match_all(['1002', '1003']),
+            equal_to({'1002': {'telephoneNumber': [b'1002']}}),
+        )
+
+    def test_lookups_ignore_separators_and_case(self):
+        alice = {'telephoneNumber': [b'+33 1 23 45 67 89'], 'mobile': [b'Ext-12AB']}
+        self.search_pages.return_value = [
+            [('cn=alice', dict(alice, **{MODIFY_TIMESTAMP: [b'20260101000000Z']}))]
+        ]
+
+        self.replica.sync()
+
+        assert_that(self.replica.first_match('+33123456789'), equal_to(alice))
+        assert_that(self.replica.first_match('ext12ab'), equal_to(alice))
+        assert_that(
+            self.replica.match_all(['+33-1-23-45-67-89', '+33123456780']),
+            equal_to({'+33-1-23-45-67-89': alice}),
+        )
+
+    def test_incremental_sync(self):
+        self.search_pages.return_value = [
+            [_entry('cn=alice', b'1001', b'20260101000000Z')]
+        ]
+        self.replica.sync()
+        self.search_pages.return_value = [
+            [_entry('cn=alice', b'2001', b'20260103000000Z')]
+        ]
+
+        self.replica.sync()
+
+        self.search_pages.assert_called_with(
+            '(&(telephoneNumber=*)(modifyTimestamp>=20260101000000Z))',
+            -1,
+            [MODIFY_TIMESTAMP],
+        )
+        assert_that(self.replica.first_match('1001'), none())
+        assert_that(
+            self.replica.first_match('2001'), equal_to({'telephoneNumber': [b'2001']})
+        )
+        assert_that(self.replica.status(), has_entries(entries=1))
+
+    def test_failed_sync_keeps_the_content(self):
+        self.search_pages.return_value = [
+            [_entry('cn=alice', b'1001', b'20260101000000Z')]
+        ]
+        self.replica.sync()
+        self.pool.client_.last_search_failed = True
+        self.search_pages.return_value = []
+        self.now = 160.0
+
+        self.replica.sync()
+
+        assert_that(
+            self.replica.first_match('1001'), equal_to({'telephoneNumber': [b'1001']})
+        )
+        assert_that(
+            self.replica.status(),
+            has_entries(entries=1, lag=60.0, last_sync_failed=True),
+        )
+
+    def test_provide_status(self):
+        self.pool.client_.last_search_failed = True
+        self.search_pages.return_value = []
+        self.replica.sync()
+        status = {}
+
+        provide_status(status)
+
+        assert_that(
+            status['ldap_replicas'],
+            has_entries(
+                status=Status.fail,
+                sources=has_entry(
+                    SOURCE_UUID,
+                    has_entries(name='my-ldap', synced=False, last_sync_failed=True),
+                ),
+            ),
+        )
@@ -4,11 +4,17 @@
 from __future__ import annotations
 
 import logging
-from concurrent.futures import ALL_COMPLETED, Future, ThreadPoolExecutor, wait
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ALL_COMPLETED, Future, TimeoutError, as_completed, wait
 from time import perf_counter
-from typing import Any
+from typing import Any, Literal, NamedTuple, TypedDict
 
-from wazo_dird import BaseServicePlugin, BaseSourcePlugin, helpers
+from xivo.status import Status, StatusDict
+
+from wazo_dird import BaseServicePlugin, BaseSourcePlugin, helpers, metrics
+from wazo_dird.bulkhead import Bulkheads
+from wazo_dird.cache import SHARED_BACKENDS, TTLCache, new_cache
+from wazo_dird.circuit_breaker import CircuitBreakers
 from wazo_dird.helpers import ProfileConfig
 from wazo_dird.plugin_manager import ServiceDependencies
 from wazo_dird.plugins.source_result import _SourceResult as SourceResult
@@ -16,6 +22,61 @@ from wazo_dird.plugins.source_result import _SourceResult as SourceResult
 logger = logging.getLogger(__name__)
 timing_logger = logger.getChild('timing')
 
+# (source_uuid, backend, user_uuid, term)
+CacheKey = tuple[str, str, str | None, str]
+CachedLookup = tuple[BaseSourcePlugin, list[SourceResult]]
+
+
+class SourceLookup(NamedTuple):
+    source: str
+    results: list[SourceResult]
+    timed_out: bool = False
+    rejected: bool = False
+    circuit_open: bool = False
+
+
+class _LookupStart(NamedTuple):
+    cached: list[CachedLookup]
+    rejected: list[BaseSourcePlugin]
+    circuit_open: list[BaseSourcePlugin]
+    futures: list[Future[list[SourceResult]]]
+
+
+class SourceStatus(TypedDict):
+    source: str
+    backend: str
+    status: Literal['ok', 'error', 'timeout', 'rejected', 'circuit_open']
+    cached: bool
+    queue_ms: float | None
+    exec_ms: float | None
+    elapsed_ms: float
+
+
+class _SearchTiming:
+    def __init__(self, source: BaseSourcePlugin) -> None:
+        self.source = source.name
+        self.backend = source.backend
+        self.submitted_at = perf_counter()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.raised = False
+
+    def status(self, done: bool) -> SourceStatus:
+        now = perf_counter()
+        queue_ms = exec_ms = None
+        if self.started_at is not None:
+            queue_ms = _ms(self.started_at - self.submitted_at)
+            exec_ms = _ms((self.finished_at or now) - self.started_at)
+        return {
+            'source': self.source,
+            'backend': self.backend,
+            'status': 'timeout' if not done else 'error' if self.raised else 'ok',
+            'cached': False,
+            'queue_ms': queue_ms,
+            'exec_ms': exec_ms,
+            'elapsed_ms': _ms((self.finished_at or now) - self.submitted_at),
+        }
+
 
 class LookupServicePlugin(BaseServicePlugin):
     def __init__(self) -> None:
@@ -53,22 +114,84 @@ class _LookupService(helpers.BaseService):
         )
         max_workers = executor_workers if executor_workers is not None else http_threads
         logger.info('Creating Lookup service threadpool [max_workers=%d]', max_workers)
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._executor = metrics.InstrumentedThreadPoolExecutor(
+            self._service_name, max_workers=max_workers
+        )
+        self._bulkheads = Bulkheads(
+            self._config.get('lookup_service', {}).get('source_concurrency')
+        )
+        self._breakers = CircuitBreakers(
+            self._config.get('lookup_service', {}).get('circuit_breaker')
+        )
+        if self._breakers.enabled:
+            self._controller.status_aggregator.add_provider(
+                self.provide_circuit_breaker_status
+            )
+        self._cache: TTLCache[CacheKey, list[SourceResult]] | None = new_cache(
+            self._config.get('lookup_service', {}).get('cache')
+        )
+        if self._cache is not None:
+            self._source_manager.subscribe_to_invalidation(self._invalidate_cache)
+            self._controller.status_aggregator.add_provider(self.provide_status)
+
+    def provide_status(self, status: StatusDict) -> None:
+        assert self._cache
+        status['lookup_cache'] = {'status': Status.ok, **self._cache.stats()}
+
+    def provide_circuit_breaker_status(self, status: StatusDict) -> None:
+        status['lookup_circuit_breakers'] = {
+            'status': Status.ok,
+            'sources': self._breakers.status(),
+        }
+
+    def _invalidate_cache(
+        self,
+        source_uuid: str | None = None,
+        backend: str | None = None,
+        user_uuid: str | None = None,
+    ) -> None:
+        def matches(key: CacheKey) -> bool:
+            key_source_uuid, key_backend, key_user_uuid, _ = key
+            return (
+                source_uuid in (None, key_source_uuid)
+                and backend in (None, key_backend)
+                and user_uuid in (None, key_user_uuid)
+            )
+
+        assert self._cache
+        self._cache.invalidate(matches)
 
     def stop(self) -> None:
         self._executor.shutdown()
 
+    @staticmethod
+    def _cancel_pending(futures: Iterable[Future]) -> None:
+        pending = [f for f in futures if not f.done()]
+        cancelled = sum(1 for f in pending if f.cancel())
+        logger.debug('Cancelled %d/%d pending lookup tasks', cancelled, len(pending))
+
     def _async_search(
-        self, source: BaseSourcePlugin, term: str, args: dict[str, Any]
+        self,
+        source: BaseSourcePlugin,
+        term: str,
+        args: dict[str, Any],
+        cache_key: CacheKey | None = None,
     ) -> Future[list[SourceResult]]:
         raise_stopper: helpers.RaiseStopper[list[SourceResult]] = helpers.RaiseStopper(
             return_on_raise=[]
         )
-        submitted_at = perf_counter()
+        timing = _SearchTiming(source)
         future = self._executor.submit(
-            self._timed_search, raise_stopper, source, term, args, submitted_at
+            self._timed_search,
+            raise_stopper,
+            source,
+            term,
+            args,
+            timing,
+            cache_key,
         )
         setattr(future, 'name', source.name)
+        setattr(future, 'timing', timing)
         return future
 
     def _timed_search(
@@ -77,21 +200,92 @@ class _LookupService(helpers.BaseService):
         source: BaseSourcePlugin,
         term: str,
         args: dict[str, Any],
-        submitted_at: float,
+        timing: _SearchTiming,
+        cache_key: CacheKey | None = None,
     ) -> list[SourceResult]:
-        started_at = perf_counter()
+        timing.started_at = started_at = perf_counter()
         results = raise_stopper.execute(source.search, term, args)
-        finished_at = perf_counter()
+        timing.finished_at = finished_at = perf_counter()
+        timing.raised = raise_stopper.raised
+        metrics.observe_source_call(
+            self._service_name,
+            source,
+            started_at - timing.submitted_at,
+            finished_at - started_at,
+            raise_stopper.raised,
+        )
         timing_logger.debug(
             'lookup source=%s backend=%s queue_ms=%.1f exec_ms=%.1f results=%d',
             source.name,
             source.backend,
-            (started_at - submitted_at) * 1000,
+            (started_at - timing.submitted_at) * 1000,
             (finished_at - started_at) * 1000,
             len(results),
         )
+        # Kept even when the lookup timed out, the next one will not wait
+        if self._cache is not None and cache_key and not raise_stopper.raised:
+            self._cache.set(cache_key, results)
         return results
 
+    def _cache_key(
+        self,
+        source_uuid: str,
+        source: BaseSourcePlugin,
+        term: str,
+        user_uuid: str | None,
+    ) -> CacheKey | None:
+        if self._cache is None:
+            return None
+        backend = source.backend
+        if backend in SHARED_BACKENDS:
+            user_uuid = None
+        elif user_uuid is None:
+            return None
+        return (source_uuid, backend, user_uuid, term)
+
+    def _start_lookup(
+        self,
+        profile_config: ProfileConfig,
+        term: str,
+        user_uuid: str | None,
+        args: dict[str, Any],
+        token: str | None,
+    ) -> _LookupStart:
+        start = _LookupStart([], [], [], [])
+        sources = self.source_items_from_profile(profile_config)
+        for source_uuid, source in sources:
+            cache_key = self._cache_key(source_uuid, source, term, user_uuid)
+            if self._cache is not None and cache_key:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    start.cached.append((source, cached))
+                    continue
+
+            if not self._bulkheads.acquire(source_uuid, source.backend):
+                logger.warning(
+                    'Too many pending searches on source %s, skipping it', source.name
+                )
+                metrics.SOURCE_REJECTIONS.inc(self._service_name, source.name)
+                start.rejected.append(source)
+                continue
+            if not self._breakers.allow(source_uuid, source):
+                self._bulkheads.release(source_uuid)
+                start.circuit_open.append(source)
+                continue
+
+            args['token'] = token
+            args['user_uuid'] = user_uuid
+            args['xivo_user_uuid'] = user_uuid
+            future = self._async_search(source, term, args, cache_key)
+            self._bulkheads.release_when_done(source_uuid, future)
+            self._breakers.track(source_uuid, source, future, getattr(future, 'timing'))
+            start.futures.append(future)
+        return start
+
+    def _lookup_timeout(self, profile_config: ProfileConfig) -> float | None:
+        service_config = self.get_service_config(profile_config)
+        return (service_config.get('options') or {}).get('timeout') or None
+
     def lookup(
         self,
         profile_config: ProfileConfig,
@@ -101,24 +295,127 @@ class _LookupService(helpers.BaseService):
         args: dict[str, Any] | None = None,
         token: str | None = None,
     ) -> list[SourceResult]:
-        args = args or {}
-        futures = []
-        sources = self.source_from_profile(profile_config)
-        for source in sources:
-            args['token'] = token
-            args['user_uuid'] = user_uuid
-            args['xivo_user_uuid'] = user_uuid
-            futures.append(self._async_search(source, term, args))
+        results, _ = self.lookup_with_status(
+            profile_config, tenant_uuid, term, user_uuid, args, token
+        )
+        return results
+
+    def lookup_with_status(
+        self,
+        profile_config: ProfileConfig,
+        tenant_uuid: str,
+        term: str,
+        user_uuid: str | None,
+        args: dict[str, Any] | None = None,
+        token: str | None = None,
+    ) -> tuple[list[SourceResult], list[SourceStatus]]:
+        """Search the sources of a profile
+
+        Also returns the status of each source, searches still running when the
+        timeout of the profile expires are cancelled or abandoned.
+        """
+        start = self._start_lookup(profile_config, term, user_uuid, args or {}, token)
+        futures = start.futures
+        results = []
+        statuses: list[SourceStatus] = []
+        for source, cached in start.cached:
+            results.extend(cached)
+            statuses.append(_immediate_status(source, 'ok', cached=True))
+        for source in start.rejected:
+            statuses.append(_immediate_status(source, 'rejected', cached=False))
+        for source in start.circuit_open:
+            statuses.append(_immediate_status(source, 'circuit_open', cached=False))
 
         params: dict[str, Any] = {'return_when': ALL_COMPLETED}
-        service_config = self.get_service_config(profile_config)
-        timeout = (service_config.get('options') or {}).get('timeout')
+        timeout = self._lookup_timeout(profile_config)
         if timeout:
             params['timeout'] = timeout
 
-        done, _ = wait(futures, **params)
-        results = []
+        done, not_done = wait(futures, **params)
+        if not_done:
+            logger.warning(
+                'Timeout on lookup, returning partial results (sources=%s)',
+                [getattr(future, 'name') for future in not_done],
+            )
+            metrics.count_timeouts(self._service_name, not_done)
+            self._breakers.timed_out(not_done)
+            self._cancel_pending(not_done)
+        for future in futures:
+            timing: _SearchTiming | None = getattr(future, 'timing', None)
+            if timing:
+                statuses.append(timing.status(done=future in done))
         for future in done:
             for result in future.result():
                 results.append(result)
-        return results
+        return results, statuses
+
+    def lookup_progressively(
+        self,
+        profile_config: ProfileConfig,
+        tenant_uuid: str,
+        term: str,
+        user_uuid: str | None,
+        args: dict[str, Any] | None = None,
+        token: str | None = None,
+    ) -> Iterator[SourceLookup]:
+        """Search the sources of a profile, yielding the results of each source
+        as soon as it answers
+
+        Sources that did not answer before the timeout of the profile are yielded
+        last with `timed_out` set, sources with too many pending searches or
+        whose circuit is open are yielded first with `rejected` or
+        `circuit_open` set.
+        """
+        start = self._start_lookup(profile_config, term, user_uuid, args or {}, token)
+        timeout = self._lookup_timeout(profile_config)
+        return self._iter_lookups(start, timeout)
+
+    def _iter_lookups(
+        self, start: _LookupStart, timeout: float | None
+    ) -> Iterator[SourceLookup]:
+        for source in start.rejected:
+            yield SourceLookup(source.name, [], rejected=True)
+        for source in start.circuit_open:
+            yield SourceLookup(source.name, [], circuit_open=True)
+        for source, cached in start.cached:
+            yield SourceLookup(source.name, cached)
+        futures = start.futures
+        yielded: set[Future[list[SourceResult]]] = set()
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                yielded.add(future)
+                yield SourceLookup(getattr(future, 'name'), future.result())
+        except TimeoutError:
+            # A single snapshot, a search finishing after the deadline is either
+            # yielded with its results or timed out but never skipped
+            late, pending = [], []
+            for future in futures:
+                if future not in yielded:
+                    (late if future.done() else pending).append(future)
+            for future in late:
+                yield SourceLookup(getattr(future, 'name'), future.result())
+            metrics.count_timeouts(self._service_name, pending)
+            self._breakers.timed_out(pending)
+            self._cancel_pending(pending)
+            for future in pending:
+                yield SourceLookup(getattr(future, 'name'), [], timed_out=True)
+
+
+def _immediate_status(
+    source: BaseSourcePlugin,
+    status: Literal['ok', 'rejected', 'circuit_open'],
+    cached: bool,
+) -> SourceStatus:
+    return {
+        'source': source.name,
+        'backend': source.backend,
+        'status': status,
+        'cached': cached,
+        'queue_ms': None,
+        'exec_ms': None,
+        'elapsed_ms': 0.0,
+    }
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
@@ -1,17 +1,26 @@
 # Copyright 2014-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import threading
 import unittest
-from concurrent.futures import ALL_COMPLETED
+from concurrent.futures import ALL_COMPLETED, Future, TimeoutError
 from typing import cast
 from unittest.mock import Mock, patch, sentinel
 
-from hamcrest import assert_that, contains_string, equal_to, none, not_
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    contains_string,
+    equal_to,
+    has_entries,
+    none,
+    not_,
+)
 
 from wazo_dird.helpers import ProfileConfig
 from wazo_dird.plugin_manager import ServiceDependencies
 
-from ..plugin import LookupServicePlugin, _LookupService
+from ..plugin import LookupServicePlugin, SourceLookup, _LookupService, _LookupStart
 
 
 def _deps(deps: dict) -> ServiceDependencies:
@@ -147,3 +156,284 @@ class TestLookupPerSourceTiming(unittest.TestCase):
         assert_that(messages[0], contains_string('queue_ms='))
         assert_that(messages[0], contains_string('exec_ms='))
         assert_that(messages[0], contains_string('results=2'))
+
+
+class TestLookupCache(unittest.TestCase):
+    def setUp(self):
+        self.source = Mock()
+        self.source.name = 'my_source'
+        self.source.backend = 'csv'
+        self.source.search.return_value = [sentinel.result]
+        self.source_manager = Mock()
+        self.source_manager.get.return_value = self.source
+        config = {'lookup_service': {'cache': {'enabled': True}}}
+        self.service = _LookupService(
+            config=config, source_manager=self.source_manager, controller=Mock()
+        )
+        self.profile = cast(
+            ProfileConfig,
+            {'name': 'test', 'services': {'lookup': {'sources': [{'uuid': 'src'}]}}},
+        )
+
+    def tearDown(self):
+        self.service.stop()
+
+    def test_results_are_reused(self):
+        self.service.lookup(self.profile, 'tenant', 'alice', 'user-1')
+        results = self.service.lookup(self.profile, 'tenant', 'alice', 'user-2')
+
+        assert_that(results, equal_to([sentinel.result]))
+        self.source.search.assert_called_once()
+
+    def test_personal_results_are_kept_per_user(self):
+        self.source.backend = 'personal'
+
+        self.service.lookup(self.profile, 'tenant', 'alice', 'user-1')
+        self.service.lookup(self.profile, 'tenant', 'alice', 'user-1')
+        self.service.lookup(self.profile, 'tenant', 'alice', 'user-2')
+
+        assert_that(self.source.search.call_count, equal_to(2))
+
+    def test_errors_are_not_kept(self):
+        self.source.search.side_effect = [Exception, [sentinel.result]]
+        self.source.search.__name__ = 'search'
+
+        self.service.lookup(self.profile, 'tenant', 'alice', 'user-1')
+        results = self.service.lookup(self.profile, 'tenant', 'alice', 'user-1')
+
+        assert_that(results, equal_to([sentinel.result]))
+
+    def test_invalidation(self):
+        (invalidate,), _ = self.source_manager.subscribe_to_invalidation.call_args
+        self.service.lookup(self.profile, 'tenant', 'alice', 'user-1')
+
+        invalidate(backend='phonebook')
+        self.service.lookup(self.profile, 'tenant', 'alice', 'user-1')
+        invalidate(backend='csv')
+        self.service.lookup(self.profile, 'tenant', 'alice', 'user-1')
+        invalidate(source_uuid='src')
+        self.service.lookup(self.profile, 'tenant', 'alice', 'user-1')
+
+        assert_that(self.source.search.call_count, equal_to(3))
+
+    def test_disabled_by_default(self):
+        service = _LookupService(
+            config={}, source_manager=self.source_manager, controller=Mock()
+        )
+
+        service.lookup(self.profile, 'tenant', 'alice', 'user-1')
+        service.lookup(self.profile, 'tenant', 'alice', 'user-1')
+
+        assert_that(self.source.search.call_count, equal_to(2))
+        self.source_manager.subscribe_to_invalidation.assert_called_once()
+        service.stop()
+
+
+class TestLookupProgressively(unittest.TestCase):
+    def _service_with_sources(self, *sources: Mock) -> _LookupService:
+        source_manager = Mock()
+        source_manager.get.side_effect = lambda uuid: sources[int(uuid)]
+        return _LookupService(
+            config={}, source_manager=source_manager, controller=Mock()
+        )
+
+    def _source(self, name, search):
+        source = Mock(backend='ldap')
+        source.name = name
+        source.search.side_effect = search
+        return source
+
+    def test_results_are_yielded_per_source(self):
+        fast = self._source('fast', lambda term, args: [sentinel.fast])
+        release = threading.Event()
+        slow = self._source('slow', lambda term, args: release.wait() and [])
+        service = self._service_with_sources(fast, slow)
+        profile = {
+            'name': 'test',
+            'services': {
+                'lookup': {
+                    'sources': [{'uuid': '0'}, {'uuid': '1'}],
+                    'options': {'timeout': 0.1},
+                }
+            },
+        }
+
+        lookups = list(
+            service.lookup_progressively(
+                cast(ProfileConfig, profile), 'tenant', 'alice', 'user-uuid'
+            )
+        )
+        release.set()
+        service.stop()
+
+        assert_that(
+            lookups,
+            contains_exactly(
+                SourceLookup('fast', [sentinel.fast]),
+                SourceLookup('slow', [], timed_out=True),
+            ),
+        )
+
+    def test_searches_finishing_after_the_deadline_are_yielded(self):
+        service = self._service_with_sources()
+        late, slow = Future(), Future()
+        setattr(late, 'name', 'late')
+        setattr(slow, 'name', 'slow')
+
+        def as_completed(futures, timeout):
+            late.set_result([sentinel.late])
+            raise TimeoutError()
+
+        with patch(
+            'wazo_dird.plugins.lookup_service.plugin.as_completed', as_completed
+        ):
+            lookups = list(
+                service._iter_lookups(_LookupStart([], [], [], [late, slow]), 0.1)
+            )
+        service.stop()
+
+        assert_that(
+            lookups,
+            contains_exactly(
+                SourceLookup('late', [sentinel.late]),
+                SourceLookup('slow', [], timed_out=True),
+            ),
+        )
+        assert_that(slow.cancelled(), equal_to(True))
+
+
+class TestLookupWithStatus(unittest.TestCase):
+    def _source(self, name, search):
+        source = Mock(backend='ldap')
+        source.name = name
+        source.search.side_effect = search
+        source.search.__name__ = 'search'
+        return source
+
+    def _profile(self, count, timeout):
+        return cast(
+            ProfileConfig,
+            {
+                'name': 'test',
+                'services': {
+                    'lookup': {
+                        'sources': [{'uuid': str(i)} for i in range(count)],
+                        'options': {'timeout': timeout},
+                    }
+                },
+            },
+        )
+
+    def test_status_of_each_source(self):
+        release = threading.Event()
+        sources = [
+            self._source('ok', lambda term, args: [sentinel.result]),
+            self._source('error', Exception),
+            self._source('slow', lambda term, args: release.wait() and []),
+        ]
+        source_manager = Mock()
+        source_manager.get.side_effect = lambda uuid: sources[int(uuid)]
+        service = _LookupService(
+            config={}, source_manager=source_manager, controller=Mock()
+        )
+
+        results, statuses = service.lookup_with_status(
+            self._profile(3, 0.1), 'tenant', 'alice', 'user-uuid'
+        )
+        release.set()
+        service.stop()
+
+        assert_that(results, contains_exactly(sentinel.result))
+        assert_that(
+            statuses,
+            contains_exactly(
+                has_entries(source='ok', backend='ldap', status='ok', cached=False),
+                has_entries(source='error', status='error'),
+                has_entries(source='slow', status='timeout', exec_ms=not_(none())),
+            ),
+        )
+
+    def test_pending_searches_are_cancelled_on_timeout(self):
+        release = threading.Event()
+        source = self._source('slow', lambda term, args: release.wait() and [])
+        source_manager = Mock()
+        source_manager.get.return_value = source
+        service = _LookupService(
+            config={'lookup_service': {'executor_workers': 1}},
+            source_manager=source_manager,
+            controller=Mock(),
+        )
+
+        _, statuses = service.lookup_with_status(
+            self._profile(2, 0.1), 'tenant', 'alice', 'user-uuid'
+        )
+        release.set()
+        service.stop()
+
+        assert_that(
+            statuses,
+            contains_exactly(
+                has_entries(status='timeout', exec_ms=not_(none())),
+                has_entries(status='timeout', queue_ms=none(), exec_ms=none()),
+            ),
+        )
+        assert_that(source.search.call_count, equal_to(1))
+
+    def test_failing_sources_are_skipped_when_their_circuit_is_open(self):
+        source = self._source('broken', Exception)
+        source_manager = Mock()
+        source_manager.get.return_value = source
+        config = {
+            'lookup_service': {
+                'circuit_breaker': {'enabled': True, 'failure_threshold': 1}
+            }
+        }
+        service = _LookupService(
+            config=config, source_manager=source_manager, controller=Mock()
+        )
+
+        _, statuses = service.lookup_with_status(
+            self._profile(1, 1), 'tenant', 'alice', 'user-uuid'
+        )
+        _, skipped_statuses = service.lookup_with_status(
+            self._profile(1, 1), 'tenant', 'alice', 'user-uuid'
+        )
+        service.stop()
+
+        assert_that(statuses, contains_exactly(has_entries(status='error')))
+        assert_that(
+            skipped_statuses,
+            contains_exactly(has_entries(source='broken', status='circuit_open')),
+        )
+        assert_that(source.search.call_count, equal_to(1))
+        assert_that(
+            service._breakers.status(),
+            has_entries({'0': has_entries(state='open', consecutive_failures=1)}),
+        )
+
+    def test_sources_with_too_many_pending_searches_are_rejected(self):
+        release = threading.Event()
+        source = self._source('slow', lambda term, args: release.wait() and [])
+        source_manager = Mock()
+        source_manager.get.return_value = source
+        service = _LookupService(
+            config={'lookup_service': {'source_concurrency': {'default': 1}}},
+            source_manager=source_manager,
+            controller=Mock(),
+        )
+
+        _, statuses = service.lookup_with_status(
+            self._profile(1, 0.1), 'tenant', 'alice', 'user-uuid'
+        )
+        _, rejected_statuses = service.lookup_with_status(
+            self._profile(1, 0.1), 'tenant', 'alice', 'user-uuid'
+        )
+        release.set()
+        service.stop()
+
+        assert_that(statuses, contains_exactly(has_entries(status='timeout')))
+        assert_that(
+            rejected_statuses,
+            contains_exactly(has_entries(source='slow', status='rejected')),
+        )
+        assert_that(source.search.call_count, equal_to(1))
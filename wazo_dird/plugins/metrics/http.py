@@ -0,0 +1,19 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from flask import Response
+
+from wazo_dird.auth import required_acl
+from wazo_dird.http import AuthResource
+from wazo_dird.metrics import Registry
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsResource(AuthResource):
+    def __init__(self, registry: Registry) -> None:
+        self.registry = registry
+
+    @required_acl('dird.metrics.read')
+    def get(self) -> Response:
+        return Response(self.registry.render(), status=200, content_type=CONTENT_TYPE)
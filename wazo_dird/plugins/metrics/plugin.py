@@ -0,0 +1,18 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from wazo_dird import BaseViewPlugin, metrics
+from wazo_dird.plugin_manager import ViewDependencies
+
+from .http import MetricsResource
+
+
+class MetricsViewPlugin(BaseViewPlugin):
+    url = '/metrics'
+
+    def load(self, dependencies: ViewDependencies) -> None:
+        api = dependencies['api']
+
+        api.add_resource(
+            MetricsResource, self.url, resource_class_args=[metrics.registry]
+        )
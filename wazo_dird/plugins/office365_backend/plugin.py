@@ -1,4 +1,4 @@
-# Copyright 2019-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2019-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
@@ -10,6 +10,12 @@ from typing import Any
 
 from wazo_dird import BaseSourcePlugin, make_result_class
 from wazo_dird.helpers import BackendViewDependencies, BaseBackendView
+from wazo_dird.plugin_helpers.external_contacts import (
+    DEFAULT_CONTACTS_TTL,
+    DEFAULT_MAX_USERS,
+    ContactsChanges,
+    ExternalContactsCache,
+)
 from wazo_dird.plugins.source_result import _SourceResult as SourceResult
 
 from . import services
@@ -47,6 +53,10 @@ class Office365Plugin(BaseSourcePlugin):
         self.name = config['name']
         self.endpoint = config['endpoint']
         self.office365 = services.Office365Service()
+        self._contacts_cache = ExternalContactsCache(
+            ttl=config.get('contacts_cache_ttl', DEFAULT_CONTACTS_TTL),
+            max_users=config.get('contacts_cache_max_users', DEFAULT_MAX_USERS),
+        )
 
         self.unique_column = 'id'
         format_columns = dependencies['config'].get(self.FORMAT_COLUMNS, {})
@@ -83,7 +93,6 @@ class Office365Plugin(BaseSourcePlugin):
         if not contacts:
             return []
 
-        updated_contacts = self._update_contact_fields(contacts)
         lowered_term = term.lower()
 
         def match_fn(contact: dict[str, Any]) -> bool:
@@ -93,7 +102,7 @@ class Office365Plugin(BaseSourcePlugin):
                     return True
             return False
 
-        filtered_contacts = [c for c in updated_contacts if match_fn(c)]
+        filtered_contacts = [c for c in contacts if match_fn(c)]
 
         # Note(achohra): We need to make sure that `givenName` key/value exists to avoid TypeError when sorting
 
@@ -116,10 +125,7 @@ class Office365Plugin(BaseSourcePlugin):
         if not contacts:
             return []
 
-        updated_contacts = self._update_contact_fields(contacts)
-        filtered_contacts = [
-            c for c in updated_contacts if c[self.unique_column] in unique_ids
-        ]
+        filtered_contacts = [c for c in contacts if c[self.unique_column] in unique_ids]
 
         return [self._SourceResult(contact) for contact in filtered_contacts]
 
@@ -137,10 +143,9 @@ class Office365Plugin(BaseSourcePlugin):
         if not contacts:
             return None
 
-        updated_contacts = self._update_contact_fields(contacts)
         lowered_term = term.lower()
 
-        for contact in updated_contacts:
+        for contact in contacts:
             if self._first_match_predicate(lowered_term, contact):
                 return self._SourceResult(contact)
         return None
@@ -159,11 +164,10 @@ class Office365Plugin(BaseSourcePlugin):
         if not contacts:
             return {}
 
-        updated_contacts = self._update_contact_fields(contacts)
         results: dict[str, SourceResult] = {}
         for term in terms:
             lowered_term = term.lower()
-            for contact in updated_contacts:
+            for contact in contacts:
                 if self._first_match_predicate(lowered_term, contact):
                     results[term] = self._SourceResult(contact)
         return results
@@ -171,8 +175,9 @@ class Office365Plugin(BaseSourcePlugin):
     def _fetch_contacts(
         self, args: dict[str, Any] | None = None
     ) -> builtins.list[dict[str, Any]] | None:
+        args = args or {}
         try:
-            microsoft_token = self._get_microsoft_token(**(args or {}))
+            microsoft_token = self._get_microsoft_token(**args)
         except MicrosoftTokenNotFoundException:
             logger.debug('could not find a matching Microsoft token')
             return None
@@ -181,11 +186,17 @@ class Office365Plugin(BaseSourcePlugin):
             logger.debug('could not find a matching Microsoft token')
             return None
 
-        try:
-            contacts, _ = self.office365.get_contacts(microsoft_token, self.endpoint)
-        except UnexpectedEndpointException:
-            return None
-        return contacts
+        def sync(sync_state: str | None) -> ContactsChanges | None:
+            try:
+                changes = self.office365.sync_contacts(
+                    microsoft_token, self.endpoint, sync_state
+                )
+            except UnexpectedEndpointException:
+                return None
+            self._update_contact_fields(builtins.list(changes.changed.values()))
+            return changes
+
+        return self._contacts_cache.contacts(args['user_uuid'], sync)
 
     def _first_match_predicate(self, term: str, contact: dict[str, Any]) -> bool:
         for column in self._first_matched_columns:
@@ -208,7 +219,10 @@ class Office365Plugin(BaseSourcePlugin):
             logger.debug('Unable to search through Office365 without a token.')
             raise MicrosoftTokenNotFoundException(user_uuid)
 
-        return services.get_microsoft_access_token(user_uuid, token, **self.auth)
+        return self._contacts_cache.access_token(
+            user_uuid,
+            lambda: services.get_microsoft_external_auth(user_uuid, token, **self.auth),
+        )
 
     @staticmethod
     def _update_contact_fields(
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from xivo.mallow import fields
-from xivo.mallow.validate import Length
+from xivo.mallow.validate import Length, Range
 from xivo.mallow_helpers import ListSchema as _ListSchema
 
 from wazo_dird.schemas import BaseAuthConfigSchema, BaseSourceSchema
@@ -17,6 +17,8 @@ class SourceSchema(BaseSourceSchema):
         load_default='https://graph.microsoft.com/v1.0/me/contacts',
         validate=Length(min=1, max=255),
     )
+    contacts_cache_ttl = fields.Integer(validate=Range(min=0), dump_default=60)
+    contacts_cache_max_users = fields.Integer(validate=Range(min=1), dump_default=1000)
 
 
 class ListSchema(_ListSchema):
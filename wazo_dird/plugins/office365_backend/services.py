@@ -5,12 +5,15 @@ from __future__ import annotations
 
 import itertools
 import logging
+import time
 import uuid
+from collections.abc import Callable
 from typing import Any
 
 import requests
 from wazo_auth_client import Client as Auth
 
+from wazo_dird.plugin_helpers.external_contacts import ContactsChanges
 from wazo_dird.plugin_helpers.sorting import sort_contacts
 
 from .exceptions import MicrosoftTokenNotFoundException, UnexpectedEndpointException
@@ -19,29 +22,90 @@ logger = logging.getLogger(__name__)
 
 MULTI_PHONE_FIELDS = ('businessPhones', 'homePhones')
 SINGLE_PHONE_FIELDS = ('mobilePhone',)
+# Largest page size accepted by Microsoft Graph for contacts
+PAGE_SIZE = 1000
+# Seconds before trying again the delta query on an endpoint where it failed
+DELTA_RETRY_INTERVAL = 3600
 
 
 class Office365Service:
     USER_AGENT = 'wazo_ua/1.0'
 
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._delta_retry_at: dict[str, float] = {}
+
     def get_contacts(
         self, microsoft_token: str, url: str, **list_params: Any
     ) -> tuple[list[dict[str, Any]], int]:
-        count = self._get_total_contacts(microsoft_token, url)
-        contacts = list(self._fetch(microsoft_token, url, count))
+        contacts = self._fetch(microsoft_token, url)
         total_contacts = len(contacts)
         sorted_contacts = sort_contacts(contacts, **list_params)
         paginated_contacts = self._paginate(sorted_contacts, **list_params)
         return paginated_contacts, total_contacts
 
-    def _fetch(
-        self, microsoft_token: str, url: str, count: int
-    ) -> list[dict[str, Any]]:
-        if not count:
-            return []
+    def sync_contacts(
+        self, microsoft_token: str, url: str, sync_state: str | None = None
+    ) -> ContactsChanges:
+        """The contacts changed since `sync_state`, or all contacts when None
+
+        Uses the delta query of Microsoft Graph, `sync_state` is the
+        `@odata.deltaLink` returned by the previous synchronization. Graph only
+        supports the delta query on the contacts of a folder, when it fails on
+        `url` all contacts are fetched without a `sync_state` to resume from,
+        and the delta query is not tried again for `DELTA_RETRY_INTERVAL`.
+        """
+        if sync_state:
+            return self._sync_delta(microsoft_token, sync_state, full=False)
+
+        retry_at = self._delta_retry_at.get(url)
+        if retry_at is None or self._clock() >= retry_at:
+            try:
+                changes = self._sync_delta(
+                    microsoft_token, f'{url.rstrip("/")}/delta', full=True
+                )
+            except UnexpectedEndpointException:
+                logger.info(
+                    'Microsoft delta query failed on %s, fetching all contacts', url
+                )
+                self._delta_retry_at[url] = self._clock() + DELTA_RETRY_INTERVAL
+            else:
+                self._delta_retry_at.pop(url, None)
+                return changes
+
+        contacts = self._fetch(microsoft_token, url)
+        changed = {contact['id']: contact for contact in contacts}
+        return ContactsChanges(changed, [], None, full=True)
 
+    def _sync_delta(
+        self, microsoft_token: str, url: str, full: bool
+    ) -> ContactsChanges:
         headers = self.headers(microsoft_token)
-        response = self._fetch_response(url, headers, {'$top': count})
+        headers['Prefer'] = f'odata.maxpagesize={PAGE_SIZE}'
+        next_url: str | None = url
+        changed: dict[str, dict[str, Any]] = {}
+        removed: list[str] = []
+        data: dict[str, Any] = {}
+
+        while next_url:
+            data = self._fetch_response(next_url, headers).json()
+            for contact in self._extract_contacts(data):
+                if '@removed' in contact:
+                    removed.append(contact['id'])
+                else:
+                    changed[contact['id']] = contact
+            next_url = data.get('@odata.nextLink')
+
+        logger.debug(
+            'Microsoft contacts sync: %d changed, %d removed',
+            len(changed),
+            len(removed),
+        )
+        return ContactsChanges(changed, removed, data.get('@odata.deltaLink'), full)
+
+    def _fetch(self, microsoft_token: str, url: str) -> list[dict[str, Any]]:
+        headers = self.headers(microsoft_token)
+        response = self._fetch_response(url, headers, {'$top': PAGE_SIZE})
         data = response.json()
         contacts = self._extract_contacts(data)
 
@@ -80,13 +144,6 @@ class Office365Service:
         contacts: list[dict[str, Any]] = data.get('value', [])
         return contacts
 
-    def _get_total_contacts(self, microsoft_token: str, url: str) -> int:
-        headers = self.headers(microsoft_token)
-        response = self._fetch_response(url, headers, {'$count': 'true'})
-        count: int = response.json().get('@odata.count', 0)
-        logger.debug(f'Microsoft contacts number: {count}')
-        return count
-
     def _paginate(
         self,
         contacts: list[dict[str, Any]],
@@ -120,12 +177,20 @@ class Office365Service:
 def get_microsoft_access_token(
     user_uuid: str, wazo_token: str, **auth_config: Any
 ) -> str | None:
+    external_auth = get_microsoft_external_auth(user_uuid, wazo_token, **auth_config)
+    if not external_auth:
+        return None
+    access_token: str | None = external_auth.get('access_token')
+    return access_token
+
+
+def get_microsoft_external_auth(
+    user_uuid: str, wazo_token: str, **auth_config: Any
+) -> dict[str, Any] | None:
     try:
         auth = Auth(token=wazo_token, **auth_config)
-        access_token: str | None = auth.external.get('microsoft', user_uuid).get(
-            'access_token'
-        )
-        return access_token
+        external_auth: dict[str, Any] = auth.external.get('microsoft', user_uuid)
+        return external_auth
     except requests.HTTPError as e:
         if e.response.status_code == 404:
             if 'unknown-external-auth-type' in e.response.text:
@@ -152,6 +217,7 @@ def get_microsoft_access_token(
         raise MicrosoftTokenNotFoundException(user_uuid)
     except requests.RequestException as e:
         logger.error('Error occured while connecting to wazo-auth, error :%s', e)
+        return None
 
 
 def get_first_email(contact_information: dict[str, Any]) -> str | None:
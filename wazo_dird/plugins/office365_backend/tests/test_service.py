@@ -0,0 +1,116 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import Mock, patch
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    equal_to,
+    has_key,
+    has_properties,
+    raises,
+)
+
+from ..exceptions import UnexpectedEndpointException
+from ..services import DELTA_RETRY_INTERVAL, Office365Service
+
+ENDPOINT = 'https://graph.microsoft.com/v1.0/me/contacts'
+
+
+def _response(status_code, data=None):
+    return Mock(status_code=status_code, json=Mock(return_value=data), text='')
+
+
+@patch('wazo_dird.plugins.office365_backend.services.requests.get')
+class TestOffice365ServiceSyncContacts(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.service = Office365Service(clock=lambda: self.now)
+
+    def test_full_sync_uses_the_delta_query(self, get):
+        get.side_effect = [
+            _response(
+                200,
+                {
+                    'value': [{'id': '1'}, {'id': '2', '@removed': {}}],
+                    '@odata.deltaLink': 'delta-link',
+                },
+            ),
+        ]
+
+        changes = self.service.sync_contacts('token', ENDPOINT)
+
+        assert_that(
+            changes,
+            has_properties(
+                changed={'1': {'id': '1'}},
+                removed=['2'],
+                sync_state='delta-link',
+                full=True,
+            ),
+        )
+        assert_that(get.call_args.args, contains_exactly(f'{ENDPOINT}/delta'))
+
+    def test_full_sync_falls_back_to_all_contacts_when_delta_fails(self, get):
+        get.side_effect = [
+            _response(400),
+            _response(200, {'value': [{'id': '1'}], '@odata.nextLink': 'page-2'}),
+            _response(200, {'value': [{'id': '2'}]}),
+        ]
+
+        changes = self.service.sync_contacts('token', ENDPOINT)
+
+        assert_that(
+            changes,
+            has_properties(
+                changed={'1': {'id': '1'}, '2': {'id': '2'}},
+                removed=[],
+                sync_state=None,
+                full=True,
+            ),
+        )
+        assert_that(
+            [call.args for call in get.call_args_list],
+            contains_exactly((f'{ENDPOINT}/delta',), (ENDPOINT,), ('page-2',)),
+        )
+
+    def test_delta_query_is_not_retried_until_the_retry_interval(self, get):
+        get.side_effect = [
+            _response(400),
+            _response(200, {'value': [{'id': '1'}]}),
+            _response(200, {'value': [{'id': '1'}, {'id': '2'}]}),
+            _response(200, {'value': [], '@odata.deltaLink': 'delta-link'}),
+        ]
+        self.service.sync_contacts('token', ENDPOINT)
+
+        self.now += DELTA_RETRY_INTERVAL - 1
+        changes = self.service.sync_contacts('token', ENDPOINT)
+
+        assert_that(changes, has_properties(changed=has_key('2'), full=True))
+        self.now += 1
+        changes = self.service.sync_contacts('token', ENDPOINT)
+
+        assert_that(changes, has_properties(sync_state='delta-link'))
+        assert_that(
+            [call.args for call in get.call_args_list],
+            contains_exactly(
+                (f'{ENDPOINT}/delta',),
+                (ENDPOINT,),
+                (ENDPOINT,),
+                (f'{ENDPOINT}/delta',),
+            ),
+        )
+
+    def test_incremental_sync_failure_is_raised(self, get):
+        get.return_value = _response(410)
+
+        assert_that(
+            calling(self.service.sync_contacts).with_args(
+                'token', ENDPOINT, 'delta-link'
+            ),
+            raises(UnexpectedEndpointException),
+        )
+        assert_that(get.call_count, equal_to(1))
@@ -43,6 +43,11 @@ def _get_calling_user_uuid() -> str:
     return cast(str, user_uuid)
 
 
+def _decode_request_data() -> str:
+    charset = request.mimetype_params.get('charset', 'utf-8')
+    return request.data.decode(charset)
+
+
 class PersonalAll(LegacyAuthResource):
     personal_service: _PersonalService
 
@@ -213,9 +218,8 @@ class PersonalImport(LegacyAuthResource):
         user_uuid = _get_calling_user_uuid()
         tenant_uuid = Tenant.autodetect().uuid
 
-        charset = request.mimetype_params.get('charset', 'utf-8')
         try:
-            csv_document = request.data.decode(charset)
+            csv_document = _decode_request_data()
         except UnicodeDecodeError as e:
             error: dict[str, Any] = {
                 'reason': [str(e)],
@@ -247,3 +251,57 @@ class PersonalImport(LegacyAuthResource):
     ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
         reader = csv.DictReader(csv_document.split('\n'))
         return self.personal_service.create_contacts(reader, user_uuid, tenant_uuid)
+
+
+class PersonalImportJobs(LegacyAuthResource):
+    personal_service: _PersonalService
+
+    @classmethod
+    def configure(cls, personal_service: _PersonalService) -> None:
+        cls.personal_service = personal_service
+
+    @required_acl('dird.personal.import.create')
+    def post(self) -> tuple[dict[str, Any], int]:
+        user_uuid = _get_calling_user_uuid()
+        tenant_uuid = Tenant.autodetect().uuid
+
+        try:
+            csv_document = _decode_request_data()
+        except UnicodeDecodeError as e:
+            error: dict[str, Any] = {
+                'reason': [str(e)],
+                'timestamp': [time()],
+                'status_code': 400,
+            }
+            return error, 400
+
+        reader = csv.DictReader(csv_document.split('\n'))
+        rows = [(reader.line_num, row) for row in reader]
+        if not rows:
+            error = {
+                'reason': ['No contact found'],
+                'timestamp': [time()],
+                'status_code': 400,
+            }
+            return error, 400
+
+        job = self.personal_service.start_import(rows, user_uuid, tenant_uuid)
+        return job.to_dict(), 202
+
+
+class PersonalImportJob(LegacyAuthResource):
+    personal_service: _PersonalService
+
+    @classmethod
+    def configure(cls, personal_service: _PersonalService) -> None:
+        cls.personal_service = personal_service
+
+    @required_acl('dird.personal.imports.{job_uuid}.read')
+    def get(self, job_uuid: str) -> tuple[dict[str, Any], int]:
+        user_uuid = _get_calling_user_uuid()
+        try:
+            job = self.personal_service.get_import(job_uuid, user_uuid)
+        except self.personal_service.NoSuchImportJob as e:
+            error = {'reason': [str(e)], 'timestamp': [time()], 'status_code': 404}
+            return error, 404
+        return job.to_dict(), 200
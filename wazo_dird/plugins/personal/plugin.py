@@ -1,4 +1,4 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
@@ -10,7 +10,13 @@ from typing import TYPE_CHECKING, cast
 from wazo_dird import BaseViewPlugin
 from wazo_dird.plugin_manager import ViewDependencies
 
-from .http import PersonalAll, PersonalImport, PersonalOne
+from .http import (
+    PersonalAll,
+    PersonalImport,
+    PersonalImportJob,
+    PersonalImportJobs,
+    PersonalOne,
+)
 
 if TYPE_CHECKING:
     from wazo_dird.plugins.personal_service.plugin import _PersonalService
@@ -24,6 +30,8 @@ class PersonalViewPlugin(BaseViewPlugin):
     personal_all_url = '/personal'
     personal_one_url = '/personal/<contact_id>'
     personal_import_url = '/personal/import'
+    personal_import_jobs_url = '/personal/imports'
+    personal_import_job_url = '/personal/imports/<job_uuid>'
 
     def load(self, dependencies: ViewDependencies) -> None:
         api = dependencies['api']
@@ -34,6 +42,10 @@ class PersonalViewPlugin(BaseViewPlugin):
             PersonalAll.configure(personal_service)
             PersonalOne.configure(personal_service)
             PersonalImport.configure(personal_service)
+            PersonalImportJobs.configure(personal_service)
+            PersonalImportJob.configure(personal_service)
             api.add_resource(PersonalAll, self.personal_all_url)
             api.add_resource(PersonalOne, self.personal_one_url)
             api.add_resource(PersonalImport, self.personal_import_url)
+            api.add_resource(PersonalImportJobs, self.personal_import_jobs_url)
+            api.add_resource(PersonalImportJob, self.personal_import_job_url)
@@ -1,4 +1,4 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from typing import cast
@@ -9,7 +9,13 @@ from hamcrest import assert_that, equal_to
 
 from wazo_dird.plugin_manager import ViewDependencies
 
-from ..http import PersonalAll, PersonalImport, PersonalOne
+from ..http import (
+    PersonalAll,
+    PersonalImport,
+    PersonalImportJob,
+    PersonalImportJobs,
+    PersonalOne,
+)
 from ..plugin import PersonalViewPlugin
 
 
@@ -52,3 +58,9 @@ class TestPersonalView(TestCase):
         self.api.add_resource.assert_any_call(
             PersonalImport, PersonalViewPlugin.personal_import_url
         )
+        self.api.add_resource.assert_any_call(
+            PersonalImportJobs, PersonalViewPlugin.personal_import_jobs_url
+        )
+        self.api.add_resource.assert_any_call(
+            PersonalImportJob, PersonalViewPlugin.personal_import_job_url
+        )
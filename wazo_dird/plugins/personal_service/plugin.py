@@ -1,16 +1,24 @@
-# Copyright 2015-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2015-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
 
 import csv
 import logging
+from collections.abc import Iterable
 from typing import TYPE_CHECKING, Any, cast
 
 from wazo_dird import BaseServicePlugin, database, exception
 from wazo_dird.database.helpers import Session
+from wazo_dird.database.queries.base import compute_contact_hash
+from wazo_dird.plugin_helpers.import_jobs import (
+    ImportJob,
+    ImportJobs,
+    PersonalImportCompletedEvent,
+)
 
 if TYPE_CHECKING:
+    from wazo_dird.bus import CoreBus
     from wazo_dird.config import Config
     from wazo_dird.controller import Controller
     from wazo_dird.database.queries.base import ContactInfo
@@ -23,11 +31,18 @@ logger = logging.getLogger(__name__)
 
 UNIQUE_COLUMN = 'id'
 
+# A contact of an imported CSV file and its line number
+ImportRow = tuple[int, dict[str, Any]]
+
 
 class PersonalImportError(ValueError):
     pass
 
 
+def _duplicate_row(line: int) -> dict[str, Any]:
+    return {'errors': ['duplicate contact'], 'line': line}
+
+
 class PersonalServicePlugin(BaseServicePlugin):
     def load(self, dependencies: ServiceDependencies) -> _PersonalService:
         try:
@@ -42,11 +57,25 @@ class PersonalServicePlugin(BaseServicePlugin):
             raise ValueError(msg)
 
         crud = database.PersonalContactCRUD(Session)
-        return _PersonalService(config, source_manager, crud, controller)
+        self._import_jobs: ImportJobs[ImportRow] = ImportJobs.from_config(
+            'personal_import', config
+        )
+        return _PersonalService(
+            config,
+            source_manager,
+            crud,
+            controller,
+            self._import_jobs,
+            dependencies.get('bus'),
+        )
+
+    def unload(self) -> None:
+        self._import_jobs.stop()
 
 
 class _PersonalService:
     NoSuchContact = exception.NoSuchContact
+    NoSuchImportJob = exception.NoSuchImportJob
     DuplicatedContactException = exception.DuplicatedContactException
 
     class InvalidPersonalContact(ValueError):
@@ -61,28 +90,115 @@ class _PersonalService:
         source_manager: SourceManager,
         crud: database.PersonalContactCRUD,
         controller: Controller,
+        import_jobs: ImportJobs[ImportRow] | None = None,
+        bus: CoreBus | None = None,
     ) -> None:
         self._crud = crud
         self._config = config
         self._source_manager = source_manager
         self._controller = controller
+        self._import_jobs = import_jobs
+        self._bus = bus
 
     def create_contact(
         self, contact_infos: dict[str, Any], user_uuid: str, tenant_uuid: str
     ) -> dict[str, Any] | None:
         self.validate_contact(contact_infos)
-        return self._crud.create_personal_contact(tenant_uuid, user_uuid, contact_infos)
+        contact = self._crud.create_personal_contact(
+            tenant_uuid, user_uuid, contact_infos
+        )
+        self._contacts_changed(user_uuid)
+        return contact
 
     def create_contacts(
         self, contact_infos: csv.DictReader[str], user_uuid: str, tenant_uuid: str
     ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-        errors: list[dict[str, Any]] = []
-        to_add: list[dict[str, Any]] = []
-        existing_contact_uuids = {
-            contact['id'] for contact in self._crud.list_personal_contacts()
-        }
+        rows = ((contact_infos.line_num, row) for row in contact_infos)
+        to_add, errors = self._validate_import_rows(rows, self._existing_uuids())
+
+        created = self._crud.create_personal_contacts(
+            tenant_uuid, user_uuid, [contact for _, contact in to_add]
+        )
+        if created:
+            self._contacts_changed(user_uuid)
+        return created, errors
+
+    def start_import(
+        self, rows: list[ImportRow], user_uuid: str, tenant_uuid: str
+    ) -> ImportJob:
+        assert self._import_jobs
+        existing_contact_uuids: set[str] | None = None
+
+        def import_batch(
+            batch: list[ImportRow], start: int
+        ) -> tuple[int, list[dict[str, Any]], list[dict[str, Any]]]:
+            nonlocal existing_contact_uuids
+            if existing_contact_uuids is None:
+                existing_contact_uuids = self._existing_uuids()
+            return self._import_batch(
+                tenant_uuid, user_uuid, batch, existing_contact_uuids
+            )
 
-        for contact_info in contact_infos:
+        return self._import_jobs.submit(
+            tenant_uuid,
+            {'user_uuid': user_uuid},
+            rows,
+            import_batch,
+            self._import_finished,
+        )
+
+    def get_import(self, job_uuid: str, user_uuid: str) -> ImportJob:
+        assert self._import_jobs
+        return self._import_jobs.get(job_uuid, {'user_uuid': user_uuid})
+
+    def _import_batch(
+        self,
+        tenant_uuid: str,
+        user_uuid: str,
+        rows: list[ImportRow],
+        existing_contact_uuids: set[str],
+    ) -> tuple[int, list[dict[str, Any]], list[dict[str, Any]]]:
+        to_add, errors = self._validate_import_rows(rows, existing_contact_uuids)
+        unique: dict[str, ImportRow] = {}
+        duplicates: list[dict[str, Any]] = []
+        for line, contact in to_add:
+            hash_ = compute_contact_hash(contact)
+            if hash_ in unique:
+                duplicates.append(_duplicate_row(line))
+            else:
+                unique[hash_] = (line, contact)
+        self._crud.create_personal_contacts(
+            tenant_uuid, user_uuid, [contact for _, contact in unique.values()]
+        )
+
+        # contacts already stored are given the id of the stored contact
+        created: set[str] = set()
+        for line, contact in unique.values():
+            if contact['id'] in existing_contact_uuids:
+                duplicates.append(_duplicate_row(line))
+            else:
+                created.add(contact['id'])
+        duplicates.sort(key=lambda duplicate: duplicate['line'])
+        # the contacts of the next batches can not reuse those ids
+        existing_contact_uuids |= created
+
+        if created:
+            self._contacts_changed(user_uuid)
+        return len(created), errors, duplicates
+
+    def _import_finished(self, job: ImportJob) -> None:
+        if self._bus:
+            self._bus.publish(PersonalImportCompletedEvent(job))
+
+    def _existing_uuids(self) -> set[str]:
+        return {contact['id'] for contact in self._crud.list_personal_contacts()}
+
+    def _validate_import_rows(
+        self, rows: Iterable[ImportRow], existing_contact_uuids: set[str]
+    ) -> tuple[list[ImportRow], list[dict[str, Any]]]:
+        errors: list[dict[str, Any]] = []
+        to_add: list[ImportRow] = []
+        for line, contact_info in rows:
             try:
                 if None in contact_info.keys():
                     raise PersonalImportError('too many fields')
@@ -90,16 +206,12 @@ class _PersonalService:
                     raise PersonalImportError('missing fields')
 
                 self.validate_contact(contact_info, existing_contact_uuids)
-                to_add.append(contact_info)
+                to_add.append((line, contact_info))
             except self.InvalidPersonalContact as e:
-                errors.append({'errors': e.errors, 'line': contact_infos.line_num})
+                errors.append({'errors': e.errors, 'line': line})
             except PersonalImportError as e:
-                errors.append({'errors': [str(e)], 'line': contact_infos.line_num})
-
-        return (
-            self._crud.create_personal_contacts(tenant_uuid, user_uuid, to_add),
-            errors,
-        )
+                errors.append({'errors': [str(e)], 'line': line})
+        return to_add, errors
 
     def get_contact(self, contact_id: str, user_uuid: str) -> ContactInfo:
         return self._crud.get_personal_contact(user_uuid, contact_id)
@@ -112,15 +224,22 @@ class _PersonalService:
         tenant_uuid: str,
     ) -> dict[str, Any] | None:
         self.validate_contact(contact_infos)
-        return self._crud.edit_personal_contact(
+        contact = self._crud.edit_personal_contact(
             tenant_uuid, user_uuid, contact_id, contact_infos
         )
+        self._contacts_changed(user_uuid)
+        return contact
 
     def remove_contact(self, contact_id: str, user_uuid: str) -> None:
         self._crud.delete_personal_contact(user_uuid, contact_id)
+        self._contacts_changed(user_uuid)
 
     def purge_contacts(self, user_uuid: str) -> None:
         self._crud.delete_all_personal_contacts(user_uuid)
+        self._contacts_changed(user_uuid)
+
+    def _contacts_changed(self, user_uuid: str) -> None:
+        self._source_manager.invalidate_results('personal', user_uuid=user_uuid)
 
     def list_contacts(self, tenant_uuid: str, user_uuid: str) -> list[Any]:
         personal_source = self._find_personal_source(tenant_uuid)
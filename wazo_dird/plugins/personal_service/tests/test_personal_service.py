@@ -0,0 +1,156 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from unittest.mock import ANY, Mock
+from unittest.mock import sentinel as s
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    contains_string,
+    empty,
+    equal_to,
+    has_entries,
+    instance_of,
+)
+
+from wazo_dird import database
+from wazo_dird.plugin_helpers.import_jobs import (
+    ImportJob,
+    ImportJobs,
+    PersonalImportCompletedEvent,
+)
+
+from ..plugin import _PersonalService as Service
+
+STORED_UUID = 'a2a6b1c6-8f1a-4b8e-8d4c-3f1f4a0f6a01'
+
+
+class TestPersonalServiceImportJob(unittest.TestCase):
+    def setUp(self):
+        self.crud = Mock(database.PersonalContactCRUD)
+        self.crud.list_personal_contacts.return_value = [{'id': STORED_UUID}]
+        self.crud.create_personal_contacts.side_effect = self._create_contacts
+        self.source_manager = Mock()
+        self.import_jobs = Mock(ImportJobs)
+        self.bus = Mock()
+        self.service = Service(
+            {}, self.source_manager, self.crud, Mock(), self.import_jobs, self.bus
+        )
+        self._next_uuid = 0
+
+    def _create_contacts(self, tenant_uuid, user_uuid, contacts):
+        # contacts already stored, by hash, are given their stored id
+        for contact in contacts:
+            if contact.get('firstname') == 'Stored':
+                contact['id'] = STORED_UUID
+            elif 'id' not in contact:
+                self._next_uuid += 1
+                contact['id'] = f'new-{self._next_uuid}'
+        return contacts
+
+    def _start_import(self, rows):
+        self.service.start_import(rows, s.user_uuid, s.tenant_uuid)
+        _, _, _, import_batch, _ = self.import_jobs.submit.call_args.args
+        return import_batch
+
+    def test_start_import(self):
+        rows = [(2, {'firstname': 'Foo'})]
+
+        result = self.service.start_import(rows, s.user_uuid, s.tenant_uuid)
+
+        self.import_jobs.submit.assert_called_once_with(
+            s.tenant_uuid, {'user_uuid': s.user_uuid}, rows, ANY, ANY
+        )
+        assert_that(result, equal_to(self.import_jobs.submit.return_value))
+
+    def test_get_import(self):
+        result = self.service.get_import(s.job_uuid, s.user_uuid)
+
+        self.import_jobs.get.assert_called_once_with(
+            s.job_uuid, {'user_uuid': s.user_uuid}
+        )
+        assert_that(result, equal_to(self.import_jobs.get.return_value))
+
+    def test_errors_are_reported_with_their_line_number(self):
+        import_batch = self._start_import([])
+        rows = [
+            (2, {'firstname': 'Foo'}),
+            (3, {'': 'Bar'}),
+            (4, {'firstname': 'Baz', None: ['extra']}),
+        ]
+
+        created, errors, duplicates = import_batch(rows, 0)
+
+        self.crud.create_personal_contacts.assert_called_once_with(
+            s.tenant_uuid, s.user_uuid, [{'firstname': 'Foo', 'id': 'new-1'}]
+        )
+        assert_that(created, equal_to(1))
+        assert_that(
+            errors,
+            contains_exactly(
+                has_entries(line=3, errors=contains_exactly(contains_string('""'))),
+                has_entries(line=4, errors=['too many fields']),
+            ),
+        )
+        assert_that(duplicates, empty())
+        self.source_manager.invalidate_results.assert_called_once_with(
+            'personal', user_uuid=s.user_uuid
+        )
+
+    def test_only_the_inserted_contacts_are_counted(self):
+        import_batch = self._start_import([])
+        rows = [
+            (2, {'firstname': 'Foo'}),
+            (3, {'firstname': 'Stored'}),
+            (4, {'firstname': 'Foo'}),
+        ]
+
+        created, errors, duplicates = import_batch(rows, 0)
+
+        assert_that(created, equal_to(1))
+        assert_that(errors, empty())
+        assert_that(
+            duplicates,
+            contains_exactly(
+                has_entries(line=3, errors=['duplicate contact']),
+                has_entries(line=4, errors=['duplicate contact']),
+            ),
+        )
+
+    def test_contacts_are_imported_by_batch(self):
+        import_batch = self._start_import([])
+
+        first = import_batch([(2, {'id': 'c1', 'firstname': 'Foo'})], 0)
+        second = import_batch(
+            [(3, {'id': 'c1', 'firstname': 'Bar'}), (4, {'firstname': 'Baz'})], 1
+        )
+
+        self.crud.list_personal_contacts.assert_called_once_with()
+        assert_that(first, equal_to((1, [], [])))
+        # the id created by the first batch is known to the next ones
+        self.crud.create_personal_contacts.assert_called_with(
+            s.tenant_uuid, s.user_uuid, [{'firstname': 'Baz', 'id': 'new-1'}]
+        )
+        assert_that(
+            second,
+            contains_exactly(
+                1,
+                contains_exactly(
+                    has_entries(line=3, errors=['contact "c1" already exist'])
+                ),
+                empty(),
+            ),
+        )
+
+    def test_an_event_is_published_when_the_import_is_finished(self):
+        self.service.start_import([], s.user_uuid, s.tenant_uuid)
+        _, _, _, _, on_finished = self.import_jobs.submit.call_args.args
+        job = ImportJob(s.tenant_uuid, {'user_uuid': s.user_uuid}, 0)
+
+        on_finished(job)
+
+        self.bus.publish.assert_called_once_with(
+            instance_of(PersonalImportCompletedEvent)
+        )
@@ -25,6 +25,7 @@ from wazo_dird.exception import (
     InvalidContactException,
     InvalidPhonebookException,
     NoSuchContact,
+    NoSuchImportJob,
     NoSuchPhonebook,
     NoSuchTenant,
     PhonebookContactImportAPIError,
@@ -151,6 +152,54 @@ class PhonebookAll(_Resource):
         )
 
 
+def _read_contacts_csv() -> list[dict[str, Any]]:
+    charset = request.mimetype_params.get('charset', 'utf-8')
+    raw_data = cast(bytes, request.data)
+    logger.debug('len(raw_data)=%d', len(raw_data))
+    try:
+        data = raw_data.decode(charset).split('\n')
+    except LookupError as e:
+        if 'unknown encoding:' in str(e):
+            raise PhonebookContactImportAPIError(
+                message=f'bad input encoding: {str(e)}',
+                error_id='phonebook-contact-import-bad-encoding',
+                status_code=400,
+                details={'error': str(e), 'charset': charset},
+            )
+        else:
+            raise
+
+    reader = csv.DictReader(data)
+    fields = reader.fieldnames or []
+    duplicates = list({f for f in fields if fields.count(f) > 1})
+    if duplicates:
+        raise PhonebookContactImportAPIError(
+            message=f'duplicate columns: {duplicates}',
+            error_id='phonebook-contact-import-duplicate-columns',
+            status_code=400,
+            details={'duplicates': duplicates},
+        )
+
+    try:
+        to_add = [c for c in reader]
+    except csv.Error as e:
+        raise PhonebookContactImportAPIError(
+            message=f'invalid contact import file: {str(e)}',
+            error_id='phonebook-contact-import-invalid-file',
+            status_code=400,
+            details={'error': str(e)},
+        )
+
+    if not to_add:
+        raise PhonebookContactImportAPIError(
+            message='empty contact import file',
+            error_id='phonebook-contact-import-empty-file',
+            status_code=400,
+            details={'line_count': len(data), 'byte_count': len(raw_data)},
+        )
+    return to_add
+
+
 class PhonebookContactImport(_Resource):
     error_code_map = {NoSuchTenant: 404, NoSuchPhonebook: 404}
 
@@ -158,53 +207,9 @@ class PhonebookContactImport(_Resource):
     @_default_error_route
     def post(self, phonebook_uuid: UUID) -> tuple[dict[str, Any], int]:
         visible_tenants = get_tenant_uuids(recurse=False)
+        to_add = _read_contacts_csv()
 
-        charset = request.mimetype_params.get('charset', 'utf-8')
-        raw_data = cast(bytes, request.data)
-        logger.debug('len(raw_data)=%d', len(raw_data))
-        try:
-            data = raw_data.decode(charset).split('\n')
-        except LookupError as e:
-            if 'unknown encoding:' in str(e):
-                raise PhonebookContactImportAPIError(
-                    message=f'bad input encoding: {str(e)}',
-                    error_id='phonebook-contact-import-bad-encoding',
-                    status_code=400,
-                    details={'error': str(e), 'charset': charset},
-                )
-            else:
-                raise
-
-        reader = csv.DictReader(data)
-        fields = reader.fieldnames or []
-        duplicates = list({f for f in fields if fields.count(f) > 1})
-        if duplicates:
-            raise PhonebookContactImportAPIError(
-                message=f'duplicate columns: {duplicates}',
-                error_id='phonebook-contact-import-duplicate-columns',
-                status_code=400,
-                details={'duplicates': duplicates},
-            )
-
-        try:
-            to_add = [c for c in reader]
-        except csv.Error as e:
-            raise PhonebookContactImportAPIError(
-                message=f'invalid contact import file: {str(e)}',
-                error_id='phonebook-contact-import-invalid-file',
-                status_code=400,
-                details={'error': str(e)},
-            )
-
-        if not to_add:
-            raise PhonebookContactImportAPIError(
-                message='empty contact import file',
-                error_id='phonebook-contact-import-empty-file',
-                status_code=400,
-                details={'line_count': len(data), 'byte_count': len(raw_data)},
-            )
-
-        created, failed = self.phonebook_service.import_contacts(
+        created, failed, duplicates = self.phonebook_service.import_contacts(
             visible_tenants, PhonebookKey(uuid=str(phonebook_uuid)), to_add
         )
         if failed:
@@ -215,7 +220,36 @@ class PhonebookContactImport(_Resource):
                 details={'errors': failed},
             )
 
-        return {'created': created, 'failed': failed}, 201
+        return {'created': created, 'failed': failed, 'duplicates': duplicates}, 201
+
+
+class PhonebookContactImportJobAll(_Resource):
+    error_code_map = {NoSuchTenant: 404, NoSuchPhonebook: 404}
+
+    @required_acl('dird.phonebooks.{phonebook_uuid}.contacts.create')
+    @_default_error_route
+    def post(self, phonebook_uuid: UUID) -> tuple[dict[str, Any], int]:
+        visible_tenants = get_tenant_uuids(recurse=False)
+        to_add = _read_contacts_csv()
+
+        job = self.phonebook_service.start_import(
+            visible_tenants, PhonebookKey(uuid=str(phonebook_uuid)), to_add
+        )
+        return job.to_dict(), 202
+
+
+class PhonebookContactImportJobOne(_Resource):
+    error_code_map = {NoSuchTenant: 404, NoSuchPhonebook: 404, NoSuchImportJob: 404}
+
+    @required_acl('dird.phonebooks.{phonebook_uuid}.contacts.imports.{job_uuid}.read')
+    @_default_error_route
+    def get(self, phonebook_uuid: UUID, job_uuid: UUID) -> tuple[dict[str, Any], int]:
+        visible_tenants = get_tenant_uuids(recurse=False)
+
+        job = self.phonebook_service.get_import(
+            visible_tenants, PhonebookKey(uuid=str(phonebook_uuid)), str(job_uuid)
+        )
+        return job.to_dict(), 200
 
 
 class PhonebookContactOne(_Resource):
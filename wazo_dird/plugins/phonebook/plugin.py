@@ -1,4 +1,4 @@
-# Copyright 2016-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
@@ -14,6 +14,8 @@ from .http import (
     PhonebookAll,
     PhonebookContactAll,
     PhonebookContactImport,
+    PhonebookContactImportJobAll,
+    PhonebookContactImportJobOne,
     PhonebookContactOne,
     PhonebookOne,
 )
@@ -43,6 +45,16 @@ class PhonebookViewPlugin(BaseViewPlugin):
             '/phonebooks/<uuid:phonebook_uuid>/contacts/import',
             resource_class_args=args,
         )
+        api.add_resource(
+            PhonebookContactImportJobAll,
+            '/phonebooks/<uuid:phonebook_uuid>/contacts/imports',
+            resource_class_args=args,
+        )
+        api.add_resource(
+            PhonebookContactImportJobOne,
+            '/phonebooks/<uuid:phonebook_uuid>/contacts/imports/<uuid:job_uuid>',
+            resource_class_args=args,
+        )
         api.add_resource(
             PhonebookContactOne,
             '/phonebooks/<uuid:phonebook_uuid>/contacts/<contact_uuid>',
@@ -269,11 +269,15 @@ class DeprecatedPhonebookContactImport(_Resource):
             return _make_error(f'duplicate columns: {duplicates}', 400)
 
         to_add = [c for c in csv.DictReader(data)]
-        created, failed = self.phonebook_service.import_contacts(
+        created, failed, duplicate_contacts = self.phonebook_service.import_contacts(
             [matching_tenant['uuid']], PhonebookKey(id=phonebook_id), to_add
         )
 
-        return {'created': created, 'failed': failed}
+        return {
+            'created': created,
+            'failed': failed,
+            'duplicates': duplicate_contacts,
+        }
 
 
 class DeprecatedPhonebookContactOne(_Resource):
@@ -4,7 +4,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from marshmallow import Schema, ValidationError, fields, pre_load, validate
 
@@ -16,10 +16,22 @@ from wazo_dird.database.queries.phonebook import (
     PhonebookDict,
     PhonebookKey,
 )
-from wazo_dird.exception import InvalidContactException, InvalidPhonebookException
-from wazo_dird.plugin_helpers.sorting import sort_contacts
+from wazo_dird.exception import (
+    ContactCreationError,
+    InvalidContactException,
+    InvalidPhonebookException,
+)
+from wazo_dird.plugin_helpers.import_jobs import (
+    ImportJob,
+    ImportJobs,
+    PhonebookImportCompletedEvent,
+)
 from wazo_dird.plugin_manager import ServiceDependencies
 
+if TYPE_CHECKING:
+    from wazo_dird.bus import CoreBus
+    from wazo_dird.source_manager import SourceManager
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,20 +53,39 @@ class PhonebookServicePlugin(BaseServicePlugin):
             )
             raise ValueError(msg)
 
+        self._import_jobs: ImportJobs[dict[str, Any]] = ImportJobs.from_config(
+            'phonebook_import', self._config
+        )
         return _PhonebookService(
             database.PhonebookCRUD(Session),
             database.PhonebookContactCRUD(Session),
+            args.get('source_manager'),
+            self._import_jobs,
+            args.get('bus'),
         )
 
+    def unload(self) -> None:
+        self._import_jobs.stop()
+
 
 class _PhonebookService:
     def __init__(
         self,
         phonebook_crud: database.PhonebookCRUD,
         contact_crud: database.PhonebookContactCRUD,
+        source_manager: SourceManager | None = None,
+        import_jobs: ImportJobs[dict[str, Any]] | None = None,
+        bus: CoreBus | None = None,
     ):
         self._phonebook_crud: database.PhonebookCRUD = phonebook_crud
         self._contact_crud: database.PhonebookContactCRUD = contact_crud
+        self._source_manager = source_manager
+        self._import_jobs = import_jobs
+        self._bus = bus
+
+    def _contacts_changed(self) -> None:
+        if self._source_manager:
+            self._source_manager.invalidate_results('phonebook')
 
     def list_contacts(
         self,
@@ -67,22 +98,16 @@ class _PhonebookService:
         order_insensitive: bool = False,
         **params: Any,
     ) -> list[ContactInfo]:
-        results = self._contact_crud.list(
+        return self._contact_crud.list(
             visible_tenants,
             phonebook_key,
+            order=order,
+            direction=direction,
+            limit=limit,
+            offset=offset,
+            order_insensitive=order_insensitive,
             **params,
         )
-        sorted_results = cast(
-            list[ContactInfo],
-            sort_contacts(
-                cast('list[dict[str, Any]]', results),
-                order=order,
-                direction=direction,
-                order_insensitive=order_insensitive,
-            ),
-        )
-        start = offset or 0
-        return sorted_results[start : start + limit if limit else None]
 
     def list_phonebook(
         self, visible_tenants: list[str], **params: Any
@@ -111,9 +136,11 @@ class _PhonebookService:
         contact_info: dict[str, Any],
     ) -> ContactInfo:
         validated_contact = self._validate_contact(contact_info)
-        return self._contact_crud.create(
+        contact = self._contact_crud.create(
             visible_tenants, phonebook_key, validated_contact
         )
+        self._contacts_changed()
+        return contact
 
     def create_phonebook(
         self, tenant_uuid: str, phonebook_info: dict[str, Any]
@@ -131,12 +158,14 @@ class _PhonebookService:
         contact_uuid: str,
         contact_info: dict[str, Any],
     ) -> ContactInfo:
-        return self._contact_crud.edit(
+        contact = self._contact_crud.edit(
             visible_tenants,
             phonebook_key,
             contact_uuid,
             self._validate_contact(contact_info),
         )
+        self._contacts_changed()
+        return contact
 
     def edit_phonebook(
         self,
@@ -148,17 +177,25 @@ class _PhonebookService:
             body: dict[str, Any] = _PhonebookSchema().load(phonebook_info)
         except ValidationError as e:
             raise InvalidPhonebookException(e.messages)
-        return self._phonebook_crud.edit(visible_tenants, phonebook_key, body)
+        phonebook = self._phonebook_crud.edit(visible_tenants, phonebook_key, body)
+        self._contacts_changed()
+        return phonebook
 
     def delete_contact(
         self, visible_tenants: list[str], phonebook_key: PhonebookKey, contact_uuid: str
     ) -> None:
-        return self._contact_crud.delete(visible_tenants, phonebook_key, contact_uuid)
+        try:
+            return self._contact_crud.delete(
+                visible_tenants, phonebook_key, contact_uuid
+            )
+        finally:
+            self._contacts_changed()
 
     def delete_phonebook(
         self, visible_tenants: list[str], phonebook_key: PhonebookKey
     ) -> None:
         self._phonebook_crud.delete(visible_tenants, phonebook_key)
+        self._contacts_changed()
 
     def get_contact(
         self, visible_tenants: list[str], phonebook_key: PhonebookKey, contact_uuid: str
@@ -175,7 +212,12 @@ class _PhonebookService:
         visible_tenants: list[str],
         phonebook_key: PhonebookKey,
         contacts: list[dict[str, Any]],
-    ) -> tuple[list[ContactInfo], list[ContactEntryError]]:
+    ) -> tuple[list[ContactInfo], list[ContactEntryError], list[ContactEntryError]]:
+        """Create `contacts`, returning the created contacts, the invalid contacts
+        and the duplicates that were skipped
+
+        Nothing is created if a contact is invalid.
+        """
         logger.debug(
             'Processing import of %d contacts in phonebook %s',
             len(contacts),
@@ -194,13 +236,104 @@ class _PhonebookService:
                     )
                 )
         if errors:
-            return [], errors
+            return [], errors, []
 
-        created, failed = self._contact_crud.create_many(
+        created, duplicates = self._contact_crud.create_many(
             visible_tenants, phonebook_key, [contact for _, contact in to_add]
         )
+        if created:
+            self._contacts_changed()
+
+        return created, [], duplicates
+
+    def start_import(
+        self,
+        visible_tenants: list[str],
+        phonebook_key: PhonebookKey,
+        contacts: list[dict[str, Any]],
+    ) -> ImportJob:
+        assert self._import_jobs
+        phonebook = self._phonebook_crud.get(visible_tenants, phonebook_key)
+        tenant_uuid = phonebook['tenant_uuid']
+        key = PhonebookKey(uuid=phonebook['uuid'])
+        logger.debug(
+            'Starting import of %d contacts in phonebook %s', len(contacts), key
+        )
+
+        def import_batch(
+            batch: list[dict[str, Any]], start: int
+        ) -> tuple[int, list[dict[str, Any]], list[dict[str, Any]]]:
+            return self._import_batch(tenant_uuid, key, batch, start)
+
+        return self._import_jobs.submit(
+            tenant_uuid,
+            {'phonebook_uuid': phonebook['uuid']},
+            contacts,
+            import_batch,
+            self._import_finished,
+        )
+
+    def get_import(
+        self, visible_tenants: list[str], phonebook_key: PhonebookKey, job_uuid: str
+    ) -> ImportJob:
+        assert self._import_jobs
+        phonebook = self._phonebook_crud.get(visible_tenants, phonebook_key)
+        return self._import_jobs.get(job_uuid, {'phonebook_uuid': phonebook['uuid']})
+
+    def _import_batch(
+        self,
+        tenant_uuid: str,
+        phonebook_key: PhonebookKey,
+        contacts: list[dict[str, Any]],
+        start: int,
+    ) -> tuple[int, list[dict[str, Any]], list[dict[str, Any]]]:
+        # Unlike import_contacts, the valid contacts of a batch are created
+        # even if some of its contacts are invalid
+        to_add: list[tuple[int, dict[str, Any]]] = []
+        errors: list[ContactEntryError] = []
+        for i, contact in enumerate(contacts, start):
+            try:
+                to_add.append((i, self._validate_contact(contact)))
+            except InvalidContactException as ex:
+                errors.append(
+                    ContactEntryError(contact=contact, message=str(ex), index=i)
+                )
+
+        try:
+            created, duplicates = self._contact_crud.create_many(
+                [tenant_uuid], phonebook_key, [contact for _, contact in to_add]
+            )
+        except ContactCreationError as ex:
+            # contacts the database would reject, the others are created
+            rejected = {error['index']: error for error in ex.details['errors']}
+            for j, error in rejected.items():
+                errors.append(
+                    ContactEntryError(
+                        contact=error['contact'],
+                        message=error['message'],
+                        index=to_add[j][0],
+                    )
+                )
+            to_add = [row for j, row in enumerate(to_add) if j not in rejected]
+            created, duplicates = self._contact_crud.create_many(
+                [tenant_uuid], phonebook_key, [contact for _, contact in to_add]
+            )
+
+        # the indexes of the duplicates are the ones given to create_many
+        for duplicate in duplicates:
+            duplicate['index'] = to_add[duplicate['index']][0]
+
+        if created:
+            self._contacts_changed()
+        return (
+            len(created),
+            cast('list[dict[str, Any]]', errors),
+            cast('list[dict[str, Any]]', duplicates),
+        )
 
-        return created, failed
+    def _import_finished(self, job: ImportJob) -> None:
+        if self._bus:
+            self._bus.publish(PhonebookImportCompletedEvent(job))
 
     @staticmethod
     def _validate_contact(body: dict[str, Any]) -> dict[str, Any]:
@@ -1,8 +1,8 @@
-# Copyright 2016-2025 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2016-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import unittest
-from unittest.mock import Mock
+from unittest.mock import ANY, Mock
 from unittest.mock import sentinel as s
 
 from hamcrest import (
@@ -13,12 +13,22 @@ from hamcrest import (
     contains_string,
     equal_to,
     has_entries,
+    instance_of,
     raises,
 )
 
 from wazo_dird import database
 from wazo_dird.database.queries.phonebook import PhonebookKey
-from wazo_dird.exception import InvalidContactException, InvalidPhonebookException
+from wazo_dird.exception import (
+    ContactCreationError,
+    InvalidContactException,
+    InvalidPhonebookException,
+)
+from wazo_dird.plugin_helpers.import_jobs import (
+    ImportJob,
+    ImportJobs,
+    PhonebookImportCompletedEvent,
+)
 
 from ..plugin import PhonebookServicePlugin as Plugin
 from ..plugin import _PhonebookService as Service
@@ -39,7 +49,10 @@ class _BasePhonebookServiceTest(unittest.TestCase):
     def setUp(self):
         self.phonebook_crud = Mock(database.PhonebookCRUD)
         self.contact_crud = Mock(database.PhonebookContactCRUD)
-        self.service = Service(self.phonebook_crud, self.contact_crud)
+        self.source_manager = Mock()
+        self.service = Service(
+            self.phonebook_crud, self.contact_crud, self.source_manager
+        )
 
 
 class TestPhonebookPhonebookAPI(_BasePhonebookServiceTest):
@@ -235,182 +248,46 @@ class TestPhonebookServiceContactAPI(_BasePhonebookServiceTest):
 
 
 class TestPhonebookServiceContactList(_BasePhonebookServiceTest):
-    def setUp(self):
-        super().setUp()
-        self._manolo = {
-            'firstname': 'Manolo',
-            'lastname': 'Laporte-Carpentier',
-            'number': '5551111234',
-        }
-        self._annabelle = {
-            'firstname': 'Ännabelle',
-            'lastname': 'Courval',
-            'number': '5552221234',
-        }
-        self._gary_bob = {'firstname': 'Gary-Bob', 'lastname': 'Derome'}
-        self._antonin = {
-            'firstname': 'Antonin',
-            'lastname': 'Mongeau',
-            'number': '5554441234',
-        }
-        self._simon = {'firstname': 'Simon', 'lastname': "L'Espérance"}
-        self._contacts = [
-            self._manolo,
-            self._annabelle,
-            self._gary_bob,
-            self._antonin,
-            self._simon,
-        ]
-
-    def test_that_list_returns_the_db_result_when_no_pagination_or_sorting(self):
-        self.contact_crud.list.return_value = self._contacts
-
-        result = self.service.list_contacts(
-            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), search=s.search
-        )
-
-        self.contact_crud.list.assert_called_once_with(
-            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), search=s.search
-        )
-        assert_that(result, contains_exactly(*self._contacts))
-
-    def test_that_list_can_be_limited(self):
-        self.contact_crud.list.return_value = self._contacts
-
+    def test_that_list_returns_the_db_result(self):
         result = self.service.list_contacts(
-            [s.tenant_uuid],
-            PhonebookKey(uuid=s.phonebook_uuid),
-            search=s.search,
-            limit=2,
-        )
-
-        self.contact_crud.list.assert_called_once_with(
-            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), search=s.search
-        )
-        assert_that(result, contains_exactly(self._manolo, self._annabelle))
-
-    def test_that_list_can_have_an_offset(self):
-        self.contact_crud.list.return_value = self._contacts
-
-        result = self.service.list_contacts(
-            [s.tenant_uuid],
-            PhonebookKey(uuid=s.phonebook_uuid),
-            search=s.search,
-            offset=3,
-        )
-
-        self.contact_crud.list.assert_called_once_with(
-            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), search=s.search
-        )
-        assert_that(result, contains_exactly(self._antonin, self._simon))
-
-    def test_that_limit_and_offset_work_togeter(self):
-        self.contact_crud.list.return_value = self._contacts
-
-        result = self.service.list_contacts(
-            [s.tenant_uuid],
-            PhonebookKey(uuid=s.phonebook_uuid),
-            search=s.search,
-            offset=1,
-            limit=2,
-        )
-
-        self.contact_crud.list.assert_called_once_with(
             [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), search=s.search
         )
-        assert_that(result, contains_exactly(self._annabelle, self._gary_bob))
-
-    def test_that_results_can_be_ordered(self):
-        self.contact_crud.list.return_value = self._contacts
-
-        result = self.service.list_contacts(
-            [s.tenant_uuid],
-            PhonebookKey(uuid=s.phonebook_uuid),
-            search=s.search,
-            order='firstname',
-        )
 
         self.contact_crud.list.assert_called_once_with(
-            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), search=s.search
-        )
-        assert_that(
-            result,
-            contains_exactly(
-                self._annabelle,
-                self._antonin,
-                self._gary_bob,
-                self._manolo,
-                self._simon,
-            ),
-        )
-
-    def test_that_results_can_be_ordered_by_an_unknown_column_with_no_effect(self):
-        self.contact_crud.list.return_value = self._contacts
-
-        result = self.service.list_contacts(
             [s.tenant_uuid],
             PhonebookKey(uuid=s.phonebook_uuid),
+            order=None,
+            direction=None,
+            limit=None,
+            offset=None,
+            order_insensitive=False,
             search=s.search,
-            order='number',
-            direction='desc',
         )
+        assert_that(result, equal_to(self.contact_crud.list.return_value))
 
-        self.contact_crud.list.assert_called_once_with(
-            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), search=s.search
-        )
-        assert_that(
-            result,
-            contains_inanyorder(
-                self._manolo,
-                self._antonin,
-                self._annabelle,
-                self._gary_bob,  # no number
-                self._simon,
-            ),
-        )  # no number
-
-    def test_that_the_direction_can_be_specified(self):
-        self.contact_crud.list.return_value = self._contacts
-
+    def test_that_pagination_and_sorting_are_done_by_the_db(self):
         result = self.service.list_contacts(
             [s.tenant_uuid],
             PhonebookKey(uuid=s.phonebook_uuid),
             search=s.search,
-            order='firstname',
+            order='lastname',
             direction='desc',
+            limit=3,
+            offset=1,
+            order_insensitive=True,
         )
 
         self.contact_crud.list.assert_called_once_with(
-            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), search=s.search
-        )
-        assert_that(
-            result,
-            contains_exactly(
-                self._simon,
-                self._manolo,
-                self._gary_bob,
-                self._antonin,
-                self._annabelle,
-            ),
-        )
-
-    def test_all(self):
-        self.contact_crud.list.return_value = self._contacts
-
-        result = self.service.list_contacts(
             [s.tenant_uuid],
             PhonebookKey(uuid=s.phonebook_uuid),
-            search=s.search,
             order='lastname',
             direction='desc',
             limit=3,
             offset=1,
+            order_insensitive=True,
+            search=s.search,
         )
-
-        self.contact_crud.list.assert_called_once_with(
-            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), search=s.search
-        )
-        assert_that(result, contains_exactly(self._manolo, self._simon, self._gary_bob))
+        assert_that(result, equal_to(self.contact_crud.list.return_value))
 
 
 class TestPhonebookServiceContactImport(_BasePhonebookServiceTest):
@@ -420,11 +297,12 @@ class TestPhonebookServiceContactImport(_BasePhonebookServiceTest):
 
         invalids: list[dict] = [{}, {'': 'test'}, {'firstname': 'Foo', None: ['extra']}]
         contacts: list[dict] = invalids + [{'firstname': 'Foo'}]
-        created, errors = self.service.import_contacts(
+        created, errors, duplicates = self.service.import_contacts(
             s.tenant_uuid, PhonebookKey(uuid=s.phonebook_uuid), contacts
         )
 
         assert_that(created, equal_to([]))
+        assert_that(duplicates, equal_to([]))
         self.contact_crud.create_many.assert_not_called()
 
         assert_that(
@@ -443,32 +321,36 @@ class TestPhonebookServiceContactImport(_BasePhonebookServiceTest):
             ),
         )
 
-    def test_import_with_database_error(self):
-        db_errors = [
-            {
-                'index': 1,
-                'contact': s.contact_1,
-                'message': s.message_1,
-            }
-        ]
-        self.contact_crud.create_many.return_value = [s.created1, s.created2], db_errors
-
+    def test_import_with_duplicates(self):
         contacts: list[dict] = [
             {'firstname': 'Foo'},
             {'firstname': 'Foo'},
             {'firstname': 'Bar'},
         ]
-        created, errors = self.service.import_contacts(
+        db_duplicates = [
+            {
+                'index': 1,
+                'contact': contacts[1],
+                'message': 'Duplicate contact',
+            }
+        ]
+        self.contact_crud.create_many.return_value = (
+            [s.created1, s.created2],
+            db_duplicates,
+        )
+
+        created, errors, duplicates = self.service.import_contacts(
             s.tenant_uuid, PhonebookKey(uuid=s.phonebook_uuid), contacts
         )
-        assert len(created) + len(errors) == len(contacts)
+        assert len(created) + len(duplicates) == len(contacts)
         self.contact_crud.create_many.assert_called_once()
 
         assert_that(created, equal_to([s.created1, s.created2]))
+        assert_that(errors, equal_to([]))
         assert_that(
-            errors,
-            contains_inanyorder(
-                has_entries(contact=s.contact_1, message=s.message_1, index=1)
+            duplicates,
+            contains_exactly(
+                has_entries(contact=contacts[1], message='Duplicate contact', index=1)
             ),
         )
 
@@ -488,7 +370,7 @@ class TestPhonebookServiceContactImport(_BasePhonebookServiceTest):
         ]
         self.contact_crud.create_many.return_value = [s.created1], db_errors
 
-        created, errors = self.service.import_contacts(
+        created, errors, _ = self.service.import_contacts(
             s.tenant_uuid, PhonebookKey(uuid=s.phonebook_uuid), contacts
         )
         self.contact_crud.create_many.assert_not_called()
@@ -502,3 +384,166 @@ class TestPhonebookServiceContactImport(_BasePhonebookServiceTest):
                 ),
             ),
         )
+
+
+class TestPhonebookServiceImportJob(_BasePhonebookServiceTest):
+    def setUp(self):
+        super().setUp()
+        self.import_jobs = Mock(ImportJobs)
+        self.bus = Mock()
+        self.service = Service(
+            self.phonebook_crud,
+            self.contact_crud,
+            self.source_manager,
+            self.import_jobs,
+            self.bus,
+        )
+        self.phonebook_crud.get.return_value = {
+            'uuid': s.phonebook_uuid,
+            'tenant_uuid': s.tenant_uuid,
+        }
+
+    def _import_batch(self, contacts, start):
+        self.service.start_import(
+            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), contacts
+        )
+        _, _, _, import_batch, _ = self.import_jobs.submit.call_args.args
+        return import_batch(contacts, start)
+
+    def test_start_import(self):
+        contacts: list[dict] = [{'firstname': 'Foo'}]
+
+        result = self.service.start_import(
+            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), contacts
+        )
+
+        self.phonebook_crud.get.assert_called_once_with(
+            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid)
+        )
+        self.import_jobs.submit.assert_called_once_with(
+            s.tenant_uuid,
+            {'phonebook_uuid': s.phonebook_uuid},
+            contacts,
+            ANY,
+            ANY,
+        )
+        assert_that(result, equal_to(self.import_jobs.submit.return_value))
+
+    def test_get_import(self):
+        result = self.service.get_import(
+            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), s.job_uuid
+        )
+
+        self.import_jobs.get.assert_called_once_with(
+            s.job_uuid, {'phonebook_uuid': s.phonebook_uuid}
+        )
+        assert_that(result, equal_to(self.import_jobs.get.return_value))
+
+    def test_valid_contacts_of_a_batch_are_created(self):
+        self.contact_crud.create_many.return_value = [s.created], []
+        contacts: list[dict] = [{'firstname': 'Foo'}, {'': 'Bar'}]
+
+        created, errors, _ = self._import_batch(contacts, 1000)
+
+        self.contact_crud.create_many.assert_called_once_with(
+            [s.tenant_uuid],
+            PhonebookKey(uuid=s.phonebook_uuid),
+            [{'firstname': 'Foo'}],
+        )
+        assert_that(created, equal_to(1))
+        assert_that(
+            errors,
+            contains_inanyorder(
+                has_entries(
+                    contact=contacts[1], message=contains_string('empty'), index=1001
+                )
+            ),
+        )
+        self.source_manager.invalidate_results.assert_called_once_with('phonebook')
+
+    def test_contacts_rejected_by_the_database_are_skipped(self):
+        contacts: list[dict] = [{'firstname': 'Foo'}, {'firstname': 'Bar'}]
+        error = {'contact': contacts[1], 'message': s.message, 'index': 1}
+        self.contact_crud.create_many.side_effect = [
+            ContactCreationError('error', details={'errors': [error]}),
+            ([s.created], []),
+        ]
+
+        created, errors, _ = self._import_batch(contacts, 1000)
+
+        self.contact_crud.create_many.assert_called_with(
+            [s.tenant_uuid],
+            PhonebookKey(uuid=s.phonebook_uuid),
+            [{'firstname': 'Foo'}],
+        )
+        assert_that(created, equal_to(1))
+        assert_that(
+            errors,
+            contains_inanyorder(
+                has_entries(contact=contacts[1], message=s.message, index=1001)
+            ),
+        )
+
+    def test_duplicates_are_reported_with_their_index_in_the_file(self):
+        contacts: list[dict] = [
+            {'': 'Foo'},
+            {'firstname': 'Bar'},
+            {'firstname': 'Bar'},
+        ]
+        duplicate = {'contact': contacts[2], 'message': 'Duplicate contact', 'index': 1}
+        self.contact_crud.create_many.return_value = [s.created], [duplicate]
+
+        created, _, duplicates = self._import_batch(contacts, 1000)
+
+        assert_that(created, equal_to(1))
+        assert_that(
+            duplicates,
+            contains_exactly(
+                has_entries(
+                    contact=contacts[2], message='Duplicate contact', index=1002
+                )
+            ),
+        )
+
+    def test_an_event_is_published_when_the_import_is_finished(self):
+        self.service.start_import(
+            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), []
+        )
+        _, _, _, _, on_finished = self.import_jobs.submit.call_args.args
+        job = ImportJob(s.tenant_uuid, {'phonebook_uuid': s.phonebook_uuid}, 0)
+
+        on_finished(job)
+
+        self.bus.publish.assert_called_once_with(
+            instance_of(PhonebookImportCompletedEvent)
+        )
+
+
+class TestPhonebookServiceResultsInvalidation(_BasePhonebookServiceTest):
+    def test_create_contact_invalidates_results(self):
+        self.service.create_contact(
+            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), {'firstname': 'a'}
+        )
+
+        self.source_manager.invalidate_results.assert_called_once_with('phonebook')
+
+    def test_delete_phonebook_invalidates_results(self):
+        self.service.delete_phonebook(
+            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid)
+        )
+
+        self.source_manager.invalidate_results.assert_called_once_with('phonebook')
+
+    def test_failed_import_does_not_invalidate_results(self):
+        self.service.import_contacts(
+            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), [{}]
+        )
+
+        self.source_manager.invalidate_results.assert_not_called()
+
+    def test_no_source_manager(self):
+        service = Service(self.phonebook_crud, self.contact_crud)
+
+        service.delete_contact(
+            [s.tenant_uuid], PhonebookKey(uuid=s.phonebook_uuid), s.contact_uuid
+        )
@@ -4,16 +4,47 @@
 from __future__ import annotations
 
 import logging
-from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError, as_completed
+from concurrent.futures import Future, TimeoutError, as_completed
 from typing import Any
 
-from wazo_dird import BaseServicePlugin, BaseSourcePlugin, helpers
+from wazo_bus.resources.conference.event import (
+    ConferenceCreatedEvent,
+    ConferenceDeletedEvent,
+    ConferenceEditedEvent,
+)
+from wazo_bus.resources.user.event import (
+    UserCreatedEvent,
+    UserDeletedEvent,
+    UserEditedEvent,
+)
+from xivo.status import Status, StatusDict
+
+from wazo_dird import BaseServicePlugin, BaseSourcePlugin, helpers, metrics
+from wazo_dird.bulkhead import Bulkheads
+from wazo_dird.bus import CoreBus
+from wazo_dird.cache import SHARED_BACKENDS, TTLCache
+from wazo_dird.circuit_breaker import CircuitBreakers
 from wazo_dird.helpers import ProfileConfig
 from wazo_dird.plugin_manager import ServiceDependencies
 from wazo_dird.plugins.source_result import _SourceResult as SourceResult
 
 logger = logging.getLogger(__name__)
 
+# Events changing the content of the wazo and conference sources
+CACHE_FLUSHING_EVENTS = (
+    UserCreatedEvent,
+    UserEditedEvent,
+    UserDeletedEvent,
+    ConferenceCreatedEvent,
+    ConferenceEditedEvent,
+    ConferenceDeletedEvent,
+)
+
+# (profile, user_uuid, exten)
+CacheKey = tuple[str, str | None, str]
+
+_NOT_CACHED = object()
+
 
 class ReverseServicePlugin(BaseServicePlugin):
     def __init__(self) -> None:
@@ -25,6 +56,7 @@ class ReverseServicePlugin(BaseServicePlugin):
                 dependencies['config'],
                 dependencies['source_manager'],
                 dependencies['controller'],
+                bus=dependencies.get('bus'),
             )
             return self._service
         except KeyError:
@@ -43,7 +75,7 @@ class ReverseServicePlugin(BaseServicePlugin):
 class _ReverseService(helpers.BaseService):
     _service_name = 'reverse'
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+    def __init__(self, *args: Any, bus: CoreBus | None = None, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         http_threads = self._config.get('rest_api', {}).get('max_threads', 10)
         executor_workers = self._config.get('reverse_service', {}).get(
@@ -51,11 +83,116 @@ class _ReverseService(helpers.BaseService):
         )
         max_workers = executor_workers if executor_workers is not None else http_threads
         logger.info('Creating reverse service threadpool [max_workers=%d]', max_workers)
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._executor = metrics.InstrumentedThreadPoolExecutor(
+            self._service_name, max_workers=max_workers
+        )
+        self._bulkheads = Bulkheads(
+            self._config.get('reverse_service', {}).get('source_concurrency')
+        )
+        self._breakers = CircuitBreakers(
+            self._config.get('reverse_service', {}).get('circuit_breaker')
+        )
+        if self._breakers.enabled:
+            self._controller.status_aggregator.add_provider(
+                self.provide_circuit_breaker_status
+            )
+
+        cache_config = self._config.get('reverse_service', {}).get('cache') or {}
+        self._cache: TTLCache[CacheKey, SourceResult | None] | None = None
+        if cache_config.get('enabled'):
+            self._miss_ttl = cache_config.get('miss_ttl', 10)
+            self._cache = TTLCache(
+                ttl=cache_config.get('hit_ttl', 60),
+                max_size=cache_config.get('max_size', 10000),
+            )
+            self._source_manager.subscribe_to_invalidation(self._invalidate_cache)
+            self._controller.status_aggregator.add_provider(self.provide_status)
+            if bus:
+                for event in CACHE_FLUSHING_EVENTS:
+                    bus.subscribe(event.name, self._on_cache_flushing_event)
 
     def stop(self) -> None:
         self._executor.shutdown()
 
+    def provide_status(self, status: StatusDict) -> None:
+        assert self._cache
+        status['reverse_cache'] = {'status': Status.ok, **self._cache.stats()}
+
+    def provide_circuit_breaker_status(self, status: StatusDict) -> None:
+        status['reverse_circuit_breakers'] = {
+            'status': Status.ok,
+            'sources': self._breakers.status(),
+        }
+
+    def _invalidate_cache(
+        self,
+        source_uuid: str | None = None,
+        backend: str | None = None,
+        user_uuid: str | None = None,
+    ) -> None:
+        assert self._cache
+        if backend in SHARED_BACKENDS or user_uuid is None:
+            self._cache.clear()
+        else:
+            self._cache.invalidate(lambda key: key[1] == user_uuid)
+
+    def _on_cache_flushing_event(self, payload: dict[str, Any]) -> None:
+        assert self._cache
+        logger.debug('Flushing the reverse lookup cache')
+        self._cache.clear()
+
+    @staticmethod
+    def _cache_scope(
+        profile_config: ProfileConfig,
+        profile: str,
+        sources: list[BaseSourcePlugin],
+        user_uuid: str | None,
+    ) -> tuple[str, str | None]:
+        if all(source.backend in SHARED_BACKENDS for source in sources):
+            user_uuid = None
+        return profile_config.get('uuid') or profile, user_uuid
+
+    def _cache_result(
+        self,
+        key: CacheKey,
+        result: SourceResult | None,
+        complete: bool,
+        raise_stoppers: list[helpers.RaiseStopper],
+    ) -> None:
+        if self._cache is None:
+            return
+        if result is not None:
+            self._cache.set(key, result)
+        elif complete and not any(stopper.raised for stopper in raise_stoppers):
+            # Only remember a number as unknown when every source answered
+            self._cache.set(key, None, ttl=self._miss_ttl)
+
+    def _acquire(self, source_uuid: str, source: BaseSourcePlugin) -> bool:
+        if not self._bulkheads.acquire(source_uuid, source.backend):
+            logger.warning(
+                'Too many pending reverse lookups on source %s, skipping it',
+                source.name,
+            )
+            metrics.SOURCE_REJECTIONS.inc(self._service_name, source.name)
+            return False
+        if not self._breakers.allow(source_uuid, source):
+            self._bulkheads.release(source_uuid)
+            return False
+        return True
+
+    def _track(
+        self,
+        source_uuid: str,
+        source: BaseSourcePlugin,
+        future: Future,
+        raise_stopper: helpers.RaiseStopper,
+    ) -> None:
+        self._bulkheads.release_when_done(source_uuid, future)
+        self._breakers.track(source_uuid, source, future, raise_stopper)
+
+    def _count_timeouts(self, futures: list[Future]) -> None:
+        metrics.count_timeouts(self._service_name, [f for f in futures if not f.done()])
+
     @staticmethod
     def _cancel_pending(futures: list[Future]) -> None:
         pending = [f for f in futures if not f.done()]
@@ -75,48 +212,91 @@ class _ReverseService(helpers.BaseService):
     ) -> list[SourceResult | None]:
         args = args or {}
         futures = []
-        sources = self.source_from_profile(profile_config)
+        raise_stoppers = []
+        source_items = self.source_items_from_profile(profile_config)
+        sources = [source for _, source in source_items]
+        scope = self._cache_scope(profile_config, profile, sources, user_uuid)
+
+        results: dict[str, SourceResult | None] = {exten: None for exten in extens}
+        missing = list(results)
+        if self._cache is not None:
+            missing = []
+            for exten in results:
+                cached = self._cache.get((*scope, exten), _NOT_CACHED)
+                if cached is _NOT_CACHED:
+                    missing.append(exten)
+                else:
+                    results[exten] = cached
+            if not missing:
+                return [value for value in results.values()]
+
         logger.debug(
             'Reverse lookup for %s in sources %s',
-            extens,
+            missing,
             [source.name for source in sources],
         )
-        for source in sources:
+        rejected = False
+        for source_uuid, source in source_items:
+            if not self._acquire(source_uuid, source):
+                rejected = True
+                continue
             args['token'] = token
             args['user_uuid'] = user_uuid
             # To avoid breaking plugins which used the xivo_user_uuid and reverse fallback
             args['xivo_user_uuid'] = user_uuid
-            futures.append(self._async_reverse_many(source, extens, args))
+            raise_stopper: helpers.RaiseStopper[
+                dict[str, SourceResult] | None
+            ] = helpers.RaiseStopper(return_on_raise=None)
+            raise_stoppers.append(raise_stopper)
+            future = self._async_reverse_many(source, missing, args, raise_stopper)
+            self._track(source_uuid, source, future, raise_stopper)
+            futures.append(future)
 
         service_config = self.get_service_config(profile_config)
         timeout: float | None = (service_config.get('options') or {}).get(
             'timeout'
         ) or 1
 
-        results: dict[str, SourceResult | None] = {exten: None for exten in extens}
+        complete = False
         try:
             for future in as_completed(futures, timeout=timeout):
                 if result := future.result():
                     results.update(result)
-                    if all(result is not None for result in results.values()):
+                    if all(results[exten] is not None for exten in missing):
                         self._cancel_pending(futures)
                         break
+            else:
+                complete = not rejected
         except TimeoutError:
             logger.warning(
                 'Timeout on reverse many lookup, returning partial results (extens=%s)',
                 extens,
             )
+            self._count_timeouts(futures)
+            self._breakers.timed_out(futures)
             self._cancel_pending(futures)
+
+        for exten in missing:
+            self._cache_result(
+                (*scope, exten), results[exten], complete, raise_stoppers
+            )
         return [value for value in results.values()]
 
     def _async_reverse_many(
-        self, source: BaseSourcePlugin, extens: list[str], args: dict[str, Any]
+        self,
+        source: BaseSourcePlugin,
+        extens: list[str],
+        args: dict[str, Any],
+        raise_stopper: helpers.RaiseStopper[dict[str, SourceResult] | None]
+        | None = None,
     ) -> Future[dict[str, SourceResult] | None]:
-        raise_stopper: helpers.RaiseStopper[
-            dict[str, SourceResult] | None
-        ] = helpers.RaiseStopper(return_on_raise=None)
+        if raise_stopper is None:
+            raise_stopper = helpers.RaiseStopper(return_on_raise=None)
         future = self._executor.submit(
-            raise_stopper.execute, source.match_all, extens, args
+            metrics.instrument(self._service_name, source, raise_stopper),
+            source.match_all,
+            extens,
+            args,
         )
         setattr(future, 'name', source.name)
         return future
@@ -132,41 +312,77 @@ class _ReverseService(helpers.BaseService):
     ) -> SourceResult | None:
         args = args or {}
         futures = []
-        sources = self.source_from_profile(profile_config)
+        raise_stoppers = []
+        source_items = self.source_items_from_profile(profile_config)
+        sources = [source for _, source in source_items]
+        key: CacheKey = (
+            *self._cache_scope(profile_config, profile, sources, user_uuid),
+            exten,
+        )
+        if self._cache is not None:
+            cached = self._cache.get(key, _NOT_CACHED)
+            if cached is not _NOT_CACHED:
+                return cached
+
         logger.debug(
             'Reverse lookup for %s in sources %s',
             exten,
             [source.name for source in sources],
         )
-        for source in sources:
+        rejected = False
+        for source_uuid, source in source_items:
+            if not self._acquire(source_uuid, source):
+                rejected = True
+                continue
             args['token'] = token
             args['user_uuid'] = user_uuid
             # To avoid breaking plugins which used the xivo_user_uuid
             args['xivo_user_uuid'] = user_uuid
-            futures.append(self._async_reverse(source, exten, args))
+            raise_stopper: helpers.RaiseStopper[
+                SourceResult | None
+            ] = helpers.RaiseStopper(return_on_raise=None)
+            raise_stoppers.append(raise_stopper)
+            future = self._async_reverse(source, exten, args, raise_stopper)
+            self._track(source_uuid, source, future, raise_stopper)
+            futures.append(future)
 
         service_config = self.get_service_config(profile_config)
         timeout: float | None = (service_config.get('options') or {}).get(
             'timeout'
         ) or 1
 
+        result = None
+        complete = False
         try:
             for future in as_completed(futures, timeout=timeout):
                 if result := future.result():
                     self._cancel_pending(futures)
-                    return result
+                    break
+            else:
+                complete = not rejected
         except TimeoutError:
             logger.warning('Timeout on reverse lookup for exten: %s', exten)
+            self._count_timeouts(futures)
+            self._breakers.timed_out(futures)
             self._cancel_pending(futures)
 
+        self._cache_result(key, result, complete, raise_stoppers)
+        return result
+
     def _async_reverse(
-        self, source: BaseSourcePlugin, exten: str, args: dict[str, Any]
+        self,
+        source: BaseSourcePlugin,
+        exten: str,
+        args: dict[str, Any],
+        raise_stopper: helpers.RaiseStopper[SourceResult | None] | None = None,
     ) -> Future[SourceResult | None]:
-        raise_stopper: helpers.RaiseStopper[SourceResult | None] = helpers.RaiseStopper(
-            return_on_raise=None
-        )
+        if raise_stopper is None:
+            raise_stopper = helpers.RaiseStopper(return_on_raise=None)
         future = self._executor.submit(
-            raise_stopper.execute, source.first_match, exten, args
+            metrics.instrument(self._service_name, source, raise_stopper),
+            source.first_match,
+            exten,
+            args,
         )
         setattr(future, 'name', source.name)
         return future
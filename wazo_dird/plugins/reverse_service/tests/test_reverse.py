@@ -1,9 +1,12 @@
 # Copyright 2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import threading
 import unittest
 from typing import cast
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch, sentinel
+
+from hamcrest import assert_that, contains_exactly, equal_to, none
 
 from wazo_dird.helpers import ProfileConfig
 
@@ -193,3 +196,147 @@ class TestReverseTimeout(unittest.TestCase):
         service.reverse_many(_PROFILE_WITH_SOURCE, ['1234'], 'test')
 
         future.cancel.assert_called_once()
+
+
+class TestReverseCache(unittest.TestCase):
+    def setUp(self):
+        self.source = Mock(backend='phonebook')
+        self.source.first_match.return_value = None
+        self.source.first_match.__name__ = 'first_match'
+        self.source.match_all.return_value = {}
+        self.source_manager = Mock()
+        self.source_manager.get.return_value = self.source
+        self.bus = Mock()
+        config = {'reverse_service': {'cache': {'enabled': True}}}
+        self.service = _ReverseService(
+            config=config,
+            source_manager=self.source_manager,
+            controller=Mock(),
+            bus=self.bus,
+        )
+
+    def tearDown(self):
+        self.service.stop()
+
+    def test_hits_are_kept(self):
+        self.source.first_match.return_value = sentinel.result
+
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test', user_uuid='u1')
+        result = self.service.reverse(
+            _PROFILE_WITH_SOURCE, '1234', 'test', user_uuid='u2'
+        )
+
+        assert_that(result, equal_to(sentinel.result))
+        self.source.first_match.assert_called_once()
+
+    def test_misses_are_kept(self):
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test')
+        result = self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test')
+
+        assert_that(result, none())
+        self.source.first_match.assert_called_once()
+
+    def test_misses_are_not_kept_when_a_source_fails(self):
+        self.source.first_match.side_effect = [Exception, None]
+
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test')
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test')
+
+        assert_that(self.source.first_match.call_count, equal_to(2))
+
+    def test_misses_are_not_kept_when_a_source_is_rejected(self):
+        config = {
+            'reverse_service': {
+                'cache': {'enabled': True},
+                'source_concurrency': {'default': 0},
+            }
+        }
+        service = _ReverseService(
+            config=config, source_manager=self.source_manager, controller=Mock()
+        )
+
+        service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test')
+        service.stop()
+
+        self.source.first_match.assert_not_called()
+        assert_that(len(service._cache), equal_to(0))
+
+    def test_timed_out_sources_are_skipped_when_their_circuit_is_open(self):
+        release = threading.Event()
+        self.source.first_match.side_effect = lambda exten, args: release.wait()
+        config = {
+            'reverse_service': {
+                'cache': {'enabled': True},
+                'circuit_breaker': {'enabled': True, 'failure_threshold': 1},
+            }
+        }
+        service = _ReverseService(
+            config=config, source_manager=self.source_manager, controller=Mock()
+        )
+        profile = cast(
+            ProfileConfig,
+            {
+                'name': 'test',
+                'services': {
+                    'reverse': {
+                        'sources': [{'uuid': _SOURCE_UUID}],
+                        'options': {'timeout': 0.1},
+                    }
+                },
+            },
+        )
+
+        service.reverse(profile, '1234', 'test')
+        service.reverse(profile, '1234', 'test')
+        release.set()
+        service.stop()
+
+        self.source.first_match.assert_called_once()
+        assert_that(len(service._cache), equal_to(0))
+
+    def test_personal_results_are_kept_per_user(self):
+        self.source.backend = 'personal'
+        self.source.first_match.return_value = sentinel.result
+
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test', user_uuid='u1')
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test', user_uuid='u2')
+
+        assert_that(self.source.first_match.call_count, equal_to(2))
+
+    def test_reverse_many_uses_the_cache(self):
+        self.source.first_match.return_value = sentinel.result
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test')
+        self.source.match_all.return_value = {'5678': sentinel.other}
+
+        results = self.service.reverse_many(
+            _PROFILE_WITH_SOURCE, ['1234', '5678', '0000'], 'test'
+        )
+        assert_that(results, contains_exactly(sentinel.result, sentinel.other, None))
+        self.source.match_all.assert_called_once_with(['5678', '0000'], ANY)
+
+        results = self.service.reverse_many(
+            _PROFILE_WITH_SOURCE, ['1234', '5678', '0000'], 'test'
+        )
+        assert_that(results, contains_exactly(sentinel.result, sentinel.other, None))
+        self.source.match_all.assert_called_once()
+
+    def test_bus_events_flush_the_cache(self):
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test')
+        event_name, handler = self.bus.subscribe.call_args_list[0][0]
+
+        handler({'uuid': 'user-uuid'})
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test')
+
+        assert_that(self.source.first_match.call_count, equal_to(2))
+
+    def test_personal_invalidation(self):
+        self.source.backend = 'personal'
+        (invalidate,), _ = self.source_manager.subscribe_to_invalidation.call_args
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test', user_uuid='u1')
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test', user_uuid='u2')
+
+        invalidate(backend='personal', user_uuid='u1')
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test', user_uuid='u1')
+        self.service.reverse(_PROFILE_WITH_SOURCE, '1234', 'test', user_uuid='u2')
+
+        assert_that(self.source.first_match.call_count, equal_to(3))
@@ -1,19 +1,25 @@
-# Copyright 2014-2023 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2014-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
 
 import logging
-from collections.abc import Iterable, Iterator
+from collections.abc import Callable, Iterator, Sequence
 from typing import Any, cast
 
 from requests.exceptions import ConnectionError, RequestException
-from unidecode import unidecode
+from wazo_bus.resources.user.event import (
+    UserCreatedEvent,
+    UserDeletedEvent,
+    UserEditedEvent,
+)
 from wazo_confd_client import Client as ConfdClient
 
 from wazo_dird import BaseSourcePlugin, make_result_class
+from wazo_dird.bus import CoreBus
 from wazo_dird.helpers import BackendViewDependencies, BaseBackendView
 from wazo_dird.plugin_helpers.confd_client_registry import registry
+from wazo_dird.plugin_helpers.snapshot import SourceSnapshot, invalidate_on_event
 from wazo_dird.plugins.base_plugins import SourcePluginDependencies
 from wazo_dird.plugins.source_result import _SourceResult as SourceResult
 
@@ -21,6 +27,8 @@ from . import http
 
 logger = logging.getLogger(__name__)
 
+USER_EVENTS = (UserCreatedEvent, UserEditedEvent, UserDeletedEvent)
+
 
 class WazoUserView(BaseBackendView):
     backend = 'wazo'
@@ -55,17 +63,22 @@ class WazoUserPlugin(BaseSourcePlugin):
         'mobile_phone_number',
         'voicemail_number',
     ]
-    _match_all_supported_columns = ['exten', 'mobile_phone_number']
+    # Changes not announced by a user event (e.g. a new line extension) are
+    # only seen once the snapshot is older than this
+    SNAPSHOT_MAX_AGE = 300
 
     _client: ConfdClient | None
     _searched_columns: list[str]
     _first_matched_columns: list[str]
     _SourceResult: type[SourceResult]
+    _snapshot: SourceSnapshot
+    _on_user_event: Callable[[dict[str, Any]], None]
 
     def __init__(self) -> None:
         self._client = None
         self._uuid: str | None = None
         self._search_params: dict[str, Any] = {'view': 'directory', 'recurse': True}
+        self._bus: CoreBus | None = None
 
     def load(self, dependencies: SourcePluginDependencies) -> None:
         config = dependencies['config']
@@ -80,109 +93,60 @@ class WazoUserPlugin(BaseSourcePlugin):
         self._search_params.update(
             cast('dict[str, Any]', config.get('extra_search_params', {}))
         )
+        self._snapshot = self._new_snapshot()
+        self._on_user_event = invalidate_on_event(self._snapshot)
+        self._bus = dependencies.get('bus')
+        if self._bus:
+            for event in USER_EVENTS:
+                self._bus.subscribe(event.name, self._on_user_event)
         logger.info('Wazo %s successfully loaded', config['name'])
 
     def unload(self) -> None:
+        if self._bus:
+            for event in USER_EVENTS:
+                self._bus.unsubscribe(event.name, self._on_user_event)
         registry.unregister_all()
 
+    def _new_snapshot(self) -> SourceSnapshot:
+        return SourceSnapshot(
+            self.name,
+            self._fetch_entries,
+            self._searched_columns,
+            self._first_matched_columns,
+            self.SNAPSHOT_MAX_AGE,
+        )
+
     def search(  # type: ignore[override]
         self,
         term: str,
         profile: Any | None = None,
         args: dict[str, Any] | None = None,
     ) -> list[SourceResult]:
-        clean_term = unidecode(term.lower())
-        entries = self._fetch_entries(term)
-
-        def match_fn(entry: SourceResult) -> bool:
-            for column in self._searched_columns:
-                column_value = entry.fields.get(column) or ''
-                clean_column_value = unidecode(str(column_value).lower())
-                logger.debug(
-                    'entry\'s cleaned value for search column %s: %r',
-                    column,
-                    clean_column_value,
-                )
-
-                if clean_term in clean_column_value:
-                    return True
-            return False
-
-        return [entry for entry in entries if match_fn(entry)]
+        return self._snapshot.search(term)
 
     def first_match(
         self, term: str, args: dict[str, Any] | None = None
     ) -> SourceResult | None:
         logger.debug('Looking for "%s"', term)
-        entries = self._fetch_entries(term)
-
-        def match_fn(entry: SourceResult) -> bool:
-            for column in self._first_matched_columns:
-                if term == entry.fields.get(column):
-                    return True
-            return False
-
-        for entry in entries:
-            if match_fn(entry):
-                logger.debug('Found a match: %s', entry)
-                return entry
-        logger.debug('Found no match')
-        return None
+        return self._snapshot.first_match(term)
 
     def match_all(
         self, terms: list[str], args: dict[str, Any] | None = None
     ) -> dict[str, SourceResult]:
-        results: dict[str, SourceResult] = {}
-
-        # NOTE(fblackburn) fallback if one of fields are not supported
-        supported = all(
-            column in self._match_all_supported_columns
-            for column in self._first_matched_columns
-        )
-        first_match_faster = len(terms) < len(self._first_matched_columns)
-        if not supported or first_match_faster:
-            results = {}
-            for term in terms:
-                match = self.first_match(term, args=args)
-                if match is not None:
-                    results[term] = match
-            return results
-
-        for column in self._first_matched_columns:
-            terms_merged = ','.join(terms)
-            logger.debug('Looking for "%s"="%s"', column, terms)
-            entries = self._fetch_entries(terms_merged, column)
-            for entry in entries:
-                value = entry.fields.get(column)
-                if value is not None and value in terms:
-                    results[value] = entry
-                    logger.debug('Found a match: %s', entry)
-
-        if not results:
-            logger.debug('Found no match')
-        return results
+        logger.debug('Looking for %s', terms)
+        return self._snapshot.match_all(terms)
 
     def list(
         self, unique_ids: list[str], args: dict[str, Any] | None = None
     ) -> list[SourceResult]:
-        entries = self._fetch_entries()
-
-        def match_fn(entry: SourceResult) -> bool:
-            for unique_id in unique_ids:
-                if unique_id == entry.get_unique():
-                    return True
-            return False
-
-        return [entry for entry in entries if match_fn(entry)]
+        return self._snapshot.list(unique_ids)
 
-    def _fetch_entries(
-        self, term: str | None = None, column: str = 'search'
-    ) -> Iterable[SourceResult]:
+    def _fetch_entries(self) -> Sequence[SourceResult] | None:
         try:
             uuid = self._get_uuid()
         except ConnectionError as e:
             logger.info('%s', e)
-            return []
+            return None
         except RequestException as e:
             response = getattr(e, 'response', None)
             status_code = getattr(response, 'status_code', None)
@@ -190,13 +154,13 @@ class WazoUserPlugin(BaseSourcePlugin):
                 'Cannot fetch UUID status_code "%s". No results will be returned',
                 status_code,
             )
-            return []
+            return None
 
         try:
-            entries = self._fetch_users(term, column)
+            entries = list(self._fetch_users())
         except ConnectionError as e:
             logger.info('%s', e)
-            return []
+            return None
         except RequestException as e:
             response = getattr(e, 'response', None)
             status_code = getattr(response, 'status_code', None)
@@ -205,9 +169,9 @@ class WazoUserPlugin(BaseSourcePlugin):
                 'Cannot fetch entries status_code "%s". No results will be returned',
                 status_code,
             )
-            return []
+            return None
 
-        return (self._source_result_from_entry(entry, uuid) for entry in entries)
+        return [self._source_result_from_entry(entry, uuid) for entry in entries]
 
     def _get_uuid(self) -> str:
         if self._uuid:
@@ -219,14 +183,9 @@ class WazoUserPlugin(BaseSourcePlugin):
         self._uuid = uuid
         return uuid
 
-    def _fetch_users(
-        self, term: str | None = None, column: str = 'search'
-    ) -> Iterator[dict[str, Any]]:
-        search_params = dict(self._search_params)
-        if term:
-            search_params[column] = term
+    def _fetch_users(self) -> Iterator[dict[str, Any]]:
         assert self._client is not None
-        users = self._client.users.list(**search_params)
+        users = self._client.users.list(**self._search_params)
         logger.debug('Fetched %s users', users['total'])
         return (user for user in users['items'])
 
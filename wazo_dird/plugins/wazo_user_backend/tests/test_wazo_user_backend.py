@@ -1,9 +1,9 @@
-# Copyright 2014-2025 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2014-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import unittest
 from typing import cast
-from unittest.mock import Mock, call, patch
+from unittest.mock import Mock, patch
 
 from hamcrest import (
     assert_that,
@@ -15,6 +15,7 @@ from hamcrest import (
     none,
 )
 from requests import RequestException
+from wazo_bus.resources.user.event import UserEditedEvent
 
 from wazo_dird import make_result_class
 from wazo_dird.plugins.base_plugins import SourcePluginDependencies
@@ -144,31 +145,48 @@ class TestWazoUserBackendSearch(_BaseTest):
         self._source._client = self._confd_client
         self._source._SourceResult = SourceResult
         self._source._uuid = UUID
+        self._source._searched_columns = ['firstname', 'lastname', 'full_name']
+        self._source._first_matched_columns = ['exten']
+        self._source.name = 'my_test_xivo'
+
+    def _use_columns(self, searched=None, first_matched=None):
+        if searched is not None:
+            self._source._searched_columns = searched
+        if first_matched is not None:
+            self._source._first_matched_columns = first_matched
+        self._source._snapshot = self._source._new_snapshot()
 
     def test_search_on_excluded_column(self):
-        self._source._searched_columns = ['lastname']
+        self._use_columns(searched=['lastname'])
 
         result = self._source.search(term='paul')
 
         self._confd_client.users.list.assert_called_once_with(
-            recurse=True, view='directory', search='paul'
+            recurse=True, view='directory'
         )
 
         assert_that(result, empty())
 
     def test_search_on_included_column(self):
-        self._source._searched_columns = ['firstname', 'lastname', 'full_name']
+        self._use_columns(searched=['firstname', 'lastname', 'full_name'])
 
         search_terms = ['paul', 'paul ', 'paul àccent', 'Paul À']
         for term in search_terms:
             result = self._source.search(term=term)
 
-            self._confd_client.users.list.assert_called_with(
-                recurse=True, view='directory', search=term
-            )
-
             assert_that(result, contains_exactly(SOURCE_2))
 
+        self._confd_client.users.list.assert_called_once_with(
+            recurse=True, view='directory'
+        )
+
+    def test_search_does_not_match_across_columns(self):
+        self._use_columns(searched=['firstname', 'lastname'])
+
+        result = self._source.search(term='paulàccent')
+
+        assert_that(result, empty())
+
     def test_that_search_uses_extra_search_params(self):
         config = dict(DEFAULT_ARGS)
         config['config']['extra_search_params'] = {'context': 'inside'}
@@ -180,93 +198,98 @@ class TestWazoUserBackendSearch(_BaseTest):
 
             client = registry.get.return_value
             client.users.list.assert_called_once_with(
-                recurse=True, view='directory', search='paul', context='inside'
+                recurse=True, view='directory', context='inside'
             )
 
     def test_search_with_no_accent(self):
-        self._source._searched_columns = ['firstname', 'lastname']
+        self._use_columns(searched=['firstname', 'lastname'])
 
         result = self._source.search(term='accent')
 
-        self._confd_client.users.list.assert_called_once_with(
-            recurse=True, view='directory', search='accent'
-        )
-
         assert_that(result, contains_exactly(SOURCE_2))
 
     def test_search_with_wrong_accent(self):
-        self._source._searched_columns = ['firstname', 'lastname']
+        self._use_columns(searched=['firstname', 'lastname'])
 
         result = self._source.search(term='accént')
 
-        self._confd_client.users.list.assert_called_once_with(
-            recurse=True, view='directory', search='accént'
-        )
-
         assert_that(result, contains_exactly(SOURCE_2))
 
     def test_first_match(self):
-        self._source._first_matched_columns = ['exten']
+        self._use_columns(first_matched=['exten'])
 
         result = self._source.first_match('1234')
 
-        self._confd_client.users.list.assert_called_once_with(
-            recurse=True, view='directory', search='1234'
-        )
-
         assert_that(result, equal_to(SOURCE_2))
 
+    def test_first_match_on_the_first_entry_of_any_column(self):
+        self._use_columns(first_matched=['mobile_phone_number', 'exten'])
+
+        result = self._source.first_match('666')
+
+        assert_that(result, equal_to(SOURCE_1))
+
     def test_first_match_return_none_when_no_result(self):
-        self._source._first_matched_columns = ['number']
+        self._use_columns(first_matched=['number'])
 
         result = self._source.first_match('12')
 
-        self._confd_client.users.list.assert_called_once_with(
-            recurse=True, view='directory', search='12'
-        )
-
         assert_that(result, is_(none()))
 
     def test_match_all(self):
-        self._source._first_matched_columns = ['exten']
+        self._use_columns(first_matched=['exten', 'mobile_phone_number'])
 
-        result = self._source.match_all(['1234', '5678'])
+        result = self._source.match_all(['1234', '5555551234', '5678'])
 
-        self._confd_client.users.list.assert_called_once_with(
-            recurse=True, view='directory', exten='1234,5678'
+        assert_that(
+            result,
+            has_entries({'1234': SOURCE_2, '5555551234': SOURCE_1}),
         )
 
-        assert_that(result, has_entries({'1234': SOURCE_2}))
-
     def test_match_all_when_no_result(self):
-        self._source._first_matched_columns = ['exten']
+        self._use_columns(first_matched=['exten'])
 
         result = self._source.match_all(['12'])
 
-        self._confd_client.users.list.assert_called_once_with(
-            recurse=True, view='directory', exten='12'
-        )
+        assert_that(result, equal_to({}))
 
-        assert_that(result, has_entries({}))
+    def test_lookups_share_the_snapshot(self):
+        self._use_columns(first_matched=['exten'])
 
-    def test_match_all_when_not_supported_column_then_fallback(self):
-        self._source._first_matched_columns = ['exten', 'unsupported']
+        self._source.search('paul')
+        self._source.first_match('1234')
+        self._source.match_all(['1234', '666'])
+        self._source.list(['226'])
 
-        self._source.match_all(['12', '34'])
+        self._confd_client.users.list.assert_called_once_with(
+            recurse=True, view='directory'
+        )
 
-        call1 = call(recurse=True, view='directory', search='12')
-        call2 = call(recurse=True, view='directory', search='34')
-        self._confd_client.users.list.assert_has_calls([call1, call2])
+    def test_user_event_refreshes_the_snapshot(self):
+        with patch('wazo_dird.plugins.wazo_user_backend.plugin.registry') as registry:
+            client = registry.get.return_value
+            client.infos.return_value = {'uuid': UUID}
+            client.users.list.return_value = {'items': [CONFD_USER_1], 'total': 1}
+            bus = Mock()
+            dependencies = dict(DEFAULT_ARGS, bus=bus)
+            self._source.load(cast(SourcePluginDependencies, dependencies))
+            assert_that(self._source.search('paul'), empty())
 
-    def test_match_all_when_first_match_faster_then_fallback(self):
-        self._source._first_matched_columns = ['exten', 'mobile_phone_number']
+            client.users.list.return_value = {'items': [CONFD_USER_2], 'total': 1}
+            handler = bus.subscribe.call_args_list[0][0][1]
+            with patch('threading.Thread') as Thread:
+                handler({'uuid': UUID_2})
+                target = Thread.call_args[1]['target']
+                target(*Thread.call_args[1]['args'])
 
-        self._source.match_all(['12'])
+            assert_that(self._source.search('paul'), contains_exactly(SOURCE_2))
 
-        call1 = call(recurse=True, view='directory', search='12')
-        self._confd_client.users.list.assert_has_calls([call1])
+            self._source.unload()
+            bus.unsubscribe.assert_any_call(UserEditedEvent.name, handler)
 
     def test_list_with_unknown_id(self):
+        self._use_columns()
+
         result = self._source.list(unique_ids=['42'])
 
         self._confd_client.users.list.assert_called_once_with(
@@ -276,6 +299,8 @@ class TestWazoUserBackendSearch(_BaseTest):
         assert_that(result, empty())
 
     def test_list_with_known_id(self):
+        self._use_columns()
+
         result = self._source.list(unique_ids=['226'])
 
         self._confd_client.users.list.assert_called_once_with(
@@ -285,6 +310,8 @@ class TestWazoUserBackendSearch(_BaseTest):
         assert_that(result, contains_exactly(SOURCE_1))
 
     def test_list_with_empty_list(self):
+        self._use_columns()
+
         result = self._source.list(unique_ids=[])
 
         self._confd_client.users.list.assert_called_once_with(
@@ -298,7 +325,7 @@ class TestWazoUserBackendSearch(_BaseTest):
 
         result = self._source._fetch_entries()
 
-        assert_that(result, empty())
+        assert_that(result, is_(none()))
 
     def test_fetch_entries_when_client_does_not_return_uuid(self):
         self._source._uuid = None
@@ -306,4 +333,12 @@ class TestWazoUserBackendSearch(_BaseTest):
 
         result = self._source._fetch_entries()
 
-        assert_that(result, empty())
+        assert_that(result, is_(none()))
+
+    def test_lookups_return_nothing_when_users_cannot_be_fetched(self):
+        self._confd_client.users.list.side_effect = RequestException()
+        self._use_columns()
+
+        assert_that(self._source.search('paul'), empty())
+        assert_that(self._source.first_match('1234'), is_(none()))
+        assert_that(self._source.match_all(['1234']), equal_to({}))
@@ -1,4 +1,4 @@
-# Copyright 2014-2024 The Wazo Authors  (see the AUTHORS file)
+# Copyright 2014-2026 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations
@@ -16,6 +16,7 @@ from xivo import plugin_helpers
 from xivo.token_renewer import TokenRenewer
 
 from wazo_dird import exception
+from wazo_dird.bus import CoreBus
 from wazo_dird.config import Config as MainConfig
 from wazo_dird.plugins.base_plugins import (
     BaseSourcePlugin,
@@ -31,6 +32,16 @@ class SourceServiceProtocol(Protocol):
         ...
 
 
+class InvalidationCallback(Protocol):
+    def __call__(
+        self,
+        source_uuid: str | None = None,
+        backend: str | None = None,
+        user_uuid: str | None = None,
+    ) -> None:
+        ...
+
+
 class SourceManager:
     _namespace = 'wazo_dird.backends'
 
@@ -40,6 +51,7 @@ class SourceManager:
         config: MainConfig,
         auth_client: AuthClient,
         token_renewer: TokenRenewer,
+        bus: CoreBus | None = None,
     ):
         self._enabled_backends = enabled_backends
         self._main_config = config
@@ -47,8 +59,10 @@ class SourceManager:
         self._config = config
         self._auth_client = auth_client
         self._token_renewer = token_renewer
+        self._bus = bus
         self._source_service: SourceServiceProtocol | None = None
         self._source_lock = threading.Lock()
+        self._invalidation_callbacks: list[InvalidationCallback] = []
 
     def get(self, source_uuid: str) -> BaseSourcePlugin | None:
         with self._source_lock:
@@ -61,6 +75,26 @@ class SourceManager:
     def invalidate(self, source_uuid: str) -> None:
         with self._source_lock:
             self._sources.pop(source_uuid, None)
+        self._notify_invalidation(source_uuid=source_uuid)
+
+    def invalidate_results(self, backend: str, user_uuid: str | None = None) -> None:
+        """Signal that the content of the sources of `backend` changed
+
+        Sources are not reloaded, only the results kept from previous lookups on
+        these sources are discarded. `user_uuid` limits the invalidation to the
+        results of a single user.
+        """
+        self._notify_invalidation(backend=backend, user_uuid=user_uuid)
+
+    def subscribe_to_invalidation(self, callback: InvalidationCallback) -> None:
+        self._invalidation_callbacks.append(callback)
+
+    def _notify_invalidation(self, **kwargs: str | None) -> None:
+        for callback in self._invalidation_callbacks:
+            try:
+                callback(**kwargs)
+            except Exception:
+                logger.exception('Invalidation callback %s failed', callback)
 
     def _load_source(self, source_uuid: str) -> BaseSourcePlugin | None:
         assert self._source_service
@@ -114,6 +148,7 @@ class SourceManager:
             dependencies = SourcePluginDependencies(
                 {
                     'auth_client': self._auth_client,
+                    'bus': self._bus,
                     'config': config,
                     'main_config': self._main_config,
                     'token_renewer': self._token_renewer,
@@ -0,0 +1,43 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from concurrent.futures import Future
+
+from hamcrest import assert_that, equal_to, none
+
+from ..bulkhead import Bulkheads
+
+
+class TestBulkheads(unittest.TestCase):
+    def test_no_limit_by_default(self):
+        bulkheads = Bulkheads(None)
+
+        assert_that(bulkheads.limit('ldap'), none())
+        assert all(bulkheads.acquire('uuid', 'ldap') for _ in range(100))
+
+    def test_backend_limit_overrides_default(self):
+        bulkheads = Bulkheads({'default': 1, 'backends': {'ldap': 2}})
+
+        assert_that(bulkheads.limit('ldap'), equal_to(2))
+        assert_that(bulkheads.limit('csv'), equal_to(1))
+
+    def test_limit_is_per_source(self):
+        bulkheads = Bulkheads({'default': 1})
+
+        assert bulkheads.acquire('a', 'ldap')
+        assert not bulkheads.acquire('a', 'ldap')
+        assert bulkheads.acquire('b', 'ldap')
+
+    def test_released_when_the_future_completes_or_is_cancelled(self):
+        bulkheads = Bulkheads({'default': 2})
+        completed, cancelled = Future(), Future()
+        for future in (completed, cancelled):
+            assert bulkheads.acquire('a', 'ldap')
+            bulkheads.release_when_done('a', future)
+        assert not bulkheads.acquire('a', 'ldap')
+
+        completed.set_result([])
+        assert_that(bulkheads.pending('a'), equal_to(1))
+        cancelled.cancel()
+        assert_that(bulkheads.pending('a'), equal_to(0))
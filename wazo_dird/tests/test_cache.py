@@ -0,0 +1,72 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+
+from hamcrest import assert_that, equal_to, has_entries, none
+
+from ..cache import TTLCache, new_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(ttl=10, max_size=2, clock=self.clock)
+
+    def test_get_set(self):
+        self.cache.set('a', 1)
+
+        assert_that(self.cache.get('a'), equal_to(1))
+        assert_that(self.cache.get('b'), none())
+        assert_that(self.cache.stats(), has_entries(hits=1, misses=1, size=1))
+
+    def test_entries_expire(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2, ttl=20)
+        self.clock.now = 10
+
+        assert_that(self.cache.get('a'), none())
+        assert_that(self.cache.get('b'), equal_to(2))
+        assert_that(len(self.cache), equal_to(1))
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+
+        assert_that(self.cache.get('b'), none())
+        assert_that(self.cache.get('a'), equal_to(1))
+        assert_that(self.cache.get('c'), equal_to(3))
+
+    def test_invalidate(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+
+        count = self.cache.invalidate(lambda key: key == 'a')
+
+        assert_that(count, equal_to(1))
+        assert_that(self.cache.get('a'), none())
+        assert_that(self.cache.get('b'), equal_to(2))
+
+
+class TestNewCache(unittest.TestCase):
+    def test_disabled(self):
+        assert_that(new_cache(None), none())
+        assert_that(new_cache({'enabled': False}), none())
+
+    def test_enabled(self):
+        cache = new_cache({'enabled': True, 'ttl': 5, 'max_size': 1})
+
+        assert cache is not None
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert_that(len(cache), equal_to(1))
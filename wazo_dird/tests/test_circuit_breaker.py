@@ -0,0 +1,120 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import unittest
+from concurrent.futures import Future
+from unittest.mock import Mock
+
+from hamcrest import assert_that, equal_to, has_entries
+
+from ..circuit_breaker import CircuitBreaker, CircuitBreakers
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            'ldap', 'ldap', failure_threshold=2, reset_timeout=10, clock=self.clock
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        assert self.breaker.allow()
+
+        self.breaker.record_failure()
+
+        assert_that(self.breaker.state, equal_to('open'))
+        assert not self.breaker.allow()
+
+    def test_single_probe_after_reset_timeout(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 10
+
+        assert self.breaker.allow()
+        assert not self.breaker.allow()
+        assert_that(self.breaker.state, equal_to('half_open'))
+
+        self.breaker.record_success()
+
+        assert_that(self.breaker.state, equal_to('closed'))
+        assert self.breaker.allow()
+
+    def test_failed_probe_opens_again(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 10
+        self.breaker.allow()
+
+        self.breaker.record_failure()
+
+        assert_that(self.breaker.state, equal_to('open'))
+        self.clock.now = 19
+        assert not self.breaker.allow()
+
+    def test_abandoned_probe_lets_another_probe_through(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 10
+        self.breaker.allow()
+
+        self.breaker.record_abandon()
+
+        assert self.breaker.allow()
+
+
+class TestCircuitBreakers(unittest.TestCase):
+    def setUp(self):
+        self.source = Mock(backend='ldap')
+        self.source.name = 'my-ldap'
+        self.breakers = CircuitBreakers({'enabled': True, 'failure_threshold': 1})
+
+    def test_disabled(self):
+        breakers = CircuitBreakers(None)
+        future = Future()
+        breakers.track('uuid', self.source, future, Mock(raised=True))
+        future.set_result(None)
+
+        assert breakers.allow('uuid', self.source)
+        assert_that(breakers.status(), equal_to({}))
+
+    def test_outcome_of_the_future(self):
+        future = Future()
+        self.breakers.track('uuid', self.source, future, Mock(raised=True))
+
+        future.set_result([])
+
+        assert not self.breakers.allow('uuid', self.source)
+        assert_that(
+            self.breakers.status(),
+            has_entries(
+                uuid=has_entries(name='my-ldap', state='open', consecutive_failures=1)
+            ),
+        )
+
+    def test_timeouts_are_failures(self):
+        future = Future()
+        self.breakers.track('uuid', self.source, future, Mock(raised=False))
+
+        CircuitBreakers.timed_out([future])
+        future.cancel()
+
+        assert not self.breakers.allow('uuid', self.source)
+
+    def test_cancelled_calls_are_not_failures(self):
+        future = Future()
+        self.breakers.track('uuid', self.source, future, Mock(raised=False))
+
+        future.cancel()
+
+        assert self.breakers.allow('uuid', self.source)
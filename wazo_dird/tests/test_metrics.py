@@ -0,0 +1,96 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import threading
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_string, equal_to, has_items
+
+from .. import metrics
+from ..helpers import RaiseStopper
+
+
+class TestRegistry(unittest.TestCase):
+    def test_render_counter(self):
+        counter = metrics.Counter('requests_total', 'Requests', ['source'])
+        registry = metrics.Registry()
+        registry.register(counter)
+
+        counter.inc('my "ldap"')
+        counter.inc('my "ldap"', amount=2)
+
+        assert_that(
+            registry.render().splitlines(),
+            equal_to(
+                [
+                    '# HELP requests_total Requests',
+                    '# TYPE requests_total counter',
+                    'requests_total{source="my \\"ldap\\""} 3',
+                ]
+            ),
+        )
+
+    def test_render_histogram(self):
+        histogram = metrics.Histogram('exec_seconds', 'Exec', ['source'], [0.1, 1])
+        registry = metrics.Registry()
+        registry.register(histogram)
+
+        histogram.observe(0.05, 'csv')
+        histogram.observe(0.5, 'csv')
+        histogram.observe(5, 'csv')
+
+        assert_that(
+            registry.render().splitlines(),
+            has_items(
+                'exec_seconds_bucket{source="csv",le="0.1"} 1',
+                'exec_seconds_bucket{source="csv",le="1"} 2',
+                'exec_seconds_bucket{source="csv",le="+Inf"} 3',
+                'exec_seconds_sum{source="csv"} 5.55',
+                'exec_seconds_count{source="csv"} 3',
+            ),
+        )
+
+    def test_render_gauge(self):
+        gauge = metrics.Gauge('depth', 'Depth', ['service'], lambda: [(('a',), 2)])
+        registry = metrics.Registry()
+        registry.register(gauge)
+
+        assert_that(registry.render(), contains_string('depth{service="a"} 2'))
+
+
+class TestInstrumentedThreadPoolExecutor(unittest.TestCase):
+    def test_active_workers_and_queue_depth(self):
+        executor = metrics.InstrumentedThreadPoolExecutor('test', max_workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def work():
+            started.set()
+            release.wait()
+
+        executor.submit(work)
+        executor.submit(work)
+        started.wait()
+
+        assert_that(executor.active_workers, equal_to(1))
+        assert_that(executor.queue_depth, equal_to(1))
+        release.set()
+        executor.shutdown()
+        assert_that(executor.active_workers, equal_to(0))
+
+
+class TestInstrument(unittest.TestCase):
+    def test_timings_and_errors_are_recorded(self):
+        source = Mock(backend='ldap')
+        source.name = 'instrumented'
+
+        def search():
+            raise Exception()
+
+        execute = metrics.instrument('lookup', source, RaiseStopper([]))
+        execute(search)
+
+        labels = ('lookup', 'instrumented', 'ldap')
+        assert_that(metrics.SOURCE_EXEC_SECONDS.count(*labels), equal_to(1))
+        assert_that(metrics.SOURCE_QUEUE_SECONDS.count(*labels), equal_to(1))
+        assert_that(metrics.SOURCE_ERRORS.value(*labels), equal_to(1))
@@ -24,3 +24,28 @@ class TestSourceManager(unittest.TestCase):
 
         source_1.unload.assert_called_once_with()
         source_2.unload.assert_called_once_with()
+
+    def test_invalidate_notifies_subscribers(self):
+        callback = Mock()
+        manager = SourceManager(
+            {}, cast(Config, {'sources': {}}), s.auth_client, s.token_renewer
+        )
+        manager._sources = {'s1': s.source_1}
+        manager.subscribe_to_invalidation(callback)
+
+        manager.invalidate('s1')
+
+        assert 's1' not in manager._sources
+        callback.assert_called_once_with(source_uuid='s1')
+
+    def test_invalidate_results_notifies_subscribers(self):
+        failing, callback = Mock(side_effect=Exception), Mock()
+        manager = SourceManager(
+            {}, cast(Config, {'sources': {}}), s.auth_client, s.token_renewer
+        )
+        manager.subscribe_to_invalidation(failing)
+        manager.subscribe_to_invalidation(callback)
+
+        manager.invalidate_results('personal', user_uuid='user-uuid')
+
+        callback.assert_called_once_with(backend='personal', user_uuid='user-uuid')